@@ -0,0 +1,498 @@
+"""Interfaz de línea de comandos sin Qt para PANDEO ML.
+
+Uso:
+    python -m app predict --params '{"tipo_perfil": "IPE", ...}'
+    python -m app batch miembros.csv --format csv > resultados.csv
+    python -m app sweep --params base.json --param longitud_mm --start 1000 --stop 8000 --steps 15
+    python -m app stream miembros.parquet resultados.parquet --chunk-size 100000
+    python -m app bench --rows 10000
+    python -m app serve --port 8765 --max-wait-ms 5
+    python -m app loadtest --concurrency 64 --duration 10
+    python -m app jobs submit cola.db miembros.csv resultados.parquet
+    python -m app jobs work cola.db --workers 4
+    python -m app jobs status cola.db
+    python -m app watch entrada/ --workers 2
+    python -m app frame nudos.csv barras.csv --sections secciones.csv
+    python -m app frame --verify
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.models.batch_predictor import open_predictor
+from app.models.parallel_scorer import measure_scaling, score_stream_parallel
+from app.models.streaming_scorer import DEFAULT_CHUNK_SIZE, score_chunk, score_stream
+
+# Punto de diseño por defecto (mismos valores iniciales que InputPanel)
+DEFAULT_PARAMS = {
+    "tipo_perfil": "IPE",
+    "tipo_acero": "S235",
+    "longitud_mm": 3000.0,
+    "condicion_apoyo": "Empotrado-Empotrado",
+    "altura_perfil_mm": 200.0,
+    "ancho_alas_mm": 100.0,
+    "espesor_alma_mm": 5.6,
+    "espesor_alas_mm": 8.5
+}
+
+
+def _read_params(value):
+    """Leer parámetros desde una cadena JSON, un archivo JSON o '-' (stdin)."""
+    if value is None:
+        return dict(DEFAULT_PARAMS)
+    if value == "-":
+        return json.load(sys.stdin)
+    if value.lstrip().startswith("{"):
+        return json.loads(value)
+    with open(value, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _records(frame):
+    """Convertir un DataFrame en registros serializables (NaN -> null)."""
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def _predictor_options(args):
+    """Opciones del motor de predicción que reciben también los procesos trabajadores."""
+    opciones = {}
+    if args.cache:
+        opciones.update(cache_path=args.cache, cache_max_bytes=int(args.cache_max_mb * 1024 * 1024))
+    if args.audit_dir:
+        opciones.update(
+            audit_dir=args.audit_dir, audit_format=args.audit_format,
+            audit_max_bytes=int(args.audit_max_mb * 1024 * 1024)
+        )
+    return opciones
+
+
+def write_frame(frame, output_format, stream=None):
+    """
+    Escribir un DataFrame en stdout como JSON o CSV.
+
+    Args:
+        frame (pd.DataFrame): Datos a escribir.
+        output_format (str): 'json', 'ndjson' o 'csv'.
+        stream: Flujo de salida (stdout por defecto).
+    """
+    stream = stream or sys.stdout
+    if output_format == "csv":
+        frame.to_csv(stream, index=False)
+    elif output_format == "ndjson":
+        for record in _records(frame):
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+    else:
+        json.dump(_records(frame), stream, ensure_ascii=False, indent=2)
+        stream.write("\n")
+
+
+def cmd_predict(args, predictor):
+    """Predicción de un único elemento."""
+    params = _read_params(args.params)
+    results = predictor.predict_frame([params])
+    if args.format == "json":
+        json.dump(_records(results)[0], sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        write_frame(results, args.format)
+    return 0
+
+
+def cmd_batch(args, predictor):
+    """Puntuación por lotes de un archivo CSV."""
+    entradas = pd.read_csv(sys.stdin if args.input == "-" else args.input)
+    write_frame(score_chunk(predictor, entradas), args.format)
+    return 0
+
+
+def cmd_stream(args, predictor):
+    """Puntuación en streaming de archivos grandes, bloque a bloque."""
+    def report(filas, segundos, filas_por_s):
+        if not args.quiet:
+            print(f"{filas} filas, {segundos:.1f} s, {filas_por_s:.0f} filas/s", file=sys.stderr)
+
+    if args.workers > 1:
+        stats = score_stream_parallel(
+            args.input, args.output, model_path=predictor.model_path, workers=args.workers,
+            chunk_size=args.chunk_size, progress=report, predictor_options=_predictor_options(args)
+        )
+    else:
+        stats = score_stream(predictor, args.input, args.output, args.chunk_size, progress=report)
+    if args.output != "-":
+        json.dump(stats, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0
+
+
+def cmd_sweep(args, predictor):
+    """Barrido de un parámetro numérico alrededor de un punto de diseño."""
+    params = _read_params(args.params)
+    valores = np.linspace(args.start, args.stop, args.steps)
+    entradas = pd.DataFrame([params] * len(valores))
+    entradas[args.param] = valores
+
+    results = predictor.predict_frame(entradas)
+    if args.param not in results.columns:
+        results.insert(0, args.param, valores)
+    write_frame(results, args.format)
+    return 0
+
+
+def cmd_bench(args, predictor):
+    """Medir el rendimiento de la predicción individual y por lotes."""
+    rng = np.random.default_rng(args.seed)
+    entradas = pd.DataFrame([DEFAULT_PARAMS] * args.rows)
+    entradas["longitud_mm"] = rng.uniform(500, 12000, args.rows)
+    entradas["tipo_acero"] = rng.choice(["S235", "S275", "S355"], args.rows)
+    entradas["condicion_apoyo"] = rng.choice(
+        ["Empotrado-Empotrado", "Empotrado-Articulado", "Articulado-Articulado", "Empotrado-Libre"], args.rows
+    )
+
+    if args.scaling:
+        # Eficiencia de escalado con el grupo de procesos
+        trabajadores = [int(n) for n in args.scaling.split(",")]
+        informe = measure_scaling(entradas, trabajadores, model_path=predictor.model_path, chunk_size=args.chunk_size)
+        write_frame(informe, args.format)
+        return 0
+
+    # Calentamiento
+    predictor.predict_frame(entradas.iloc[:10])
+
+    tiempos_lote = []
+    for _ in range(args.repeat):
+        inicio = time.perf_counter()
+        predictor.predict_frame(entradas)
+        tiempos_lote.append(time.perf_counter() - inicio)
+
+    n_individual = min(args.rows, args.single_rows)
+    registros = entradas.iloc[:n_individual].to_dict("records")
+    inicio = time.perf_counter()
+    for params in registros:
+        predictor.predict(params)
+    tiempo_individual = time.perf_counter() - inicio
+
+    mejor = min(tiempos_lote)
+    informe = {
+        "filas": args.rows,
+        "repeticiones": args.repeat,
+        "lote_mejor_s": mejor,
+        "lote_mediana_s": float(np.median(tiempos_lote)),
+        "lote_filas_por_s": args.rows / mejor,
+        "individual_filas": n_individual,
+        "individual_ms_por_fila": tiempo_individual / n_individual * 1000,
+        "individual_filas_por_s": n_individual / tiempo_individual,
+        "aceleracion_lote": (tiempo_individual / n_individual) / (mejor / args.rows)
+    }
+    write_frame(pd.DataFrame([informe]), args.format)
+    return 0
+
+
+def cmd_serve(args, predictor):
+    """Servicio HTTP local de inferencia con micro-lotes."""
+    from app.service.inference_server import run_server
+
+    print(f"Servicio de inferencia en http://{args.host}:{args.port}", file=sys.stderr)
+    run_server(
+        predictor, args.host, args.port, max_wait_ms=args.max_wait_ms, max_batch_size=args.max_batch_size,
+        max_queue=args.max_queue, timeout_ms=args.timeout_ms
+    )
+    return 0
+
+
+def cmd_loadtest(args, predictor):
+    """Prueba de carga del servicio de inferencia (p99 y peticiones por segundo)."""
+    import asyncio
+
+    from app.service.load_test import run_load_test, run_local_load_test
+
+    rng = np.random.default_rng(args.seed)
+    payloads = [
+        dict(DEFAULT_PARAMS, longitud_mm=float(longitud))
+        for longitud in rng.uniform(500, 12000, 1000)
+    ]
+
+    if args.url:
+        host, _, port = args.url.split("//")[-1].rstrip("/").partition(":")
+        informe = asyncio.run(run_load_test(
+            host, int(port or 80), payloads, args.concurrency, args.duration, deadline_ms=args.deadline_ms
+        ))
+    else:
+        # Servicio propio en un puerto libre de localhost
+        informe = asyncio.run(run_local_load_test(
+            predictor, payloads, args.concurrency, args.duration, deadline_ms=args.deadline_ms,
+            max_wait_ms=args.max_wait_ms, max_batch_size=args.max_batch_size, max_queue=args.max_queue
+        ))
+    json.dump(informe, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+def cmd_jobs_submit(args, predictor):
+    """Enviar un archivo de miembros a la cola de trabajos."""
+    from app.utils.job_queue import JobQueue
+
+    with JobQueue(args.db) as queue:
+        job_id = queue.submit_file(args.input, args.output, args.chunk_size, args.name)
+        write_frame(pd.DataFrame(queue.status(job_id)), args.format)
+    return 0
+
+
+def cmd_jobs_sweep(args, predictor):
+    """Enviar un barrido de un parámetro a la cola de trabajos."""
+    from app.utils.job_queue import JobQueue
+
+    params = _read_params(args.params)
+    entradas = pd.DataFrame([params] * args.steps)
+    entradas[args.param] = np.linspace(args.start, args.stop, args.steps)
+
+    with JobQueue(args.db) as queue:
+        job_id = queue.submit_frame(entradas, args.output, args.chunk_size, args.name or f"barrido {args.param}")
+        write_frame(pd.DataFrame(queue.status(job_id)), args.format)
+    return 0
+
+
+def cmd_jobs_work(args, predictor):
+    """Procesar bloques de la cola hasta que no quede trabajo."""
+    from app.utils.job_queue import JobQueue, run_worker, run_workers
+
+    if args.workers > 1:
+        run_workers(args.db, predictor.model_path or args.model, args.workers, args.lease,
+                    predictor_options=_predictor_options(args))
+        return 0
+
+    def report(chunk, segundos):
+        if not args.quiet:
+            print(f"Trabajo {chunk['job_id']}, bloque {chunk['indice']}: {chunk['filas']} filas en {segundos:.2f} s",
+                  file=sys.stderr)
+
+    with JobQueue(args.db) as queue:
+        run_worker(queue, predictor, lease_seconds=args.lease, progress=report)
+    return 0
+
+
+def cmd_jobs_status(args, predictor):
+    """Consultar el progreso y el rendimiento de los trabajos."""
+    from app.utils.job_queue import JobQueue
+
+    columnas = ["id", "nombre", "estado", "bloques_hechos", "total_bloques", "filas_hechas", "total_filas",
+                "progreso", "filas_por_s", "restante_s", "trabajadores", "salida", "error"]
+    with JobQueue(args.db) as queue:
+        informe = pd.DataFrame(queue.status(args.job_id), columns=columnas)
+    write_frame(informe, args.format)
+    return 0
+
+
+def cmd_watch(args, predictor):
+    """Vigilar una carpeta y puntuar los archivos de miembros nuevos."""
+    from app.service.watch_folder import WatchFolder
+
+    def log(mensaje):
+        print(mensaje, file=sys.stderr, flush=True)
+
+    watcher = WatchFolder(
+        predictor, args.directory, patterns=args.pattern or ["*.csv"], poll_interval=args.interval,
+        workers=args.workers, chunk_size=args.chunk_size, output_format=args.output_format, log=log,
+        lease_seconds=args.lease
+    )
+    try:
+        watcher.run(once=args.once)
+    except KeyboardInterrupt:
+        watcher.stop()
+    return 0
+
+
+def cmd_frame(args, predictor):
+    """Puntuar los pilares de un pórtico con las longitudes de pandeo del análisis global."""
+    from app.models.frame_stability import load_frame_csv, verify_reference_cases
+
+    if args.verify:
+        # Comprobación con pilares aislados de factor K conocido
+        informe = verify_reference_cases(args.tolerance)
+        write_frame(informe, args.format)
+        return 0 if informe['correcto'].all() else 1
+
+    if not args.nodes or not args.members:
+        raise ValueError("Se necesitan los archivos de nudos y de barras (o --verify)")
+    frame = load_frame_csv(args.nodes, args.members, args.sections, args.elements)
+
+    entradas = frame.prediction_inputs()
+    results = predictor.predict_frame(entradas.drop(columns='id'))
+    results.insert(0, 'id', entradas['id'].to_numpy())
+    write_frame(results, args.format)
+    return 0
+
+
+def build_parser():
+    """Construir el analizador de argumentos."""
+    parser = argparse.ArgumentParser(
+        prog="python -m app",
+        description="PANDEO ML sin interfaz gráfica: predicción de pandeo en elementos de acero"
+    )
+    parser.add_argument("--model", default=None, help="Ruta del modelo .joblib (por defecto se busca automáticamente)")
+    parser.add_argument("--cache", help="Caché persistente de resultados (archivo SQLite)")
+    parser.add_argument("--cache-max-mb", type=float, default=512, help="Tamaño máximo de la caché en MB")
+    parser.add_argument("--audit-dir", help="Carpeta del registro de auditoría de predicciones")
+    parser.add_argument("--audit-format", choices=["parquet", "jsonl"], default="parquet",
+                        help="Formato del registro de auditoría (Parquet o JSON por líneas con gzip)")
+    parser.add_argument("--audit-max-mb", type=float, default=64, help="Tamaño de rotación de los archivos de auditoría")
+    parser.add_argument("--metrics-file", help="Volcar métricas periódicamente a este archivo (.prom o .json)")
+    parser.add_argument("--metrics-interval", type=float, default=15.0, help="Segundos entre volcados de métricas")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    formatos = ["json", "ndjson", "csv"]
+
+    p = subparsers.add_parser("predict", help="Predicción de un único elemento")
+    p.add_argument("--params", help="Parámetros como JSON, ruta a un archivo JSON o '-' para stdin")
+    p.add_argument("--format", choices=formatos, default="json")
+    p.set_defaults(func=cmd_predict)
+
+    p = subparsers.add_parser("batch", help="Puntuación por lotes de un CSV de miembros")
+    p.add_argument("input", help="Archivo CSV de entrada o '-' para stdin")
+    p.add_argument("--format", choices=formatos, default="csv")
+    p.set_defaults(func=cmd_batch)
+
+    p = subparsers.add_parser("stream", help="Puntuación en streaming de archivos CSV/NDJSON/Parquet grandes")
+    p.add_argument("input", help="Archivo de entrada o '-' para CSV por stdin")
+    p.add_argument("output", help="Archivo de salida o '-' para CSV por stdout")
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Filas por bloque")
+    p.add_argument("--quiet", action="store_true", help="No informar del progreso en stderr")
+    p.add_argument("--workers", type=int, default=1, help="Número de procesos (1 = sin paralelismo)")
+    p.set_defaults(func=cmd_stream)
+
+    p = subparsers.add_parser("sweep", help="Barrido de un parámetro numérico")
+    p.add_argument("--params", help="Punto de diseño como JSON, ruta a un archivo JSON o '-' para stdin")
+    p.add_argument("--param", default="longitud_mm", help="Parámetro a barrer")
+    p.add_argument("--start", type=float, required=True)
+    p.add_argument("--stop", type=float, required=True)
+    p.add_argument("--steps", type=int, default=20)
+    p.add_argument("--format", choices=formatos, default="csv")
+    p.set_defaults(func=cmd_sweep)
+
+    p = subparsers.add_parser("bench", help="Medir el rendimiento de la predicción")
+    p.add_argument("--rows", type=int, default=10000, help="Filas del lote")
+    p.add_argument("--repeat", type=int, default=5, help="Repeticiones del lote")
+    p.add_argument("--single-rows", type=int, default=200, help="Filas para la medida individual")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--scaling", help="Medir el escalado con estos números de procesos, p. ej. 1,2,4,8")
+    p.add_argument("--chunk-size", type=int, default=20000, help="Filas por bloque en la medida de escalado")
+    p.add_argument("--format", choices=formatos, default="json")
+    p.set_defaults(func=cmd_bench)
+
+    p = subparsers.add_parser("serve", help="Servicio HTTP local de inferencia")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--max-wait-ms", type=float, default=5.0, help="Ventana de agrupación de peticiones (ms)")
+    p.add_argument("--max-batch-size", type=int, default=1024, help="Filas máximas por micro-lote")
+    p.add_argument("--max-queue", type=int, default=4096, help="Peticiones en cola antes de rechazar con 503")
+    p.add_argument("--timeout-ms", type=float, default=1000.0, help="Plazo por defecto de cada petición (ms)")
+    p.set_defaults(func=cmd_serve)
+
+    p = subparsers.add_parser("loadtest", help="Prueba de carga del servicio de inferencia")
+    p.add_argument("--url", help="Servicio existente, p. ej. http://127.0.0.1:8765 (por defecto se arranca uno local)")
+    p.add_argument("--concurrency", type=int, default=32, help="Clientes simultáneos")
+    p.add_argument("--duration", type=float, default=10.0, help="Duración en segundos")
+    p.add_argument("--max-wait-ms", type=float, default=5.0, help="Ventana de agrupación del servicio local (ms)")
+    p.add_argument("--max-batch-size", type=int, default=1024, help="Filas máximas por micro-lote del servicio local")
+    p.add_argument("--max-queue", type=int, default=4096, help="Capacidad de la cola del servicio local")
+    p.add_argument("--deadline-ms", type=float, help="Plazo enviado en cada petición (X-Deadline-Ms)")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=cmd_loadtest)
+
+    p = subparsers.add_parser("watch", help="Vigilar una carpeta y puntuar los archivos nuevos")
+    p.add_argument("directory", help="Carpeta a vigilar")
+    p.add_argument("--pattern", action="append", help="Patrón de archivos de entrada (repetible, por defecto *.csv)")
+    p.add_argument("--interval", type=float, default=2.0, help="Segundos entre sondeos")
+    p.add_argument("--workers", type=int, default=2, help="Archivos procesados a la vez")
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Filas por bloque")
+    p.add_argument("--output-format", choices=["csv", "ndjson", "parquet"], help="Formato de los resultados")
+    p.add_argument("--once", action="store_true", help="Procesar los archivos presentes y terminar")
+    p.add_argument("--lease", type=float, default=60.0,
+                   help="Segundos sin latido antes de que otro proceso recupere los archivos tomados")
+    p.set_defaults(func=cmd_watch)
+
+    p = subparsers.add_parser("frame", help="Puntuar los pilares de un pórtico con su longitud de pandeo global")
+    p.add_argument("nodes", nargs="?", help="CSV de nudos: id, x_mm, y_mm, apoyo")
+    p.add_argument("members", nargs="?", help="CSV de barras: id, nodo_i, nodo_j, seccion y N_ref_kN (opcional)")
+    p.add_argument("--sections", help="CSV de secciones (por defecto, designaciones del catálogo)")
+    p.add_argument("--elements", type=int, default=4, help="Elementos finitos por barra")
+    p.add_argument("--verify", action="store_true",
+                   help="Comprobar el análisis con los factores K teóricos (1.0, 0.7, 0.5 y 2.0)")
+    p.add_argument("--tolerance", type=float, default=0.01, help="Error relativo admitido en --verify")
+    p.add_argument("--format", choices=formatos, default="csv")
+    p.set_defaults(func=cmd_frame)
+
+    p = subparsers.add_parser("jobs", help="Cola persistente de trabajos con puntos de control")
+    jobs = p.add_subparsers(dest="jobs_command", required=True)
+
+    p = jobs.add_parser("submit", help="Enviar un archivo de miembros")
+    p.add_argument("db", help="Archivo SQLite de la cola")
+    p.add_argument("input", help="Archivo de entrada (CSV, NDJSON o Parquet)")
+    p.add_argument("output", help="Archivo de resultados (CSV, NDJSON o Parquet)")
+    p.add_argument("--chunk-size", type=int, default=20000, help="Filas por bloque (punto de control)")
+    p.add_argument("--name", help="Nombre del trabajo")
+    p.add_argument("--format", choices=formatos, default="json")
+    p.set_defaults(func=cmd_jobs_submit, needs_predictor=False)
+
+    p = jobs.add_parser("sweep", help="Enviar un barrido de un parámetro numérico")
+    p.add_argument("db", help="Archivo SQLite de la cola")
+    p.add_argument("output", help="Archivo de resultados (CSV, NDJSON o Parquet)")
+    p.add_argument("--params", help="Punto de diseño como JSON, ruta a un archivo JSON o '-' para stdin")
+    p.add_argument("--param", default="longitud_mm", help="Parámetro a barrer")
+    p.add_argument("--start", type=float, required=True)
+    p.add_argument("--stop", type=float, required=True)
+    p.add_argument("--steps", type=int, default=20)
+    p.add_argument("--chunk-size", type=int, default=20000, help="Filas por bloque (punto de control)")
+    p.add_argument("--name", help="Nombre del trabajo")
+    p.add_argument("--format", choices=formatos, default="json")
+    p.set_defaults(func=cmd_jobs_sweep, needs_predictor=False)
+
+    p = jobs.add_parser("work", help="Procesar bloques pendientes (reanuda los abandonados)")
+    p.add_argument("db", help="Archivo SQLite de la cola")
+    p.add_argument("--workers", type=int, default=1, help="Número de procesos trabajadores")
+    p.add_argument("--lease", type=float, default=120.0, help="Segundos antes de que un bloque abandonado se reclame")
+    p.add_argument("--quiet", action="store_true", help="No informar del progreso en stderr")
+    p.set_defaults(func=cmd_jobs_work)
+
+    p = jobs.add_parser("status", help="Progreso y rendimiento de los trabajos")
+    p.add_argument("db", help="Archivo SQLite de la cola")
+    p.add_argument("job_id", type=int, nargs="?", help="Trabajo concreto (por defecto, todos)")
+    p.add_argument("--format", choices=formatos, default="json")
+    p.set_defaults(func=cmd_jobs_status, needs_predictor=False)
+
+    return parser
+
+
+def _needs_predictor(args):
+    """Comprobar si el subcomando predice; los demás no cargan el modelo."""
+    if args.func is cmd_frame:
+        return not args.verify
+    return getattr(args, "needs_predictor", True)
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    dumper = None
+    if args.metrics_file:
+        from app.utils.metrics import MetricsDumper
+        dumper = MetricsDumper(args.metrics_file, args.metrics_interval).start()
+
+    predictor = None
+    try:
+        if _needs_predictor(args):
+            predictor = open_predictor(args.model, **_predictor_options(args))
+        return args.func(args, predictor)
+    except (ValueError, FileNotFoundError, KeyError, json.JSONDecodeError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        if predictor is not None:
+            predictor.close()
+        if dumper is not None:
+            dumper.stop()
@@ -0,0 +1,82 @@
+import time
+
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, QPushButton, QLabel
+from PyQt5.QtCore import Qt, pyqtSignal
+
+from app.utils.calculation_history import describe_params
+
+
+class HistoryPanel(QWidget):
+    """Barra lateral con el historial de cálculos."""
+
+    # Señal emitida al elegir una entrada (clave del cálculo)
+    entry_selected = pyqtSignal(str)
+
+    # Señal emitida al pedir que se vacíe el historial
+    clear_requested = pyqtSignal()
+
+    def __init__(self, history, parent=None):
+        """
+        Crear el panel.
+
+        Args:
+            history (CalculationHistory): Historial que se muestra.
+            parent (QWidget, opcional): Widget padre.
+        """
+        super().__init__(parent)
+        self.history = history
+        self.setup_ui()
+        self.refresh()
+
+    def setup_ui(self):
+        """Configurar la interfaz del panel."""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(6, 6, 6, 6)
+
+        self.empty_label = QLabel("Los cálculos realizados aparecerán aquí")
+        self.empty_label.setWordWrap(True)
+        layout.addWidget(self.empty_label)
+
+        self.list_widget = QListWidget()
+        self.list_widget.setWordWrap(True)
+        self.list_widget.itemActivated.connect(self.handle_item_activated)
+        self.list_widget.itemClicked.connect(self.handle_item_activated)
+        layout.addWidget(self.list_widget)
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        self.clear_button = QPushButton("Vaciar")
+        self.clear_button.clicked.connect(self.clear_requested.emit)
+        buttons_layout.addWidget(self.clear_button)
+        layout.addLayout(buttons_layout)
+
+    def refresh(self, selected_key=None):
+        """
+        Volver a listar las entradas del historial.
+
+        Args:
+            selected_key (str, opcional): Clave de la entrada a marcar como seleccionada.
+        """
+        self.list_widget.blockSignals(True)
+        self.list_widget.clear()
+        for entrada in self.history.entries():
+            resultados = entrada["resultados"]
+            item = QListWidgetItem(
+                f"{describe_params(entrada['entradas'])}\n"
+                f"→ {resultados['carga_maxima_kN']:.2f} kN · χ = {resultados['factor_reduccion']:.3f}"
+            )
+            item.setData(Qt.UserRole, entrada["clave"])
+            item.setToolTip(time.strftime("Calculado el %d/%m/%Y a las %H:%M:%S", time.localtime(entrada["fecha"])))
+            self.list_widget.addItem(item)
+            if entrada["clave"] == selected_key:
+                item.setSelected(True)
+                self.list_widget.setCurrentItem(item)
+        self.list_widget.blockSignals(False)
+
+        vacio = len(self.history) == 0
+        self.empty_label.setVisible(vacio)
+        self.clear_button.setEnabled(not vacio)
+
+    def handle_item_activated(self, item):
+        """Emitir la clave de la entrada elegida."""
+        self.entry_selected.emit(item.data(Qt.UserRole))
@@ -1,23 +1,70 @@
 import os
+from collections import OrderedDict
+from functools import partial
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, 
                             QLabel, QComboBox, QDoubleSpinBox, QPushButton, 
                             QGroupBox, QMessageBox, QTabWidget, QScrollArea,
-                            QSizePolicy, QSpacerItem, QFileDialog)
-from PyQt5.QtCore import Qt, pyqtSignal, QSettings, QRect, QPoint
+                            QSizePolicy, QSpacerItem, QFileDialog, QCheckBox)
+from PyQt5.QtCore import Qt, pyqtSignal, QSettings, QRect, QRectF, QThreadPool, QTimer
 from PyQt5.QtGui import QFont, QPixmap, QIcon, QPainter, QPen, QBrush, QColor, QPainterPath
 
+from app.utils.background_tasks import FunctionTask
+
+# Espera tras el último cambio antes de recalcular en modo en vivo (ms)
+LIVE_DEBOUNCE_MS = 250
+
+# Espera tras el último cambio de una dimensión antes de repintar el esquema (ms)
+SCHEMA_DEBOUNCE_MS = 80
+
+# Tamaño del esquema del perfil: alto fijo y ancho mínimo (píxeles lógicos)
+SCHEMA_HEIGHT = 200
+SCHEMA_MIN_WIDTH = 300
+
+# Esquemas dibujados que se conservan
+SCHEMA_CACHE_SIZE = 32
+
 class InputPanel(QWidget):
     """Panel para entrada de datos para el cálculo de pandeo."""
     
     # Señal emitida cuando se completa una predicción
     prediction_ready = pyqtSignal(dict)
     
+    # Señal emitida con el análisis de sensibilidad de la última predicción
+    sensitivity_ready = pyqtSignal(dict)
+    
+    # Señal emitida con cada predicción del modo en vivo
+    live_prediction_ready = pyqtSignal(dict)
+    
+    # Señal emitida al terminar un cálculo: parámetros, resultados y análisis
+    # de sensibilidad (None si no se ha podido calcular), para el historial
+    calculation_completed = pyqtSignal(dict, dict, object)
+    
     def __init__(self, prediction_model):
         super().__init__()
         
         # Guardar referencia al modelo de predicción
         self.prediction_model = prediction_model
         
+        # Los cálculos se ejecutan fuera del hilo de la interfaz. Un único hilo
+        # basta: cada cálculo nuevo cancela el anterior
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        self._calculation_task = None
+        self._live_task = None
+        
+        # Temporizador del modo en vivo: cada cambio lo reinicia, de modo que
+        # una ráfaga de ediciones produce un único cálculo
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(LIVE_DEBOUNCE_MS)
+        
+        # Esquema del perfil: los dibujados se memorizan por tipo, dimensiones
+        # y tamaño, y los cambios de dimensiones se agrupan antes de repintar
+        self._schema_cache = OrderedDict()
+        self.schema_timer = QTimer(self)
+        self.schema_timer.setSingleShot(True)
+        self.schema_timer.setInterval(SCHEMA_DEBOUNCE_MS)
+        
         # Inicializar UI
         self.setup_ui()
         
@@ -152,9 +199,11 @@ class InputPanel(QWidget):
         # Etiqueta para mostrar el esquema
         self.schema_label = QLabel()
         self.schema_label.setAlignment(Qt.AlignCenter)
-        self.schema_label.setMinimumHeight(200)
+        self.schema_label.setMinimumHeight(SCHEMA_HEIGHT)
+        # El ancho lo decide el panel, no el esquema (se dibuja a su medida)
+        self.schema_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Preferred)
         
-        # Intentar cargar imagen del perfil
+        # Dibujar el esquema del perfil
         self.update_profile_schema()
         
         schema_layout.addWidget(self.schema_label)
@@ -184,6 +233,21 @@ class InputPanel(QWidget):
         
         scroll_layout.addLayout(action_layout)
         
+        # Modo en vivo: recalcular automáticamente al editar
+        live_layout = QHBoxLayout()
+        self.live_check = QCheckBox("Cálculo en vivo")
+        self.live_check.setToolTip("Recalcular la carga máxima automáticamente al modificar los parámetros")
+        live_layout.addWidget(self.live_check)
+        
+        self.live_result_label = QLabel("")
+        live_font = QFont()
+        live_font.setBold(True)
+        self.live_result_label.setFont(live_font)
+        self.live_result_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        live_layout.addWidget(self.live_result_label)
+        
+        scroll_layout.addLayout(live_layout)
+        
         # Agregar espacio al final
         scroll_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
         
@@ -206,6 +270,21 @@ class InputPanel(QWidget):
         
         # Conectar señal de modelo cargado
         self.prediction_model.model_loaded.connect(self.handle_model_loaded)
+        
+        # Modo en vivo: cualquier cambio de los parámetros reinicia la espera
+        self.live_check.toggled.connect(self.handle_live_toggled)
+        self.live_timer.timeout.connect(self.calculate_live)
+        for combo in [self.tipo_perfil_combo, self.tipo_acero_combo, self.condicion_apoyo_combo]:
+            combo.currentIndexChanged.connect(self.schedule_live_calculation)
+        for spin in [self.longitud_spin, self.altura_perfil_spin, self.ancho_alas_spin, self.espesor_alma_spin,
+                     self.espesor_alas_spin, self.dimension_exterior_spin, self.espesor_spin]:
+            spin.valueChanged.connect(self.schedule_live_calculation)
+        
+        # Esquema del perfil: repintar tras una ráfaga de cambios de dimensiones
+        self.schema_timer.timeout.connect(self.update_profile_schema)
+        for spin in [self.altura_perfil_spin, self.ancho_alas_spin, self.espesor_alma_spin,
+                     self.espesor_alas_spin, self.dimension_exterior_spin, self.espesor_spin]:
+            spin.valueChanged.connect(self.schedule_schema_update)
     
     def update_dimension_fields(self):
         """Actualizar campos de dimensiones según el tipo de perfil seleccionado."""
@@ -266,193 +345,54 @@ class InputPanel(QWidget):
             from PyQt5.QtWidgets import QMessageBox
             QMessageBox.warning(self, "Advertencia", f"Error al cambiar el tipo de perfil: {str(e)}")
     
-    def update_profile_schema(self):
-        """Actualizar el esquema del perfil según el tipo seleccionado."""
+    def schedule_schema_update(self, *args):
+        """Reiniciar la espera antes de repintar el esquema (una ráfaga de cambios produce un único repintado)."""
+        self.schema_timer.start()
+    
+    def resizeEvent(self, event):
+        """Repintar el esquema con el nuevo tamaño del panel."""
+        super().resizeEvent(event)
+        self.schedule_schema_update()
+    
+    def schema_dimensions(self, tipo_perfil):
+        """
+        Dimensiones del perfil que intervienen en el esquema.
+        
+        Args:
+            tipo_perfil (str): Tipo de perfil.
+        
+        Returns:
+            tuple: (altura, ancho, espesor de alma, espesor de alas) para los
+                perfiles abiertos, (dimensión exterior, espesor) para los
+                tubulares o una tupla vacía para otros tipos, en mm.
+        """
+        if tipo_perfil in ['IPE', 'HEB', 'HEA', 'HEM', 'UPN', 'L', 'T']:
+            return (self.altura_perfil_spin.value(), self.ancho_alas_spin.value(),
+                    self.espesor_alma_spin.value(), self.espesor_alas_spin.value())
+        if tipo_perfil in ['Tubular cuadrado', 'Tubular circular']:
+            return (self.dimension_exterior_spin.value(), self.espesor_spin.value())
+        return ()
+    
+    def update_profile_schema(self, *args):
+        """Mostrar el esquema a escala del perfil actual, reutilizando el memorizado si lo hay."""
+        self.schema_timer.stop()
+        tipo_perfil = self.tipo_perfil_combo.currentText()
         try:
-            tipo_perfil = self.tipo_perfil_combo.currentText()
-            
-            # Crear un pixmap en blanco
-            pixmap = QPixmap(300, 200)
-            pixmap.fill(Qt.white)
-            
-            # Preparar pintor
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.Antialiasing)
-            
-            # Dibujar marco
-            pen = QPen(QColor(0, 0, 0))
-            pen.setWidth(1)
-            painter.setPen(pen)
-            painter.drawRect(5, 5, 290, 190)
+            dimensiones = self.schema_dimensions(tipo_perfil)
+            ancho = max(SCHEMA_MIN_WIDTH, self.schema_label.contentsRect().width())
+            ratio = self.schema_label.devicePixelRatioF()
             
-            # Dibujar título del esquema
-            painter.setFont(QFont("Arial", 10, QFont.Bold))
-            painter.drawText(QRect(10, 10, 280, 20), Qt.AlignCenter, f"Perfil {tipo_perfil}")
-            
-            # Dimensiones base
-            center_x = 150
-            center_y = 100
-            
-            if tipo_perfil in ['IPE', 'HEB', 'HEA', 'HEM']:
-                # Dimensiones para I/H
-                altura = 140
-                ancho = 80
-                espesor_alma = 6
-                espesor_alas = 10
-                
-                # Ala superior
-                painter.fillRect(
-                    center_x - ancho//2,
-                    center_y - altura//2,
-                    ancho,
-                    espesor_alas,
-                    QBrush(QColor(180, 180, 180))
-                )
-                
-                # Alma
-                painter.fillRect(
-                    center_x - espesor_alma//2,
-                    center_y - altura//2 + espesor_alas,
-                    espesor_alma,
-                    altura - 2*espesor_alas,
-                    QBrush(QColor(180, 180, 180))
-                )
-                
-                # Ala inferior
-                painter.fillRect(
-                    center_x - ancho//2,
-                    center_y + altura//2 - espesor_alas,
-                    ancho,
-                    espesor_alas,
-                    QBrush(QColor(180, 180, 180))
-                )
-                
-            elif tipo_perfil == 'UPN':
-                # Dimensiones para UPN
-                altura = 140
-                ancho = 60
-                espesor_alma = 6
-                espesor_alas = 10
-                
-                # Alma (lado izquierdo)
-                painter.fillRect(
-                    center_x - ancho//2,
-                    center_y - altura//2,
-                    espesor_alma,
-                    altura,
-                    QBrush(QColor(180, 180, 180))
-                )
-                
-                # Ala superior
-                painter.fillRect(
-                    center_x - ancho//2,
-                    center_y - altura//2,
-                    ancho,
-                    espesor_alas,
-                    QBrush(QColor(180, 180, 180))
-                )
-                
-                # Ala inferior
-                painter.fillRect(
-                    center_x - ancho//2,
-                    center_y + altura//2 - espesor_alas,
-                    ancho,
-                    espesor_alas,
-                    QBrush(QColor(180, 180, 180))
-                )
-                
-            elif tipo_perfil == 'Tubular cuadrado':
-                # Dimensiones para tubular cuadrado
-                tam_ext = 100
-                espesor = 8
-                
-                # Cuadrado exterior
-                painter.setBrush(QBrush(QColor(180, 180, 180)))
-                painter.drawRect(
-                    center_x - tam_ext//2,
-                    center_y - tam_ext//2,
-                    tam_ext,
-                    tam_ext
-                )
-                
-                # Cuadrado interior (hueco)
-                painter.setBrush(QBrush(QColor(255, 255, 255)))
-                painter.drawRect(
-                    center_x - tam_ext//2 + espesor,
-                    center_y - tam_ext//2 + espesor,
-                    tam_ext - 2*espesor,
-                    tam_ext - 2*espesor
-                )
-                
-            elif tipo_perfil == 'Tubular circular':
-                # Dimensiones para tubular circular
-                radio_ext = 50
-                espesor = 8
-                radio_int = radio_ext - espesor
-                
-                # Círculo exterior
-                painter.setBrush(QBrush(QColor(180, 180, 180)))
-                painter.drawEllipse(QPoint(center_x, center_y), radio_ext, radio_ext)
-                
-                # Círculo interior (hueco)
-                painter.setBrush(QBrush(QColor(255, 255, 255)))
-                painter.drawEllipse(QPoint(center_x, center_y), radio_int, radio_int)
-                
-            elif tipo_perfil == 'L':
-                # Dimensiones para ángulo L
-                altura = 120
-                ancho = 80
-                espesor = 10
-                
-                # Dibujar la L con un camino
-                path = QPainterPath()
-                path.moveTo(center_x - ancho//2, center_y - altura//2)
-                path.lineTo(center_x - ancho//2, center_y + altura//2)
-                path.lineTo(center_x - ancho//2 + ancho, center_y + altura//2)
-                path.lineTo(center_x - ancho//2 + ancho, center_y + altura//2 - espesor)
-                path.lineTo(center_x - ancho//2 + espesor, center_y + altura//2 - espesor)
-                path.lineTo(center_x - ancho//2 + espesor, center_y - altura//2)
-                path.closeSubpath()
-                
-                painter.fillPath(path, QBrush(QColor(180, 180, 180)))
-                
-            elif tipo_perfil == 'T':
-                # Dimensiones para T
-                altura = 120
-                ancho = 80
-                espesor_alma = 10
-                espesor_ala = 10
-                
-                # Ala horizontal (superior)
-                painter.fillRect(
-                    center_x - ancho//2,
-                    center_y - altura//2,
-                    ancho,
-                    espesor_ala,
-                    QBrush(QColor(180, 180, 180))
-                )
-                
-                # Alma vertical
-                painter.fillRect(
-                    center_x - espesor_alma//2,
-                    center_y - altura//2 + espesor_ala,
-                    espesor_alma,
-                    altura - espesor_ala,
-                    QBrush(QColor(180, 180, 180))
-                )
-                
+            # Las dimensiones se redondean a la décima de milímetro: a esta
+            # escala no hay diferencia visible por debajo
+            clave = (tipo_perfil, tuple(round(valor, 1) for valor in dimensiones), ancho, SCHEMA_HEIGHT, ratio)
+            pixmap = self._schema_cache.get(clave)
+            if pixmap is None:
+                pixmap = self.render_profile_schema(tipo_perfil, dimensiones, ancho, SCHEMA_HEIGHT, ratio)
+                self._schema_cache[clave] = pixmap
+                while len(self._schema_cache) > SCHEMA_CACHE_SIZE:
+                    self._schema_cache.popitem(last=False)
             else:
-                # Para perfiles desconocidos o no implementados
-                painter.setFont(QFont("Arial", 12))
-                painter.drawText(QRect(10, 50, 280, 100), Qt.AlignCenter, f"Esquema no disponible\npara perfil {tipo_perfil}")
-            
-            # Dibujar dimensiones y cotas
-            pen.setWidth(1)
-            pen.setStyle(Qt.DashLine)
-            painter.setPen(pen)
-            
-            # Finalizar pintor
-            painter.end()
+                self._schema_cache.move_to_end(clave)
             
             # Mostrar esquema
             self.schema_label.setPixmap(pixmap)
@@ -463,14 +403,124 @@ class InputPanel(QWidget):
             print(traceback.format_exc())
             
             # En caso de error, mostrar un esquema de fallback
-            pixmap = QPixmap(300, 200)
+            pixmap = QPixmap(SCHEMA_MIN_WIDTH, SCHEMA_HEIGHT)
             pixmap.fill(Qt.white)
             painter = QPainter(pixmap)
             painter.setFont(QFont("Arial", 12))
-            painter.drawText(QRect(10, 10, 280, 180), Qt.AlignCenter, f"Perfil {tipo_perfil}\n(Error al generar esquema)")
+            painter.drawText(QRect(10, 10, SCHEMA_MIN_WIDTH - 20, SCHEMA_HEIGHT - 20), Qt.AlignCenter,
+                             f"Perfil {tipo_perfil}\n(Error al generar esquema)")
             painter.end()
             self.schema_label.setPixmap(pixmap)
     
+    def render_profile_schema(self, tipo_perfil, dimensiones, ancho, alto, ratio=1.0):
+        """
+        Dibujar la sección del perfil a escala.
+        
+        Args:
+            tipo_perfil (str): Tipo de perfil.
+            dimensiones (tuple): Dimensiones devueltas por schema_dimensions (mm).
+            ancho (int): Ancho del esquema en píxeles lógicos.
+            alto (int): Alto del esquema en píxeles lógicos.
+            ratio (float): Relación entre píxeles físicos y lógicos de la pantalla.
+        
+        Returns:
+            QPixmap: Esquema dibujado.
+        """
+        # Crear un pixmap en blanco con la resolución real de la pantalla
+        pixmap = QPixmap(int(round(ancho * ratio)), int(round(alto * ratio)))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.white)
+        
+        # Preparar pintor
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        # Dibujar marco
+        pen = QPen(QColor(0, 0, 0))
+        pen.setWidth(1)
+        painter.setPen(pen)
+        painter.drawRect(5, 5, ancho - 10, alto - 10)
+        
+        # Dibujar título del esquema
+        painter.setFont(QFont("Arial", 10, QFont.Bold))
+        painter.drawText(QRect(10, 10, ancho - 20, 20), Qt.AlignCenter, f"Perfil {tipo_perfil}")
+        
+        # Zona de dibujo, entre el título y la línea de cotas
+        zona = QRectF(20, 35, ancho - 40, alto - 65)
+        
+        # Sección en mm, con el origen en la esquina superior izquierda de
+        # su rectángulo envolvente
+        seccion = QPainterPath()
+        if tipo_perfil in ['IPE', 'HEB', 'HEA', 'HEM', 'UPN', 'L', 'T']:
+            altura, ancho_alas, espesor_alma, espesor_alas = dimensiones
+            # Espesores acotados para que la sección sea siempre dibujable
+            espesor_alma = min(espesor_alma, ancho_alas)
+            espesor_alas = min(espesor_alas, altura / 2)
+            
+            if tipo_perfil == 'UPN':
+                # Alma a la izquierda y alas hacia la derecha
+                seccion.addRect(QRectF(0, 0, ancho_alas, espesor_alas))
+                seccion.addRect(QRectF(0, espesor_alas, espesor_alma, altura - 2 * espesor_alas))
+                seccion.addRect(QRectF(0, altura - espesor_alas, ancho_alas, espesor_alas))
+            elif tipo_perfil == 'L':
+                # Ala vertical con el espesor de alma y horizontal con el de alas
+                seccion.addRect(QRectF(0, 0, espesor_alma, altura - espesor_alas))
+                seccion.addRect(QRectF(0, altura - espesor_alas, ancho_alas, espesor_alas))
+            elif tipo_perfil == 'T':
+                # Ala horizontal (superior) y alma vertical centrada
+                seccion.addRect(QRectF(0, 0, ancho_alas, espesor_alas))
+                seccion.addRect(QRectF((ancho_alas - espesor_alma) / 2, espesor_alas,
+                                       espesor_alma, altura - espesor_alas))
+            else:
+                # Perfiles I/H: dos alas y alma centrada
+                seccion.addRect(QRectF(0, 0, ancho_alas, espesor_alas))
+                seccion.addRect(QRectF((ancho_alas - espesor_alma) / 2, espesor_alas,
+                                       espesor_alma, altura - 2 * espesor_alas))
+                seccion.addRect(QRectF(0, altura - espesor_alas, ancho_alas, espesor_alas))
+            cotas = f"{altura:g} × {ancho_alas:g} mm · tw = {espesor_alma:g} · tf = {espesor_alas:g} mm"
+            
+        elif tipo_perfil in ['Tubular cuadrado', 'Tubular circular']:
+            exterior, espesor = dimensiones
+            espesor = min(espesor, exterior / 2)
+            interior = exterior - 2 * espesor
+            
+            # El hueco se resta con la regla par-impar del camino
+            if tipo_perfil == 'Tubular cuadrado':
+                seccion.addRect(QRectF(0, 0, exterior, exterior))
+                seccion.addRect(QRectF(espesor, espesor, interior, interior))
+                cotas = f"{exterior:g} × {exterior:g} mm · t = {espesor:g} mm"
+            else:
+                seccion.addEllipse(QRectF(0, 0, exterior, exterior))
+                seccion.addEllipse(QRectF(espesor, espesor, interior, interior))
+                cotas = f"Ø {exterior:g} mm · t = {espesor:g} mm"
+            
+        else:
+            # Para perfiles desconocidos o no implementados
+            painter.setFont(QFont("Arial", 12))
+            painter.drawText(QRect(10, 50, ancho - 20, alto - 100), Qt.AlignCenter,
+                             f"Esquema no disponible\npara perfil {tipo_perfil}")
+            painter.end()
+            return pixmap
+        
+        # Escalar la sección (mm) para que ocupe la zona de dibujo sin deformarse
+        envolvente = seccion.boundingRect()
+        if envolvente.width() > 0 and envolvente.height() > 0:
+            escala = min(zona.width() / envolvente.width(), zona.height() / envolvente.height())
+            painter.save()
+            painter.translate(zona.center())
+            painter.scale(escala, escala)
+            painter.translate(-envolvente.center())
+            painter.fillPath(seccion, QBrush(QColor(180, 180, 180)))
+            painter.restore()
+        
+        # Dibujar cotas
+        painter.setFont(QFont("Arial", 8))
+        painter.drawText(QRect(10, alto - 28, ancho - 20, 18), Qt.AlignCenter, cotas)
+        
+        # Finalizar pintor
+        painter.end()
+        return pixmap
+    
     def clear_fields(self):
         """Limpiar todos los campos del formulario."""
         # Restablecer valores predeterminados
@@ -538,6 +588,7 @@ class InputPanel(QWidget):
                 "No se ha podido cargar el modelo de predicción. Algunas funcionalidades pueden no estar disponibles."
             )
             self.calculate_button.setEnabled(False)
+            self.live_check.setEnabled(False)
     
     def get_current_config(self):
         """Obtener la configuración actual como diccionario."""
@@ -606,20 +657,147 @@ class InputPanel(QWidget):
             )
     
     def calculate(self):
-        """Realizar cálculo de predicción con los parámetros actuales."""
+        """Lanzar el cálculo de predicción con los parámetros actuales en segundo plano."""
         try:
             # Obtener configuración actual
             params = self.get_current_config()
-            
-            # Realizar predicción
-            results = self.prediction_model.predict(params)
-            
-            # Emitir señal con resultados
-            self.prediction_ready.emit(results)
-            
         except Exception as e:
             QMessageBox.critical(
                 self,
                 "Error en el cálculo",
                 f"Se ha producido un error durante el cálculo: {str(e)}"
-            ) 
\ No newline at end of file
+            )
+            return
+        
+        # El resultado de un cálculo anterior aún en curso ya no interesa
+        self.cancel_calculation()
+        
+        task = FunctionTask(self._run_calculation, params)
+        task.signals.finished.connect(partial(self._handle_calculation_finished, task))
+        task.signals.failed.connect(partial(self._handle_calculation_failed, task))
+        task.signals.cancelled.connect(partial(self._handle_calculation_cancelled, task))
+        self._calculation_task = task
+        
+        self.calculate_button.setText("Calculando...")
+        self.thread_pool.start(task)
+    
+    def cancel_calculation(self):
+        """Cancelar el cálculo en curso (si lo hay)."""
+        if self._calculation_task is not None:
+            self._calculation_task.cancel()
+            self._calculation_task = None
+            self.calculate_button.setText("Calcular")
+    
+    def handle_live_toggled(self, checked):
+        """Activar o desactivar el modo en vivo."""
+        if checked:
+            self.schedule_live_calculation()
+        else:
+            self.live_timer.stop()
+            if self._live_task is not None:
+                self._live_task.cancel()
+                self._live_task = None
+            self.live_result_label.setText("")
+    
+    def schedule_live_calculation(self, *args):
+        """Programar un cálculo en vivo tras la espera (si el modo está activo)."""
+        if self.live_check.isChecked():
+            self.live_timer.start()
+    
+    def calculate_live(self):
+        """Lanzar el cálculo en vivo con los parámetros actuales en segundo plano."""
+        try:
+            params = self.get_current_config()
+        except Exception as e:
+            print(f"Error en el cálculo en vivo: {str(e)}")
+            return
+        
+        # Solo interesa el cálculo más reciente
+        if self._live_task is not None:
+            self._live_task.cancel()
+        
+        task = FunctionTask(self._run_live_calculation, params)
+        task.signals.finished.connect(partial(self._handle_live_finished, task))
+        task.signals.failed.connect(partial(self._handle_live_failed, task))
+        self._live_task = task
+        self.thread_pool.start(task)
+    
+    def _run_live_calculation(self, params, token):
+        """Realizar solo la predicción, sin análisis de sensibilidad (hilo de trabajo)."""
+        return self.prediction_model.predict(params)
+    
+    def _handle_live_finished(self, task, results):
+        """Mostrar el resultado de un cálculo en vivo (hilo de la interfaz)."""
+        if task is not self._live_task:
+            return
+        self._live_task = None
+        self.live_result_label.setText(f"Carga máxima: {results['carga_maxima_kN']:.2f} kN")
+        self.live_prediction_ready.emit(results)
+    
+    def _handle_live_failed(self, task, mensaje, traza):
+        """Indicar que los parámetros actuales no se pueden calcular."""
+        if task is not self._live_task:
+            return
+        self._live_task = None
+        self.live_result_label.setText("Carga máxima: —")
+        print(f"Error en el cálculo en vivo: {mensaje}")
+    
+    def _run_calculation(self, params, token):
+        """
+        Realizar la predicción y su análisis de sensibilidad (hilo de trabajo).
+        
+        Args:
+            params (dict): Parámetros de entrada.
+            token (CancellationToken): Token de cancelación del cálculo.
+        
+        Returns:
+            tuple: Resultados de la predicción y análisis de sensibilidad
+                (None si no se ha podido calcular).
+        """
+        results = self.prediction_model.predict(params)
+        token.check()
+        
+        try:
+            # Análisis de sensibilidad (una única llamada al modelo por lotes)
+            sensitivity = self.prediction_model.analyze_sensitivity(params)
+        except Exception as e:
+            import traceback
+            print(f"Error en el análisis de sensibilidad: {str(e)}")
+            print(traceback.format_exc())
+            sensitivity = None
+        
+        return results, sensitivity
+    
+    def _handle_calculation_finished(self, task, resultado):
+        """Entregar los resultados de un cálculo terminado (hilo de la interfaz)."""
+        # Un cálculo sustituido por otro más reciente se descarta
+        if task is not self._calculation_task:
+            return
+        self._calculation_task = None
+        self.calculate_button.setText("Calcular")
+        
+        results, sensitivity = resultado
+        self.prediction_ready.emit(results)
+        if sensitivity is not None:
+            self.sensitivity_ready.emit(sensitivity)
+        self.calculation_completed.emit(task.args[0], results, sensitivity)
+    
+    def _handle_calculation_failed(self, task, mensaje, traza):
+        """Informar del error de un cálculo (hilo de la interfaz)."""
+        if task is not self._calculation_task:
+            return
+        self._calculation_task = None
+        self.calculate_button.setText("Calcular")
+        
+        print(traza)
+        QMessageBox.critical(
+            self,
+            "Error en el cálculo",
+            f"Se ha producido un error durante el cálculo: {mensaje}"
+        )
+    
+    def _handle_calculation_cancelled(self, task):
+        """Liberar la referencia de un cálculo cancelado."""
+        if task is self._calculation_task:
+            self._calculation_task = None
+            self.calculate_button.setText("Calcular")
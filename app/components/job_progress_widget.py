@@ -0,0 +1,135 @@
+from functools import partial
+
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QProgressBar, QToolButton
+
+
+def format_remaining(segundos):
+    """
+    Formatear el tiempo restante estimado de un trabajo.
+
+    Args:
+        segundos (float): Segundos restantes (negativo si aún no se conocen).
+
+    Returns:
+        str: Texto breve, p. ej. "quedan 12 s" o "quedan 3 min 05 s".
+    """
+    if segundos < 0:
+        return "calculando el tiempo restante…"
+    segundos = int(round(segundos))
+    if segundos < 60:
+        return f"quedan {segundos} s"
+    return f"quedan {segundos // 60} min {segundos % 60:02d} s"
+
+
+class JobProgressWidget(QWidget):
+    """
+    Indicador de progreso compartido para la barra de estado.
+
+    Muestra el último trabajo lanzado con JobManager: su título, la etapa,
+    el porcentaje, el tiempo restante estimado y un botón para cancelarlo.
+    Si hay varios trabajos en curso, indica cuántos más quedan; se oculta
+    cuando no queda ninguno.
+    """
+
+    def __init__(self, job_manager, parent=None):
+        """
+        Crear el indicador.
+
+        Args:
+            job_manager (JobManager): Lanzador de trabajos a seguir.
+            parent (QWidget, opcional): Widget padre.
+        """
+        super().__init__(parent)
+
+        # Trabajos en curso (el último es el que se muestra) y su último progreso
+        self.jobs = []
+        self.progress = {}
+
+        self.setup_ui()
+        job_manager.job_started.connect(self.track)
+        self.setVisible(False)
+
+    def setup_ui(self):
+        """Configurar la interfaz del indicador."""
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        self.title_label = QLabel()
+        layout.addWidget(self.title_label)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFixedWidth(160)
+        self.progress_bar.setMaximumHeight(16)
+        layout.addWidget(self.progress_bar)
+
+        self.remaining_label = QLabel()
+        layout.addWidget(self.remaining_label)
+
+        self.cancel_button = QToolButton()
+        self.cancel_button.setText("Cancelar")
+        self.cancel_button.clicked.connect(self.cancel_current)
+        layout.addWidget(self.cancel_button)
+
+    def track(self, job):
+        """Empezar a mostrar un trabajo recién lanzado."""
+        self.jobs.append(job)
+        self.progress[job] = (0, 0, -1.0, "")
+        job.signals.progress.connect(partial(self.handle_progress, job))
+        job.signals.finished.connect(partial(self.handle_done, job))
+        job.signals.failed.connect(partial(self.handle_done, job))
+        job.signals.cancelled.connect(partial(self.handle_done, job))
+        self.refresh()
+
+    def handle_progress(self, job, hecho, total, restante, mensaje):
+        """Guardar el progreso de un trabajo y actualizar si es el que se muestra."""
+        if job not in self.progress:
+            return
+        self.progress[job] = (hecho, total, restante, mensaje)
+        if self.jobs and job is self.jobs[-1]:
+            self.refresh()
+
+    def handle_done(self, job, *args):
+        """Dejar de mostrar un trabajo terminado, fallido o cancelado."""
+        if job in self.jobs:
+            self.jobs.remove(job)
+        self.progress.pop(job, None)
+        self.refresh()
+
+    def cancel_current(self):
+        """Cancelar el trabajo que se muestra."""
+        if self.jobs:
+            job = self.jobs[-1]
+            job.cancel()
+            self.remaining_label.setText("cancelando…")
+            self.cancel_button.setEnabled(False)
+
+    def refresh(self):
+        """Mostrar el estado del último trabajo en curso, u ocultar el indicador."""
+        if not self.jobs:
+            self.setVisible(False)
+            return
+
+        job = self.jobs[-1]
+        hecho, total, restante, mensaje = self.progress[job]
+
+        titulo = job.title
+        if mensaje:
+            titulo += f": {mensaje}"
+        if len(self.jobs) > 1:
+            titulo += f" (+{len(self.jobs) - 1} en curso)"
+        self.title_label.setText(titulo)
+
+        if total > 0:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(min(hecho, total))
+            self.remaining_label.setText(format_remaining(restante))
+        else:
+            # Sin total conocido: barra indeterminada
+            self.progress_bar.setRange(0, 0)
+            self.remaining_label.setText("")
+
+        self.cancel_button.setEnabled(not job.token.cancelled)
+        if job.token.cancelled:
+            self.remaining_label.setText("cancelando…")
+        self.setVisible(True)
@@ -3,9 +3,6 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                             QTableWidget, QTableWidgetItem, QHeaderView)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QColor, QBrush
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 import numpy as np
 
 class ResultsPanel(QWidget):
@@ -19,6 +16,7 @@ class ResultsPanel(QWidget):
         
         # Resultados actuales
         self.current_results = None
+        self.current_sensitivity = None
         
         # Inicializar UI
         self.setup_ui()
@@ -98,33 +96,36 @@ class ResultsPanel(QWidget):
         right_layout = QVBoxLayout(right_panel)
         right_layout.setContentsMargins(0, 0, 0, 0)
         
-        # Pestañas para diferentes gráficos
+        # Pestañas para diferentes gráficos. Las figuras de matplotlib se
+        # crean con los primeros resultados (ver create_charts)
         self.graph_tabs = QTabWidget()
+        self.charts_created = False
+        
+        # Gráficos actualizados que aún no se han dibujado (solo se dibuja
+        # la pestaña visible; el resto, al seleccionarla)
+        self.dirty_charts = set()
+        self.graph_tabs.currentChanged.connect(self.draw_visible_chart)
         
         # Gráfico 1: Relación carga-esbeltez
         self.chart1_widget = QWidget()
-        chart1_layout = QVBoxLayout(self.chart1_widget)
-        self.figure1 = Figure(figsize=(5, 4), dpi=100)
-        self.canvas1 = FigureCanvas(self.figure1)
-        chart1_layout.addWidget(self.canvas1)
+        QVBoxLayout(self.chart1_widget)
         self.graph_tabs.addTab(self.chart1_widget, "Relación Carga-Esbeltez")
         
         # Gráfico 2: Comparación con carga crítica de Euler
         self.chart2_widget = QWidget()
-        chart2_layout = QVBoxLayout(self.chart2_widget)
-        self.figure2 = Figure(figsize=(5, 4), dpi=100)
-        self.canvas2 = FigureCanvas(self.figure2)
-        chart2_layout.addWidget(self.canvas2)
+        QVBoxLayout(self.chart2_widget)
         self.graph_tabs.addTab(self.chart2_widget, "Comparación con Euler")
         
         # Gráfico 3: Factor de reducción
         self.chart3_widget = QWidget()
-        chart3_layout = QVBoxLayout(self.chart3_widget)
-        self.figure3 = Figure(figsize=(5, 4), dpi=100)
-        self.canvas3 = FigureCanvas(self.figure3)
-        chart3_layout.addWidget(self.canvas3)
+        QVBoxLayout(self.chart3_widget)
         self.graph_tabs.addTab(self.chart3_widget, "Factor de Reducción")
         
+        # Gráfico 4: Diagrama de tornado de sensibilidad
+        self.chart4_widget = QWidget()
+        QVBoxLayout(self.chart4_widget)
+        self.graph_tabs.addTab(self.chart4_widget, "Sensibilidad")
+        
         right_layout.addWidget(self.graph_tabs)
         
         # Agregar paneles al splitter
@@ -141,6 +142,22 @@ class ResultsPanel(QWidget):
         
         self.setLayout(main_layout)
     
+    def create_charts(self):
+        """Importar matplotlib y crear las figuras de los gráficos (solo la primera vez)."""
+        if self.charts_created:
+            return
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        
+        for i, widget in enumerate([self.chart1_widget, self.chart2_widget, self.chart3_widget,
+                                    self.chart4_widget], start=1):
+            figure = Figure(figsize=(5, 4), dpi=100)
+            canvas = FigureCanvas(figure)
+            widget.layout().addWidget(canvas)
+            setattr(self, f"figure{i}", figure)
+            setattr(self, f"canvas{i}", canvas)
+        self.charts_created = True
+    
     def update_results(self, results):
         """
         Actualizar los resultados mostrados.
@@ -236,6 +253,8 @@ class ResultsPanel(QWidget):
         Args:
             results (dict): Diccionario con los resultados de la predicción.
         """
+        self.create_charts()
+        
         # Gráfico 1: Relación carga-esbeltez
         self.figure1.clear()
         ax1 = self.figure1.add_subplot(111)
@@ -312,9 +331,63 @@ class ResultsPanel(QWidget):
         ax3.grid(True, linestyle='--', alpha=0.7)
         
         # Actualizar gráficos
-        self.canvas1.draw()
-        self.canvas2.draw()
-        self.canvas3.draw()
+        self.dirty_charts.update((1, 2, 3))
+        self.draw_visible_chart()
+    
+    def update_sensitivity(self, sensitivity):
+        """
+        Actualizar el diagrama de tornado con el análisis de sensibilidad.
+        
+        Args:
+            sensitivity (dict): Resultado de PredictionModel.analyze_sensitivity.
+        """
+        # Guardar análisis actual
+        self.current_sensitivity = sensitivity
+        
+        self.create_charts()
+        self.figure4.clear()
+        ax4 = self.figure4.add_subplot(111)
+        
+        tornado = sensitivity['tornado']
+        carga_base = sensitivity['carga_base_kN']
+        elasticidades = sensitivity['elasticidades']
+        
+        # Barras horizontales desde la carga mínima a la máxima, mayor rango arriba
+        etiquetas = [fila[0] for fila in reversed(tornado)]
+        minimos = np.array([fila[1] for fila in reversed(tornado)])
+        maximos = np.array([fila[2] for fila in reversed(tornado)])
+        posiciones = np.arange(len(tornado))
+        
+        ax4.barh(posiciones, carga_base - minimos, left=minimos, color='#d62728', alpha=0.8, label='Disminución')
+        ax4.barh(posiciones, maximos - carga_base, left=carga_base, color='#2ca02c', alpha=0.8, label='Aumento')
+        ax4.axvline(carga_base, color='black', linewidth=1)
+        
+        # Añadir elasticidades a las etiquetas de los parámetros numéricos
+        from app.models.sensitivity import ETIQUETAS
+        elasticidad_por_etiqueta = {ETIQUETAS.get(k, k): v for k, v in elasticidades.items()}
+        etiquetas = [
+            f"{e} (ε={elasticidad_por_etiqueta[e]:.2f})" if e in elasticidad_por_etiqueta else e
+            for e in etiquetas
+        ]
+        
+        # Personalizar gráfico
+        ax4.set_yticks(posiciones)
+        ax4.set_yticklabels(etiquetas, fontsize=8)
+        ax4.set_xlabel('Carga Máxima (kN)')
+        ax4.set_title('Sensibilidad de la Carga Máxima')
+        ax4.grid(True, axis='x', linestyle='--', alpha=0.7)
+        ax4.legend(fontsize=8)
+        self.figure4.tight_layout()
+        
+        self.dirty_charts.add(4)
+        self.draw_visible_chart()
+    
+    def draw_visible_chart(self, *args):
+        """Dibujar el gráfico de la pestaña visible si tiene cambios pendientes."""
+        indice = self.graph_tabs.currentIndex() + 1
+        if self.charts_created and indice in self.dirty_charts:
+            self.dirty_charts.discard(indice)
+            getattr(self, f"canvas{indice}").draw_idle()
         
     def reset(self):
         """Reiniciar el panel de resultados."""
@@ -327,4 +400,5 @@ class ResultsPanel(QWidget):
         self.graph_tabs.setVisible(False)
         
         # Limpiar resultados actuales
-        self.current_results = None 
\ No newline at end of file
+        self.current_results = None
+        self.current_sensitivity = None 
\ No newline at end of file
@@ -1,22 +1,14 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, 
                             QLabel, QSlider, QPushButton, QSpinBox, QCheckBox,
                             QSplitter, QFormLayout, QMessageBox, QComboBox,
-                            QFileDialog, QApplication)
+                            QFileDialog)
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont
+from functools import partial
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from matplotlib.animation import FuncAnimation
-import matplotlib.patches as mpatches
-import matplotlib.colors as mcolors
-import sys
 import os
 
-# Añadir ruta al directorio padre
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.result_exporter import ResultExporter
+from app.utils.background_tasks import Job, JobManager, TaskCancelled
 
 class SimulationPanel(QWidget):
     """Panel para simulación animada del fenómeno de pandeo."""
@@ -24,9 +16,19 @@ class SimulationPanel(QWidget):
     # Señal emitida cuando cambia la animación
     animation_step_changed = pyqtSignal(int)
     
-    def __init__(self):
+    def __init__(self, job_manager=None):
+        """
+        Crear el panel.
+        
+        Args:
+            job_manager (JobManager, opcional): Lanzador de las exportaciones en
+                segundo plano (por defecto, uno propio del panel).
+        """
         super().__init__()
         
+        # Las exportaciones se ejecutan como trabajos fuera del hilo de la interfaz
+        self.job_manager = job_manager or JobManager()
+        
         # Resultados actuales
         self.current_results = None
         
@@ -183,11 +185,11 @@ class SimulationPanel(QWidget):
         right_layout = QVBoxLayout(right_panel)
         right_layout.setContentsMargins(0, 0, 0, 0)
         
-        # Crear figura para simulación
-        self.figure = Figure(figsize=(8, 6), dpi=100)
-        self.canvas = FigureCanvas(self.figure)
-        self.canvas.setParent(right_panel)
-        right_layout.addWidget(self.canvas)
+        # La figura de simulación (matplotlib con ejes 3D) se crea al mostrar
+        # el panel por primera vez (ver create_figure)
+        self.figure = None
+        self.canvas = None
+        self.figure_panel = right_panel
         
         # Agregar paneles al splitter
         splitter.addWidget(left_panel)
@@ -199,9 +201,6 @@ class SimulationPanel(QWidget):
         # Conectar señales
         self.connect_signals()
         
-        # Inicializar figura vacía
-        self.init_figure()
-        
         # Ocultar inicialmente los controles de simulación
         self.reset_button.setEnabled(False)
         self.play_button.setEnabled(False)
@@ -220,6 +219,26 @@ class SimulationPanel(QWidget):
         self.show_deformed_check.stateChanged.connect(self.update_simulation)
         self.animation_step_changed.connect(self.update_animation_display)
     
+    def showEvent(self, event):
+        """Crear la figura la primera vez que se muestra el panel."""
+        super().showEvent(event)
+        self.create_figure()
+    
+    def create_figure(self):
+        """Importar matplotlib y crear la figura de simulación (solo la primera vez)."""
+        if self.figure is not None:
+            return
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        
+        self.figure = Figure(figsize=(8, 6), dpi=100)
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.setParent(self.figure_panel)
+        self.figure_panel.layout().addWidget(self.canvas)
+        
+        # Inicializar figura vacía
+        self.init_figure()
+    
     def init_figure(self):
         """Inicializar figura vacía."""
         self.figure.clear()
@@ -261,6 +280,8 @@ class SimulationPanel(QWidget):
         if self.current_results is None or not isinstance(self.current_results, dict):
             return
         
+        self.create_figure()
+        
         # Ocultar mensaje inicial
         self.empty_label.setVisible(False)
         
@@ -507,6 +528,8 @@ class SimulationPanel(QWidget):
     
     def update_animation_display(self, step):
         """Actualizar visualización de la animación según el paso actual."""
+        import matplotlib.pyplot as plt
+        
         if not self.profile_patches or not isinstance(self.current_results, dict):
             return
         
@@ -778,20 +801,9 @@ class SimulationPanel(QWidget):
             self.timer.start(value)
     
     def export_simulation(self):
-        """Exportar simulación como archivo de video."""
-        from PyQt5.QtWidgets import QFileDialog, QMessageBox
-        
-        try:
-            import matplotlib.animation as animation
-            import matplotlib.pyplot as plt
-            from matplotlib.backends.backend_agg import FigureCanvasAgg
-        except ImportError:
-            QMessageBox.critical(
-                self, 
-                "Error", 
-                "No se han podido importar las bibliotecas necesarias para exportar la simulación.\n"
-                "Asegúrese de tener instalado FFmpeg y matplotlib."
-            )
+        """Exportar simulación como archivo de video (en segundo plano)."""
+        if not isinstance(self.current_results, dict) or not self.profile_patches:
+            QMessageBox.warning(self, "Error", "No hay ninguna simulación para exportar.")
             return
         
         # Abrir diálogo para guardar archivo
@@ -805,141 +817,191 @@ class SimulationPanel(QWidget):
         if not file_path:
             return
         
+        # Copiar el estado de la simulación: el trabajo no debe leer los
+        # controles de la interfaz desde el hilo de fondo
+        view_type = self.view_type_combo.currentText()
+        if view_type == "Frontal":
+            vista = (0, 0)
+        elif view_type == "Lateral":
+            vista = (0, 90)
+        elif view_type == "Superior":
+            vista = (90, 0)
+        else:  # Isométrica
+            vista = (30, 30)
+        
+        ajustes = {
+            'vista': vista,
+            'longitud_mm': self.current_results['longitud_mm'],
+            'desplazamiento_lateral_mm': self.current_results['desplazamiento_lateral_mm'],
+            'carga_maxima_kN': self.current_results['carga_maxima_kN'],
+            'factor_escala': self.scale_factor_slider.value() / 50.0,
+            'mostrar_deformada': self.show_deformed_check.isChecked(),
+            'mostrar_tensiones': self.show_stress_check.isChecked(),
+            'intervalo_ms': self.speed_spin.value(),
+            'pasos': self.total_steps,
+            'secciones': [(x_orig, y_orig, z) for _, x_orig, y_orig, z in self.profile_patches]
+        }
+        
+        job = Job("Exportando simulación", self._run_simulation_export, file_path, ajustes)
+        job.signals.finished.connect(self._handle_export_finished)
+        job.signals.failed.connect(partial(self._handle_export_failed, "la simulación"))
+        job.signals.cancelled.connect(partial(self._handle_export_cancelled, file_path))
+        self.job_manager.start(job)
+    
+    def _run_simulation_export(self, file_path, ajustes, token, progress):
+        """
+        Renderizar la animación y guardarla en un archivo (hilo de trabajo).
+        
+        Se usa una figura Agg independiente de la interfaz, de modo que el
+        renderizado no toca ningún widget de Qt.
+        
+        Args:
+            file_path (str): Archivo MP4 o GIF de destino.
+            ajustes (dict): Copia del estado de la simulación.
+            token (CancellationToken): Token de cancelación.
+            progress (ProgressReporter): Función de progreso.
+        
+        Returns:
+            tuple: Ruta del archivo y aviso (None si no hay).
+        """
         try:
-            # Crear nueva figura para la exportación
-            fig = plt.figure(figsize=(10, 8), dpi=100)
-            ax = fig.add_subplot(111, projection='3d')
-            
-            # Configurar vista según selección
-            view_type = self.view_type_combo.currentText()
-            if view_type == "Frontal":
-                ax.view_init(elev=0, azim=0)
-            elif view_type == "Lateral":
-                ax.view_init(elev=0, azim=90)
-            elif view_type == "Superior":
-                ax.view_init(elev=90, azim=0)
-            else:  # Isométrica
-                ax.view_init(elev=30, azim=30)
-            
-            # Configurar ejes
-            longitud_mm = self.current_results['longitud_mm']
-            max_dim = max(longitud_mm, 500)
-            
-            ax.set_xlim(-max_dim/4, max_dim/4)
-            ax.set_ylim(-max_dim/4, max_dim/4)
-            ax.set_zlim(0, longitud_mm)
-            
-            ax.set_xlabel('X (mm)')
-            ax.set_ylabel('Y (mm)')
-            ax.set_zlabel('Z (mm)')
-            
-            # Crear geometría y parches iniciales
-            patches = []
-            x_orig_list = []
-            y_orig_list = []
-            z_list = []
-            
-            # Recrear geometría para la animación
-            for patch, x_orig, y_orig, z in self.profile_patches:
-                line, = ax.plot(x_orig, y_orig, z, 'b-', linewidth=2)
-                patches.append(line)
-                x_orig_list.append(x_orig)
-                y_orig_list.append(y_orig)
-                z_list.append(z)
+            import matplotlib.animation as animation
+            from matplotlib import cm
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+        except ImportError:
+            raise RuntimeError(
+                "No se han podido importar las bibliotecas necesarias para exportar la simulación.\n"
+                "Asegúrese de tener instalado FFmpeg y matplotlib."
+            )
+        
+        # Crear nueva figura para la exportación
+        fig = Figure(figsize=(10, 8), dpi=100)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111, projection='3d')
+        
+        # Configurar vista según selección
+        elev, azim = ajustes['vista']
+        ax.view_init(elev=elev, azim=azim)
+        
+        # Configurar ejes
+        longitud_mm = ajustes['longitud_mm']
+        max_dim = max(longitud_mm, 500)
+        
+        ax.set_xlim(-max_dim/4, max_dim/4)
+        ax.set_ylim(-max_dim/4, max_dim/4)
+        ax.set_zlim(0, longitud_mm)
+        
+        ax.set_xlabel('X (mm)')
+        ax.set_ylabel('Y (mm)')
+        ax.set_zlabel('Z (mm)')
+        
+        # Recrear geometría para la animación
+        patches = []
+        for x_orig, y_orig, z in ajustes['secciones']:
+            line, = ax.plot(x_orig, y_orig, np.full_like(x_orig, z, dtype=float), 'b-', linewidth=2)
+            patches.append(line)
+        
+        max_displacement = ajustes['desplazamiento_lateral_mm']
+        scale_factor = ajustes['factor_escala']
+        show_deformed = ajustes['mostrar_deformada']
+        show_stress = ajustes['mostrar_tensiones']
+        total_steps = ajustes['pasos']
+        
+        # Función de actualización para la animación
+        def update_frame(frame):
+            # Calcular factor de carga para este paso
+            load_factor = frame / total_steps
             
-            # Función de actualización para la animación
-            def update_frame(frame):
-                # Calcular factor de carga para este paso
-                load_factor = frame / self.total_steps
-                
-                # Obtener el desplazamiento lateral máximo
-                max_displacement = self.current_results['desplazamiento_lateral_mm']
-                
-                # Obtener factor de escala
-                scale_factor = self.scale_factor_slider.value() / 50.0
-                
-                # Opciones de visualización
-                show_deformed = self.show_deformed_check.isChecked()
-                show_stress = self.show_stress_check.isChecked()
-                
-                # Actualizar cada parche
-                for i, (patch, x_orig, y_orig, z) in enumerate(zip(patches, x_orig_list, y_orig_list, z_list)):
-                    if show_deformed:
-                        # Aplicar deformación según la carga
-                        normalized_z = z / longitud_mm
-                        deformation_factor = np.sin(np.pi * normalized_z)
-                        displacement_x = max_displacement * deformation_factor * scale_factor * load_factor
-                        
-                        # Aplicar desplazamiento
-                        x_deformed = x_orig + displacement_x
-                        
-                        # Actualizar coordenadas
-                        patch.set_data_3d(x_deformed, y_orig, z)
-                        
-                        if show_stress:
-                            # Calcular tensión aproximada (normalizada de 0 a 1)
-                            stress_level = load_factor * deformation_factor
-                            
-                            # Colores desde azul (0) hasta rojo (1)
-                            color = plt.cm.jet(stress_level)
-                            patch.set_color(color)
-                        else:
-                            # Color azul si no se muestran tensiones
-                            patch.set_color('blue')
+            # Actualizar cada parche
+            for patch, (x_orig, y_orig, z) in zip(patches, ajustes['secciones']):
+                z_values = np.full_like(x_orig, z, dtype=float)
+                if show_deformed:
+                    # Aplicar deformación según la carga
+                    normalized_z = z / longitud_mm
+                    deformation_factor = np.sin(np.pi * normalized_z)
+                    displacement_x = max_displacement * deformation_factor * scale_factor * load_factor
+                    
+                    # Actualizar coordenadas
+                    patch.set_data_3d(x_orig + displacement_x, y_orig, z_values)
+                    
+                    if show_stress:
+                        # Colores desde azul (0) hasta rojo (1) según la tensión aproximada
+                        patch.set_color(cm.jet(load_factor * deformation_factor))
                     else:
-                        # Mostrar geometría sin deformar
-                        patch.set_data_3d(x_orig, y_orig, z)
                         patch.set_color('blue')
-                
-                # Actualizar título con información de carga
-                carga_actual = self.current_results['carga_maxima_kN'] * load_factor
-                ax.set_title(f'Simulación de Pandeo - Carga: {carga_actual:.2f} kN')
-                
-                return patches
-            
-            # Crear animación
-            frames = self.total_steps
-            interval = self.speed_spin.value()
-            anim = FuncAnimation(fig, update_frame, frames=frames, interval=interval, blit=False)
-            
-            # Mostrar mensaje de progreso
-            progress_msg = QMessageBox()
-            progress_msg.setWindowTitle("Exportando Simulación")
-            progress_msg.setText("Exportando simulación. Este proceso puede tardar varios minutos.\n"
-                                "Por favor, espere...")
-            progress_msg.setStandardButtons(QMessageBox.NoButton)
-            progress_msg.show()
-            
-            # Exportar animación
-            if file_path.endswith('.mp4'):
-                Writer = animation.writers['ffmpeg']
-                writer = Writer(fps=1000/interval, metadata=dict(artist='PANDEO ML'), bitrate=1800)
-                anim.save(file_path, writer=writer)
-            elif file_path.endswith('.gif'):
-                anim.save(file_path, writer='pillow', fps=1000/interval)
+                else:
+                    # Mostrar geometría sin deformar
+                    patch.set_data_3d(x_orig, y_orig, z_values)
+                    patch.set_color('blue')
             
-            # Cerrar mensaje de progreso
-            progress_msg.close()
+            # Actualizar título con información de carga
+            carga_actual = ajustes['carga_maxima_kN'] * load_factor
+            ax.set_title(f'Simulación de Pandeo - Carga: {carga_actual:.2f} kN')
             
-            # Mostrar mensaje de éxito
+            return patches
+        
+        # Crear animación
+        interval = ajustes['intervalo_ms']
+        anim = animation.FuncAnimation(fig, update_frame, frames=total_steps, interval=interval, blit=False)
+        
+        # El progreso se informa en cada fotograma; si se cancela, la
+        # excepción interrumpe el guardado y se borra el archivo incompleto
+        def frame_saved(actual, total):
+            progress(actual + 1, total, f"fotograma {actual + 1} de {total}")
+        
+        progress(0, total_steps, "preparando")
+        if file_path.endswith('.mp4'):
+            Writer = animation.writers['ffmpeg']
+            writer = Writer(fps=1000/interval, metadata=dict(artist='PANDEO ML'), bitrate=1800)
+            anim.save(file_path, writer=writer, progress_callback=frame_saved)
+        elif file_path.endswith('.gif'):
+            anim.save(file_path, writer='pillow', fps=1000/interval, progress_callback=frame_saved)
+        else:
+            raise ValueError("Formato no soportado: use un archivo .mp4 o .gif")
+        
+        return file_path, None
+    
+    def _handle_export_finished(self, resultado):
+        """Informar de una exportación terminada (hilo de la interfaz)."""
+        file_path, aviso = resultado
+        if aviso is None:
             QMessageBox.information(
                 self, 
                 "Exportación Completada", 
-                f"Simulación exportada correctamente a {file_path}"
+                f"Los resultados han sido exportados correctamente a:\n{file_path}"
             )
-            
-            # Cerrar figura de matplotlib
-            plt.close(fig)
-            
-        except Exception as e:
-            QMessageBox.critical(
+        else:
+            QMessageBox.information(
                 self, 
-                "Error en la Exportación", 
-                f"Se ha producido un error al exportar la simulación:\n{str(e)}"
+                "Exportación Simplificada Completada", 
+                f"Se ha producido un error al exportar a Excel:\n{aviso}\n\n"
+                f"Se ha exportado una versión simplificada de los resultados a:\n{file_path}\n\n"
+                f"Esta versión no incluye gráficos para evitar errores."
             )
     
+    def _handle_export_failed(self, destino, mensaje, traza):
+        """Informar del error de una exportación (hilo de la interfaz)."""
+        print(traza)
+        QMessageBox.critical(
+            self, 
+            "Error en la Exportación", 
+            f"Se ha producido un error al exportar {destino}:\n{mensaje}"
+        )
+    
+    def _handle_export_cancelled(self, file_path):
+        """Borrar el archivo incompleto de una exportación cancelada."""
+        if os.path.exists(file_path):
+            try:
+                os.remove(file_path)
+            except OSError as e:
+                print(f"No se ha podido borrar el archivo incompleto {file_path}: {str(e)}")
+    
     def change_view(self):
         """Cambiar la vista según la selección."""
+        if self.figure is None:
+            return
+        
         view_type = self.view_type_combo.currentText()
         
         if view_type == "Frontal":
@@ -955,7 +1017,7 @@ class SimulationPanel(QWidget):
         self.canvas.draw()
     
     def export_to_excel(self):
-        """Exportar resultados a un archivo Excel."""
+        """Exportar resultados a un archivo Excel (en segundo plano)."""
         if not isinstance(self.current_results, dict):
             QMessageBox.warning(
                 self, 
@@ -978,88 +1040,80 @@ class SimulationPanel(QWidget):
         if not file_path.endswith('.xlsx'):
             file_path += '.xlsx'
         
+        # Copia de los resultados: el exportador los modifica y la interfaz
+        # puede recibir otros mientras se exporta
+        results = dict(self.current_results)
+        
+        # Crear un diccionario con los datos de entrada
+        input_data = {
+            'tipo_perfil': results.get('tipo_perfil', ''),
+            'tipo_acero': results.get('tipo_acero', ''),
+            'longitud_mm': results.get('longitud_mm', 0),
+            'condicion_apoyo': results.get('condicion_apoyo', ''),
+            'altura_perfil_mm': results.get('altura_perfil_mm', 0),
+            'ancho_alas_mm': results.get('ancho_alas_mm', 0),
+            'espesor_alma_mm': results.get('espesor_alma_mm', 0),
+            'espesor_alas_mm': results.get('espesor_alas_mm', 0),
+            'dimension_exterior_mm': results.get('dimension_exterior_mm', 0),
+            'espesor_mm': results.get('espesor_mm', 0)
+        }
+        
+        job = Job("Exportando a Excel", self._run_excel_export, file_path, results, input_data)
+        job.signals.finished.connect(self._handle_export_finished)
+        job.signals.failed.connect(partial(self._handle_export_failed, "a Excel"))
+        job.signals.cancelled.connect(partial(self._handle_export_cancelled, file_path))
+        self.job_manager.start(job)
+    
+    def _run_excel_export(self, file_path, results, input_data, token, progress):
+        """
+        Generar el archivo Excel (hilo de trabajo).
+        
+        Si la exportación completa falla, se intenta una versión simplificada
+        sin gráficos.
+        
+        Args:
+            file_path (str): Archivo Excel de destino.
+            results (dict): Copia de los resultados de la predicción.
+            input_data (dict): Datos de entrada.
+            token (CancellationToken): Token de cancelación.
+            progress (ProgressReporter): Función de progreso.
+        
+        Returns:
+            tuple: Ruta del archivo y error de la exportación completa (None si no lo hubo).
+        """
+        from app.utils.result_exporter import ResultExporter
+        
         try:
-            # Mostrar mensaje de espera
-            wait_msg = QMessageBox()
-            wait_msg.setWindowTitle("Exportando a Excel")
-            wait_msg.setText("Generando archivo Excel con los resultados.\nEsto puede tardar unos segundos...")
-            wait_msg.setStandardButtons(QMessageBox.NoButton)
-            wait_msg.show()
-            
-            # Procesar eventos para mostrar el diálogo
-            QApplication.processEvents()
-            
-            # Crear objeto exportador
-            exporter = ResultExporter()
-            
-            # Crear un diccionario con los datos de entrada
-            input_data = {
-                'tipo_perfil': self.current_results.get('tipo_perfil', ''),
-                'tipo_acero': self.current_results.get('tipo_acero', ''),
-                'longitud_mm': self.current_results.get('longitud_mm', 0),
-                'condicion_apoyo': self.current_results.get('condicion_apoyo', ''),
-                'altura_perfil_mm': self.current_results.get('altura_perfil_mm', 0),
-                'ancho_alas_mm': self.current_results.get('ancho_alas_mm', 0),
-                'espesor_alma_mm': self.current_results.get('espesor_alma_mm', 0),
-                'espesor_alas_mm': self.current_results.get('espesor_alas_mm', 0),
-                'dimension_exterior_mm': self.current_results.get('dimension_exterior_mm', 0),
-                'espesor_mm': self.current_results.get('espesor_mm', 0)
-            }
-            
-            # Exportar a Excel
-            exporter.export_to_excel(file_path, self.current_results, input_data)
-            
-            # Cerrar mensaje de espera
-            wait_msg.close()
-            
-            # Mostrar mensaje de éxito
-            QMessageBox.information(
-                self, 
-                "Exportación Completada", 
-                f"Los resultados han sido exportados correctamente a:\n{file_path}"
-            )
-            
+            ResultExporter().export_to_excel(file_path, results, input_data, progress=progress)
+            return file_path, None
+        except TaskCancelled:
+            raise
         except Exception as e:
-            # Mostrar mensaje de error
-            QMessageBox.critical(
-                self, 
-                "Error en la Exportación", 
-                f"Se ha producido un error al exportar a Excel:\n{str(e)}\n\nIntentando exportar en formato simplificado..."
-            )
-            
-            try:
-                # Intentar exportar en formato simplificado sin gráficos
-                import pandas as pd
-                
-                # Crear DataFrames básicos
-                input_df = pd.DataFrame([
-                    {"Parámetro": "Tipo de Perfil", "Valor": input_data.get("tipo_perfil", "")},
-                    {"Parámetro": "Tipo de Acero", "Valor": input_data.get("tipo_acero", "")},
-                    {"Parámetro": "Longitud", "Valor": f"{input_data.get('longitud_mm', 0):.2f} mm"},
-                    {"Parámetro": "Condición de Apoyo", "Valor": input_data.get("condicion_apoyo", "")}
-                ])
-                
-                results_df = pd.DataFrame([
-                    {"Parámetro": "Carga Máxima (kN)", "Valor": f"{self.current_results.get('carga_maxima_kN', 0):.2f}"},
-                    {"Parámetro": "Carga Máxima (kg)", "Valor": f"{self.current_results.get('carga_maxima_kg', 0):.2f}"},
-                    {"Parámetro": "Desplazamiento Lateral (mm)", "Valor": f"{self.current_results.get('desplazamiento_lateral_mm', 0):.2f}"}
-                ])
-                
-                # Guardar en Excel simplificado
-                with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
-                    input_df.to_excel(writer, sheet_name='Datos de Entrada', index=False)
-                    results_df.to_excel(writer, sheet_name='Resultados', index=False)
-                
-                QMessageBox.information(
-                    self, 
-                    "Exportación Simplificada Completada", 
-                    f"Se ha exportado una versión simplificada de los resultados a:\n{file_path}\n\n"
-                    f"Esta versión no incluye gráficos para evitar errores."
-                )
-                
-            except Exception as e2:
-                QMessageBox.critical(
-                    self, 
-                    "Error en la Exportación", 
-                    f"No se ha podido exportar los resultados en ningún formato:\n{str(e2)}"
-                ) 
\ No newline at end of file
+            error = str(e)
+        
+        # Intentar exportar en formato simplificado sin gráficos
+        import pandas as pd
+        
+        progress(0, 1, "formato simplificado")
+        
+        # Crear DataFrames básicos
+        input_df = pd.DataFrame([
+            {"Parámetro": "Tipo de Perfil", "Valor": input_data.get("tipo_perfil", "")},
+            {"Parámetro": "Tipo de Acero", "Valor": input_data.get("tipo_acero", "")},
+            {"Parámetro": "Longitud", "Valor": f"{input_data.get('longitud_mm', 0):.2f} mm"},
+            {"Parámetro": "Condición de Apoyo", "Valor": input_data.get("condicion_apoyo", "")}
+        ])
+        
+        results_df = pd.DataFrame([
+            {"Parámetro": "Carga Máxima (kN)", "Valor": f"{results.get('carga_maxima_kN', 0):.2f}"},
+            {"Parámetro": "Carga Máxima (kg)", "Valor": f"{results.get('carga_maxima_kg', 0):.2f}"},
+            {"Parámetro": "Desplazamiento Lateral (mm)", "Valor": f"{results.get('desplazamiento_lateral_mm', 0):.2f}"}
+        ])
+        
+        # Guardar en Excel simplificado
+        with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
+            input_df.to_excel(writer, sheet_name='Datos de Entrada', index=False)
+            results_df.to_excel(writer, sheet_name='Resultados', index=False)
+        
+        progress(1, 1, "formato simplificado")
+        return file_path, error
@@ -3,16 +3,31 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
                             QSplitter, QFormLayout, QMessageBox)
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
+import importlib.util
+from collections import OrderedDict
+from functools import partial
 import numpy as np
 import sys
 
-# Importar pyvista para visualización 3D
-try:
-    import pyvista as pv
+# PyVista (y VTK, que carga consigo) tarda en importarse y reserva memoria
+# considerable: solo se comprueba si está instalado y se importa al mostrar
+# la pestaña por primera vez
+PYVISTA_AVAILABLE = (importlib.util.find_spec("pyvista") is not None
+                     and importlib.util.find_spec("pyvistaqt") is not None)
+pv = None
+
+# Mallas memorizadas (sin deformar y deformadas) de los últimos perfiles
+# mostrados: al volver a un diseño anterior no se reconstruye su geometría
+MESH_CACHE_SIZE = 16
+
+
+def _import_pyvista():
+    """Importar pyvista y devolver la clase QtInteractor."""
+    global pv
+    import pyvista
     from pyvistaqt import QtInteractor
-    PYVISTA_AVAILABLE = True
-except ImportError:
-    PYVISTA_AVAILABLE = False
+    pv = pyvista
+    return QtInteractor
 
 class VisualizationPanel(QWidget):
     """Panel para visualización 3D del perfil y el fenómeno de pandeo."""
@@ -24,6 +39,13 @@ class VisualizationPanel(QWidget):
         self.current_results = None
         self.visualization_active = False
         
+        # El visualizador 3D se crea al mostrar la pestaña por primera vez
+        self.plotter = None
+        self._plotter_scheduled = False
+        
+        # Mallas memorizadas: clave -> malla (orden LRU)
+        self._mesh_cache = OrderedDict()
+        
         # Inicializar UI
         self.setup_ui()
     
@@ -169,14 +191,13 @@ class VisualizationPanel(QWidget):
         right_layout = QVBoxLayout(right_panel)
         right_layout.setContentsMargins(0, 0, 0, 0)
         
-        # Crear widget de PyVista
-        self.plotter = QtInteractor(right_panel)
-        right_layout.addWidget(self.plotter)
+        self.right_layout = right_layout
         
-        # Configurar visualizador
-        self.plotter.set_background("white")
-        self.plotter.add_axes()
-        self.plotter.show_grid()
+        # Marcador de posición hasta que se cree el visualizador de PyVista
+        self.plotter_placeholder = QLabel("Inicializando visualización 3D...")
+        self.plotter_placeholder.setAlignment(Qt.AlignCenter)
+        self.plotter_placeholder.setVisible(False)
+        right_layout.addWidget(self.plotter_placeholder)
         
         # Agregar paneles al splitter
         splitter.addWidget(left_panel)
@@ -188,10 +209,57 @@ class VisualizationPanel(QWidget):
         # Conectar señales
         self.connect_signals()
         
-        # Ocultar inicialmente el plotter
+        self.setLayout(main_layout)
+    
+    def showEvent(self, event):
+        """Crear el visualizador 3D la primera vez que se muestra la pestaña."""
+        super().showEvent(event)
+        if PYVISTA_AVAILABLE and self.plotter is None:
+            self.schedule_plotter_creation()
+    
+    def schedule_plotter_creation(self):
+        """
+        Programar la creación del visualizador para la siguiente vuelta del
+        bucle de eventos, de modo que la pestaña se pinte antes con el
+        marcador de posición.
+        """
+        if self._plotter_scheduled:
+            return
+        self._plotter_scheduled = True
+        if self.current_results is not None:
+            self.empty_label.setVisible(False)
+            self.plotter_placeholder.setVisible(True)
+        QTimer.singleShot(0, self.create_plotter)
+    
+    def create_plotter(self):
+        """Importar PyVista y crear el visualizador 3D (contexto OpenGL)."""
+        if self.plotter is not None:
+            return
+        try:
+            QtInteractor = _import_pyvista()
+            self.plotter = QtInteractor(self.right_layout.parentWidget())
+        except Exception as e:
+            import traceback
+            print(f"Error al inicializar la visualización 3D: {str(e)}")
+            print(traceback.format_exc())
+            self.plotter_placeholder.setText(f"No se ha podido inicializar la visualización 3D: {str(e)}")
+            self.plotter_placeholder.setVisible(True)
+            return
+        
+        self.right_layout.addWidget(self.plotter)
+        self.plotter_placeholder.setVisible(False)
+        
+        # Configurar visualizador
+        self.plotter.set_background("white")
+        self.plotter.add_axes()
+        self.plotter.show_grid()
+        
+        # Ocultar el plotter hasta que haya resultados
         self.plotter.setVisible(False)
         
-        self.setLayout(main_layout)
+        # Dibujar los resultados recibidos mientras no existía el visualizador
+        if self.current_results is not None:
+            self.update_visualization()
     
     def connect_signals(self):
         """Conectar señales y slots."""
@@ -215,6 +283,12 @@ class VisualizationPanel(QWidget):
         if self.current_results is None or not isinstance(self.current_results, dict):
             return
         
+        # Sin visualizador todavía: se dibujará al crearlo
+        if self.plotter is None:
+            if self.isVisible():
+                self.schedule_plotter_creation()
+            return
+        
         # Ocultar mensaje inicial y mostrar plotter
         self.empty_label.setVisible(False)
         self.plotter.setVisible(True)
@@ -232,8 +306,11 @@ class VisualizationPanel(QWidget):
         if tipo_perfil is None or longitud_mm is None:
             return
         
-        # Crear geometría del perfil
-        profile_mesh = self.create_profile_mesh(self.current_results)
+        # Crear geometría del perfil (o reutilizar la de un cálculo anterior)
+        clave_perfil = self.profile_key(self.current_results)
+        profile_mesh = self.cached_mesh(
+            ("perfil",) + clave_perfil, partial(self.create_profile_mesh, self.current_results)
+        )
         
         # Aplicar deformación si está seleccionado
         if viz_mode == "Deformación" or viz_mode == "Tensiones":
@@ -241,7 +318,10 @@ class VisualizationPanel(QWidget):
             desplazamiento_lateral_mm = self.current_results.get('desplazamiento_lateral_mm', 0) * 5
             
             # Aplicar deformación al perfil
-            profile_mesh = self.apply_deformation(profile_mesh, longitud_mm, desplazamiento_lateral_mm, scale_factor)
+            profile_mesh = self.cached_mesh(
+                ("deformada", desplazamiento_lateral_mm, scale_factor) + clave_perfil,
+                partial(self.apply_deformation, profile_mesh, longitud_mm, desplazamiento_lateral_mm, scale_factor)
+            )
             
             # Añadir representación del efecto de esbeltez
             excentricidad_inicial = desplazamiento_lateral_mm * 0.2
@@ -331,6 +411,39 @@ class VisualizationPanel(QWidget):
         # Marcar visualización como activa
         self.visualization_active = True
     
+    def profile_key(self, results):
+        """Clave de la geometría del perfil: tipo, longitud y dimensiones."""
+        return (results.get('tipo_perfil'), results.get('longitud_mm')) + tuple(
+            results.get(nombre) for nombre in (
+                'altura_perfil_mm', 'ancho_alas_mm', 'espesor_alma_mm', 'espesor_alas_mm',
+                'dimension_exterior_mm', 'espesor_mm'
+            )
+        )
+    
+    def cached_mesh(self, clave, crear):
+        """
+        Obtener una copia de una malla memorizada, creándola si no está.
+        
+        Se devuelve una copia porque al dibujarla se le añaden datos (por
+        ejemplo, las tensiones).
+        
+        Args:
+            clave (tuple): Clave de la malla.
+            crear (callable): Función sin argumentos que crea la malla.
+        
+        Returns:
+            Malla de PyVista.
+        """
+        malla = self._mesh_cache.get(clave)
+        if malla is None:
+            malla = crear()
+            self._mesh_cache[clave] = malla
+            while len(self._mesh_cache) > MESH_CACHE_SIZE:
+                self._mesh_cache.popitem(last=False)
+        else:
+            self._mesh_cache.move_to_end(clave)
+        return malla.copy()
+    
     def create_profile_mesh(self, results):
         """Crear malla 3D para el perfil según los resultados."""
         tipo_perfil = results['tipo_perfil']
@@ -619,30 +732,22 @@ class VisualizationPanel(QWidget):
         # Excentricidad inicial en la parte superior
         excentricidad_inicial = max_displacement * 0.2
         
-        # Aplicar deformación a cada punto
-        for i in range(len(points)):
-            # Coordenadas
-            z = points[i, 2]
-            x_orig = points[i, 0]
-            
-            # Calcular excentricidad inicial
-            excentricidad = (z / length) * excentricidad_inicial
-            
-            # Forma sinusoidal de la deformación
-            normalized_z = z / length
-            deformation_factor = np.sin(np.pi * normalized_z)
-            
-            # Calcular desplazamiento total
-            displacement_x = excentricidad + (max_displacement * deformation_factor * scale_factor)
-            points[i, 0] = x_orig + displacement_x
-            
-            # Aplicar rotación
-            rotation_factor = np.cos(np.pi * normalized_z)
-            rotation_angle = np.radians(15) * rotation_factor * scale_factor
-            
-            y_orig = points[i, 1]
-            points[i, 1] = y_orig * np.cos(rotation_angle)
-            points[i, 2] = z + y_orig * np.sin(rotation_angle)
+        # Aplicar deformación a todos los puntos a la vez
+        z = points[:, 2].copy()
+        y_orig = points[:, 1].copy()
+        
+        # Excentricidad inicial y forma sinusoidal de la deformación
+        normalized_z = z / length
+        excentricidad = normalized_z * excentricidad_inicial
+        deformation_factor = np.sin(np.pi * normalized_z)
+        
+        # Calcular desplazamiento total
+        points[:, 0] += excentricidad + (max_displacement * deformation_factor * scale_factor)
+        
+        # Aplicar rotación
+        rotation_angle = np.radians(15) * np.cos(np.pi * normalized_z) * scale_factor
+        points[:, 1] = y_orig * np.cos(rotation_angle)
+        points[:, 2] = z + y_orig * np.sin(rotation_angle)
         
         # Actualizar puntos de la malla
         deformed_mesh.points = points
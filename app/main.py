@@ -1,7 +1,7 @@
 import sys
 import os
-from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QMessageBox, QFileDialog
-from PyQt5.QtCore import Qt, QTranslator, QLocale
+from PyQt5.QtWidgets import QApplication, QMainWindow, QTabWidget, QMessageBox, QFileDialog, QDockWidget
+from PyQt5.QtCore import Qt, QTranslator, QLocale, QTimer
 from PyQt5.QtGui import QIcon, QFont, QFontDatabase
 
 # Importar componentes
@@ -9,6 +9,10 @@ from app.components.input_panel import InputPanel
 from app.components.results_panel import ResultsPanel
 from app.components.visualization_panel import VisualizationPanel
 from app.components.simulation_panel import SimulationPanel
+from app.components.job_progress_widget import JobProgressWidget
+from app.components.history_panel import HistoryPanel
+from app.utils.calculation_history import CalculationHistory
+from app.utils.background_tasks import Job, JobManager
 from app.utils.config_manager import ConfigManager
 from app.utils.unit_converter import UnitConverter
 from app.utils.result_exporter import ResultExporter
@@ -28,11 +32,25 @@ class MainWindow(QMainWindow):
         # Cargar modelo de predicción
         self.prediction_model = PredictionModel()
         
+        # Actualizaciones pendientes de los paneles que no están a la vista:
+        # panel -> {método: datos}. Solo se conserva la
+        # última actualización de cada tipo
+        self._pending_updates = {}
+        
+        # Trabajos largos (exportaciones) fuera del hilo de la interfaz,
+        # con un indicador de progreso común en la barra de estado
+        self.job_manager = JobManager()
+        
         # Configurar utilidades
         self.config_manager = ConfigManager()
         self.unit_converter = UnitConverter()
         self.result_exporter = ResultExporter()
         
+        # Historial de cálculos. Si existe el archivo del historial (la opción
+        # de guardarlo está activada), se carga y se sigue guardando en él
+        self.history_path = os.path.join(self.config_manager.config_dir, "historial.json")
+        self.history = CalculationHistory(path=self.history_path if os.path.exists(self.history_path) else None)
+        
         # Configurar UI
         self.setup_ui()
         
@@ -42,6 +60,10 @@ class MainWindow(QMainWindow):
         # Cargar configuración guardada (si existe)
         self.load_saved_config()
         
+        # Cargar el modelo en segundo plano cuando arranque el bucle de eventos,
+        # para no retrasar la aparición de la ventana
+        QTimer.singleShot(0, self.prediction_model.load_model_async)
+        
     def setup_ui(self):
         """Configurar la interfaz de usuario principal."""
         # Crear widget central con pestañas
@@ -52,7 +74,7 @@ class MainWindow(QMainWindow):
         self.input_panel = InputPanel(self.prediction_model)
         self.results_panel = ResultsPanel(self.unit_converter)
         self.visualization_panel = VisualizationPanel()
-        self.simulation_panel = SimulationPanel()
+        self.simulation_panel = SimulationPanel(self.job_manager)
         
         # Añadir pestañas
         self.main_tabs.addTab(self.input_panel, "Entrada de Datos")
@@ -62,6 +84,15 @@ class MainWindow(QMainWindow):
         
         # Configurar barra de estado
         self.statusBar().showMessage("Listo para predicciones de pandeo")
+        self.job_progress = JobProgressWidget(self.job_manager)
+        self.statusBar().addPermanentWidget(self.job_progress)
+        
+        # Historial de cálculos en una barra lateral
+        self.history_panel = HistoryPanel(self.history)
+        self.history_dock = QDockWidget("Historial", self)
+        self.history_dock.setObjectName("history_dock")
+        self.history_dock.setWidget(self.history_panel)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.history_dock)
         
         # Crear menús
         self.create_menus()
@@ -93,6 +124,24 @@ class MainWindow(QMainWindow):
         exit_action = file_menu.addAction("Salir")
         exit_action.triggered.connect(self.close)
         
+        # Menú Opciones
+        options_menu = self.menuBar().addMenu("Opciones")
+        
+        # Predicción en un proceso aparte: la interfaz no compite con el modelo
+        # y un fallo en código nativo no cierra la ventana
+        self.out_of_process_action = options_menu.addAction("Predicción en proceso separado")
+        self.out_of_process_action.setCheckable(True)
+        self.out_of_process_action.toggled.connect(self.handle_out_of_process_toggled)
+        
+        options_menu.addSeparator()
+        
+        # Mostrar u ocultar el historial y conservarlo entre sesiones
+        options_menu.addAction(self.history_dock.toggleViewAction())
+        self.save_history_action = options_menu.addAction("Guardar historial entre sesiones")
+        self.save_history_action.setCheckable(True)
+        self.save_history_action.setChecked(self.history.path is not None)
+        self.save_history_action.toggled.connect(self.handle_history_persistence_toggled)
+        
         # Menú Ayuda
         help_menu = self.menuBar().addMenu("Ayuda")
         
@@ -109,33 +158,43 @@ class MainWindow(QMainWindow):
         # Conectar señal de predicción realizada
         self.input_panel.prediction_ready.connect(self.handle_prediction_results)
         
+        # El análisis de sensibilidad se calcula junto con la predicción en segundo plano
+        self.input_panel.sensitivity_ready.connect(self.handle_sensitivity_results)
+        
+        # Los paneles ocultos se actualizan al mostrarse
+        self.main_tabs.currentChanged.connect(self.handle_tab_changed)
+        
+        # Cálculo en vivo: solo se informa en la barra de estado, sin reconstruir los paneles
+        self.input_panel.live_prediction_ready.connect(self.handle_live_prediction)
+        
+        # Historial: cada cálculo se guarda y puede recuperarse sin llamar al modelo
+        self.input_panel.calculation_completed.connect(self.handle_calculation_completed)
+        self.history_panel.entry_selected.connect(self.restore_calculation)
+        self.history_panel.clear_requested.connect(self.clear_history)
+        
     def handle_prediction_results(self, results):
-        """Manejar los resultados de la predicción."""
+        """
+        Manejar los resultados de la predicción.
+        
+        Solo se actualiza al momento el panel visible; el resto queda marcado
+        como pendiente y se actualiza al activar su pestaña, de modo que las
+        escenas 3D no se reconstruyen mientras no se ven.
+        """
         try:
             if results is None:
                 return
-                
-            # Actualizar paneles con los resultados
-            self.results_panel.update_results(results)
-            
-            try:
-                self.visualization_panel.update_visualization(results)
-            except Exception as e:
-                import traceback
-                print(f"Error en la visualización: {str(e)}")
-                print(traceback.format_exc())
-                # No propagamos la excepción para que la aplicación siga funcionando
             
-            try:
-                self.simulation_panel.update_simulation(results)
-            except Exception as e:
-                import traceback
-                print(f"Error en la simulación: {str(e)}")
-                print(traceback.format_exc())
-                # No propagamos la excepción para que la aplicación siga funcionando
+            # Marcar los paneles con los nuevos resultados
+            self.schedule_panel_update(self.results_panel, self.results_panel.update_results, results)
+            self.schedule_panel_update(
+                self.visualization_panel, self.visualization_panel.update_visualization, results
+            )
+            self.schedule_panel_update(self.simulation_panel, self.simulation_panel.update_simulation, results)
             
-            # Mostrar pestaña de resultados
+            # Mostrar pestaña de resultados (si ya estaba activa no se emite
+            # currentChanged, por eso se actualiza explícitamente)
             self.main_tabs.setCurrentIndex(1)
+            self.render_pending_updates(self.main_tabs.currentWidget())
         except Exception as e:
             import traceback
             print(f"Error al procesar resultados: {str(e)}")
@@ -144,6 +203,115 @@ class MainWindow(QMainWindow):
             from PyQt5.QtWidgets import QMessageBox
             QMessageBox.critical(self, "Error", f"Error al procesar los resultados: {str(e)}")
     
+    def handle_sensitivity_results(self, sensitivity):
+        """Manejar el análisis de sensibilidad de la última predicción."""
+        self.schedule_panel_update(self.results_panel, self.results_panel.update_sensitivity, sensitivity)
+    
+    def schedule_panel_update(self, panel, method, data):
+        """
+        Registrar una actualización de un panel y aplicarla si el panel está visible.
+        
+        Args:
+            panel (QWidget): Panel a actualizar.
+            method (callable): Método del panel que aplica los datos.
+            data: Datos para el método.
+        """
+        self._pending_updates.setdefault(panel, {})[method] = data
+        if self.main_tabs.currentWidget() is panel:
+            self.render_pending_updates(panel)
+    
+    def render_pending_updates(self, panel):
+        """Aplicar las actualizaciones pendientes de un panel."""
+        for method, data in self._pending_updates.pop(panel, {}).items():
+            try:
+                method(data)
+            except Exception as e:
+                import traceback
+                print(f"Error al actualizar {panel.__class__.__name__}: {str(e)}")
+                print(traceback.format_exc())
+                # No propagamos la excepción para que la aplicación siga funcionando
+    
+    def handle_tab_changed(self, index):
+        """Actualizar el panel que se acaba de mostrar si tiene cambios pendientes."""
+        self.render_pending_updates(self.main_tabs.widget(index))
+    
+    def handle_calculation_completed(self, params, results, sensitivity):
+        """Añadir un cálculo terminado al historial."""
+        clave = self.history.add(params, results, sensitivity)
+        self.history_panel.refresh(clave)
+    
+    def restore_calculation(self, clave):
+        """
+        Recuperar un cálculo del historial.
+        
+        Los paneles se actualizan con los resultados guardados, sin llamar al
+        modelo; como en un cálculo nuevo, solo se redibuja al momento el panel
+        visible.
+        
+        Args:
+            clave (str): Clave de la entrada del historial.
+        """
+        entrada = self.history.get(clave)
+        if entrada is None:
+            self.history_panel.refresh()
+            return
+        
+        self.input_panel.apply_config(entrada["entradas"])
+        # Los campos restaurados no deben lanzar un cálculo en vivo
+        self.input_panel.live_timer.stop()
+        
+        results = entrada["resultados"]
+        self.schedule_panel_update(self.results_panel, self.results_panel.update_results, results)
+        self.schedule_panel_update(
+            self.visualization_panel, self.visualization_panel.update_visualization, results
+        )
+        self.schedule_panel_update(self.simulation_panel, self.simulation_panel.update_simulation, results)
+        if entrada["sensibilidad"] is not None:
+            self.schedule_panel_update(
+                self.results_panel, self.results_panel.update_sensitivity, entrada["sensibilidad"]
+            )
+        
+        self.statusBar().showMessage(
+            f"Cálculo recuperado del historial: {results['carga_maxima_kN']:.2f} kN"
+        )
+    
+    def clear_history(self):
+        """Vaciar el historial de cálculos."""
+        self.history.clear()
+        self.history_panel.refresh()
+    
+    def handle_history_persistence_toggled(self, checked):
+        """Activar o desactivar el guardado del historial entre sesiones."""
+        try:
+            self.history.set_path(self.history_path if checked else None)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Error al guardar el historial: {str(e)}")
+    
+    def handle_live_prediction(self, results):
+        """Mostrar en la barra de estado la carga máxima del cálculo en vivo."""
+        self.statusBar().showMessage(
+            f"Carga máxima (en vivo): {results['carga_maxima_kN']:.2f} kN  ·  "
+            f"Factor de reducción: {results['factor_reduccion']:.3f}"
+        )
+    
+    def handle_out_of_process_toggled(self, checked):
+        """Activar o desactivar la predicción en un proceso aparte."""
+        try:
+            self.prediction_model.set_out_of_process(checked)
+            if checked:
+                self.statusBar().showMessage("Las predicciones se realizarán en un proceso separado")
+            else:
+                self.statusBar().showMessage("Las predicciones se realizarán en la propia aplicación")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error al cambiar el modo de predicción: {str(e)}")
+    
+    def closeEvent(self, event):
+        """Cancelar los trabajos en curso y detener el proceso de predicción al cerrar la ventana."""
+        self.job_manager.cancel_all()
+        self.job_manager.wait(5000)
+        self.prediction_model.shutdown()
+        super().closeEvent(event)
+    
     def save_config(self):
         """Guardar configuración actual."""
         try:
@@ -200,6 +368,9 @@ class MainWindow(QMainWindow):
     
     def export_results(self):
         """Exportar resultados actuales."""
+        # Los resultados pueden estar pendientes si la pestaña no se ha mostrado
+        self.render_pending_updates(self.results_panel)
+        
         if not hasattr(self.results_panel, "current_results") or self.results_panel.current_results is None:
             QMessageBox.warning(self, "Advertencia", "No hay resultados para exportar")
             return
@@ -214,19 +385,39 @@ class MainWindow(QMainWindow):
             )
             
             if file_path:
-                # Exportar resultados
-                results = self.results_panel.current_results
+                # Exportar resultados en segundo plano, con copias de los datos
+                results = dict(self.results_panel.current_results)
                 input_data = self.input_panel.get_current_config()
                 
-                if file_path.endswith(".pdf"):
-                    self.result_exporter.export_to_pdf(file_path, results, input_data)
-                elif file_path.endswith(".png"):
-                    self.result_exporter.export_to_image(file_path, results, input_data)
-                
-                self.statusBar().showMessage(f"Resultados exportados a {file_path}")
+                job = Job("Exportando resultados", self._run_export, file_path, results, input_data)
+                job.signals.finished.connect(self._handle_export_finished)
+                job.signals.failed.connect(self._handle_export_failed)
+                job.signals.cancelled.connect(self._handle_export_cancelled)
+                self.job_manager.start(job)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al exportar los resultados: {str(e)}")
     
+    def _run_export(self, file_path, results, input_data, token, progress):
+        """Exportar los resultados a PDF o PNG (hilo de trabajo)."""
+        if file_path.endswith(".pdf"):
+            self.result_exporter.export_to_pdf(file_path, results, input_data, progress=progress)
+        elif file_path.endswith(".png"):
+            self.result_exporter.export_to_image(file_path, results, input_data, progress=progress)
+        return file_path
+    
+    def _handle_export_finished(self, file_path):
+        """Informar de una exportación terminada."""
+        self.statusBar().showMessage(f"Resultados exportados a {file_path}")
+    
+    def _handle_export_cancelled(self):
+        """Informar de que se ha cancelado la exportación."""
+        self.statusBar().showMessage("Exportación cancelada")
+    
+    def _handle_export_failed(self, mensaje, traza):
+        """Informar del error de una exportación."""
+        print(traza)
+        QMessageBox.critical(self, "Error", f"Error al exportar los resultados: {mensaje}")
+    
     def show_about(self):
         """Mostrar información sobre la aplicación."""
         QMessageBox.about(
@@ -250,11 +441,13 @@ class MainWindow(QMainWindow):
                 <li>Seleccione el tipo de perfil y tipo de acero.</li>
                 <li>Ingrese las dimensiones geométricas del elemento.</li>
                 <li>Seleccione las condiciones de apoyo.</li>
-                <li>Haga clic en "Calcular" para obtener la predicción.</li>
+                <li>Haga clic en "Calcular" para obtener la predicción, o active "Cálculo en vivo" para ver la carga máxima mientras edita los parámetros.</li>
                 <li>Explore los resultados en las pestañas "Resultados", "Visualización" y "Simulación".</li>
             </ol>
             <p>Para guardar o cargar configuraciones, utilice el menú "Archivo".</p>
-            <p>Para exportar resultados, use la opción "Exportar Resultados" en el menú "Archivo".</p>"""
+            <p>Para exportar resultados, use la opción "Exportar Resultados" en el menú "Archivo".</p>
+            <p>Cada cálculo se añade al "Historial" de la barra lateral; al elegir una entrada se recuperan sus datos y resultados al instante, sin volver a calcular.</p>
+            <p>Con "Predicción en proceso separado" (menú "Opciones") el modelo se ejecuta fuera de la ventana, que sigue respondiendo durante los cálculos largos.</p>"""
         )
 
 def main():
@@ -269,7 +462,8 @@ def main():
     app.setFont(font)
     
     # Cargar hojas de estilo
-    with open("app/static/style.qss", "r") as f:
+    style_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "style.qss")
+    with open(style_path, "r") as f:
         app.setStyleSheet(f.read())
     
     # Crear y mostrar ventana principal
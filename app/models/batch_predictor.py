@@ -0,0 +1,541 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.utils import metrics
+
+# Factores de longitud efectiva según condiciones de apoyo
+FACTORES_K = {
+    'Empotrado-Empotrado': 0.5,
+    'Empotrado-Articulado': 0.7,
+    'Articulado-Articulado': 1.0,
+    'Empotrado-Libre': 2.0
+}
+
+# Propiedades del material según tipo de acero
+PROPIEDADES_ACERO = {
+    'S235': {'modulo_elasticidad_MPa': 210000, 'limite_elastico_MPa': 235, 'tension_rotura_MPa': 360},
+    'S275': {'modulo_elasticidad_MPa': 210000, 'limite_elastico_MPa': 275, 'tension_rotura_MPa': 430},
+    'S355': {'modulo_elasticidad_MPa': 210000, 'limite_elastico_MPa': 355, 'tension_rotura_MPa': 510}
+}
+
+# Curva de pandeo según tipo de perfil
+CURVAS_PANDEO = {
+    'IPE': 'b',
+    'HEB': 'b',
+    'HEA': 'b',
+    'HEM': 'a',
+    'Tubular cuadrado': 'a',
+    'Tubular circular': 'a',
+    'UPN': 'c',
+    'L': 'd',
+    'T': 'c'
+}
+
+# Coeficiente de imperfección según curva de pandeo
+COEF_IMPERFECCION = {
+    'a0': 0.13,
+    'a': 0.21,
+    'b': 0.34,
+    'c': 0.49,
+    'd': 0.76
+}
+
+PERFILES_IH = ['IPE', 'HEB', 'HEA', 'HEM', 'UPN']
+PERFILES_TUBULARES = ['Tubular cuadrado', 'Tubular circular']
+
+# Parámetros de entrada admitidos por el modelo
+INPUT_COLUMNS = [
+    'tipo_perfil', 'tipo_acero', 'longitud_mm', 'condicion_apoyo',
+    'altura_perfil_mm', 'ancho_alas_mm', 'espesor_alma_mm', 'espesor_alas_mm',
+    'dimension_exterior_mm', 'espesor_mm'
+]
+
+DIMENSION_COLUMNS = INPUT_COLUMNS[4:]
+
+# Parámetros que toda fila debe indicar
+REQUIRED_COLUMNS = INPUT_COLUMNS[:4]
+
+# Mensajes de las filas a las que les faltan dimensiones
+MENSAJE_DIMENSIONES_IH = ("para perfiles tipo I/H se requieren altura_perfil_mm, ancho_alas_mm, "
+                          "espesor_alma_mm y espesor_alas_mm")
+MENSAJE_DIMENSIONES_OTRO = "para perfiles no estándar se requieren todos los parámetros"
+
+# Columnas del DataFrame que recibe el modelo (mismo orden que PredictionModel.predict)
+FEATURE_COLUMNS = [
+    'tipo_perfil', 'tipo_acero', 'longitud_mm', 'condicion_apoyo',
+    'factor_longitud_efectiva', 'longitud_pandeo_mm', 'area_mm2', 'inercia_mm4',
+    'radio_giro_mm', 'esbeltez_mecanica', 'modulo_elasticidad_MPa',
+    'limite_elastico_MPa', 'tension_rotura_MPa', 'excentricidad_inicial_mm',
+    'curva_pandeo', 'coef_imperfeccion', 'esbeltez_relativa',
+    'altura_perfil_mm', 'ancho_alas_mm', 'espesor_alma_mm', 'espesor_alas_mm',
+    'dimension_exterior_mm', 'espesor_mm'
+]
+
+# Claves del diccionario de resultados (mismo orden que PredictionModel.predict)
+RESULT_COLUMNS = [
+    'tipo_perfil', 'tipo_acero', 'longitud_mm', 'condicion_apoyo',
+    'factor_longitud_efectiva', 'longitud_pandeo_mm', 'area_mm2', 'inercia_mm4',
+    'radio_giro_mm', 'esbeltez_mecanica', 'esbeltez_relativa', 'curva_pandeo',
+    'coef_imperfeccion', 'carga_maxima_kN', 'carga_maxima_kg', 'carga_maxima_ton',
+    'carga_critica_euler_kN', 'factor_reduccion', 'resistencia_plastica_kN',
+    'desplazamiento_lateral_mm'
+]
+
+
+def find_model_path():
+    """
+    Buscar el archivo del modelo entrenado.
+
+    Se busca primero en el directorio raíz del proyecto y después en la
+    carpeta de modelos, igual que PredictionModel.
+
+    Returns:
+        str: Ruta del modelo o None si no se encuentra.
+    """
+    models_dir = os.path.dirname(os.path.abspath(__file__))
+    root_dir = os.path.dirname(os.path.dirname(models_dir))
+    for directory in (root_dir, models_dir):
+        for filename in sorted(os.listdir(directory)):
+            if filename.startswith("modelo_pandeo_acero_") and filename.endswith(".joblib"):
+                return os.path.join(directory, filename)
+    return None
+
+
+def _dimension(entradas, columna):
+    """Obtener una columna de dimensiones como float, con NaN si falta o es cero."""
+    if columna not in entradas:
+        return np.full(len(entradas), np.nan)
+    valores = pd.to_numeric(entradas[columna], errors='coerce').to_numpy(dtype=float)
+    return np.where(valores == 0, np.nan, valores)
+
+
+def _missing_dimensions(entradas, tipo_perfil):
+    """
+    Detectar las filas de perfiles abiertos a las que les faltan dimensiones.
+
+    Returns:
+        tuple: Máscaras (perfiles I/H, perfiles no estándar) de filas incompletas.
+    """
+    faltan = np.zeros(len(entradas), dtype=bool)
+    for columna in ('altura_perfil_mm', 'ancho_alas_mm', 'espesor_alma_mm', 'espesor_alas_mm'):
+        faltan |= np.isnan(_dimension(entradas, columna))
+    es_ih = np.isin(tipo_perfil, PERFILES_IH)
+    es_otro = ~(es_ih | np.isin(tipo_perfil, PERFILES_TUBULARES))
+    return es_ih & faltan, es_otro & faltan
+
+
+def validate_rows(entradas):
+    """
+    Comprobar cada fila por separado, sin llamar al modelo.
+
+    Aplica las comprobaciones de build_features, pero en lugar de detenerse
+    en la primera fila no válida devuelve el error de cada una, de modo que
+    las filas válidas de un lote pueden evaluarse juntas.
+
+    Args:
+        entradas (pd.DataFrame | list): Parámetros de entrada, una fila por elemento.
+
+    Returns:
+        list: Para cada fila, None si es válida o la excepción que la invalida
+            (KeyError si falta un parámetro obligatorio, ValueError si faltan
+            dimensiones).
+    """
+    if not isinstance(entradas, pd.DataFrame):
+        entradas = pd.DataFrame(list(entradas))
+    entradas = entradas.reset_index(drop=True)
+    n = len(entradas)
+    errores = [None] * n
+
+    for columna in REQUIRED_COLUMNS:
+        faltan = entradas[columna].isna().to_numpy() if columna in entradas else np.ones(n, dtype=bool)
+        for fila in np.flatnonzero(faltan):
+            if errores[fila] is None:
+                errores[fila] = KeyError(columna)
+
+    if 'tipo_perfil' in entradas:
+        tipo_perfil = entradas['tipo_perfil'].astype(object).to_numpy()
+        sin_dimensiones_ih, sin_dimensiones_otro = _missing_dimensions(entradas, tipo_perfil)
+        for mascara, mensaje in ((sin_dimensiones_ih, MENSAJE_DIMENSIONES_IH),
+                                 (sin_dimensiones_otro, MENSAJE_DIMENSIONES_OTRO)):
+            for fila in np.flatnonzero(mascara):
+                if errores[fila] is None:
+                    errores[fila] = ValueError(mensaje[0].upper() + mensaje[1:])
+    return errores
+
+
+def build_features(entradas):
+    """
+    Construir de forma vectorizada las características que recibe el modelo.
+
+    Reproduce fila a fila el cálculo de PredictionModel.predict, pero operando
+    sobre columnas completas.
+
+    Args:
+        entradas (pd.DataFrame | list): Parámetros de entrada, una fila por
+            elemento, con las mismas claves que acepta PredictionModel.predict.
+            Si existe la columna opcional 'factor_longitud_efectiva', sus valores
+            no nulos sustituyen al factor derivado de la condición de apoyo.
+
+    Returns:
+        pd.DataFrame: Características en el orden de FEATURE_COLUMNS.
+    """
+    if not isinstance(entradas, pd.DataFrame):
+        entradas = pd.DataFrame(list(entradas))
+    entradas = entradas.reset_index(drop=True)
+    n = len(entradas)
+    if n == 0:
+        # Un DataFrame vacío creado de una lista no tiene columnas
+        return pd.DataFrame(columns=FEATURE_COLUMNS)
+
+    tipo_perfil = entradas['tipo_perfil'].astype(object).to_numpy()
+    tipo_acero = entradas['tipo_acero'].astype(object).to_numpy()
+    condicion_apoyo = entradas['condicion_apoyo'].astype(object).to_numpy()
+    longitud_mm = pd.to_numeric(entradas['longitud_mm'], errors='coerce').to_numpy(dtype=float)
+
+    # Factor de longitud efectiva y longitud de pandeo
+    factor_longitud_efectiva = pd.Series(condicion_apoyo).map(FACTORES_K).fillna(1.0).to_numpy(dtype=float)
+    if 'factor_longitud_efectiva' in entradas:
+        factor_explicito = pd.to_numeric(entradas['factor_longitud_efectiva'], errors='coerce').to_numpy(dtype=float)
+        factor_longitud_efectiva = np.where(np.isnan(factor_explicito), factor_longitud_efectiva, factor_explicito)
+    longitud_pandeo_mm = longitud_mm * factor_longitud_efectiva
+
+    # Propiedades del material (S275 por defecto)
+    acero = pd.Series(tipo_acero).where(pd.Series(tipo_acero).isin(list(PROPIEDADES_ACERO)), 'S275')
+    modulo_elasticidad_MPa = acero.map(lambda a: PROPIEDADES_ACERO[a]['modulo_elasticidad_MPa']).to_numpy(dtype=float)
+    limite_elastico_MPa = acero.map(lambda a: PROPIEDADES_ACERO[a]['limite_elastico_MPa']).to_numpy(dtype=float)
+    tension_rotura_MPa = acero.map(lambda a: PROPIEDADES_ACERO[a]['tension_rotura_MPa']).to_numpy(dtype=float)
+
+    altura = _dimension(entradas, 'altura_perfil_mm')
+    ancho = _dimension(entradas, 'ancho_alas_mm')
+    espesor_alma = _dimension(entradas, 'espesor_alma_mm')
+    espesor_alas = _dimension(entradas, 'espesor_alas_mm')
+    dimension_exterior = _dimension(entradas, 'dimension_exterior_mm')
+    espesor = _dimension(entradas, 'espesor_mm')
+
+    es_ih = np.isin(tipo_perfil, PERFILES_IH)
+    es_tubular = np.isin(tipo_perfil, PERFILES_TUBULARES)
+    es_otro = ~(es_ih | es_tubular)
+
+    # Verificar que se proporcionaron los parámetros necesarios
+    sin_dimensiones_ih, sin_dimensiones_otro = _missing_dimensions(entradas, tipo_perfil)
+    if np.any(sin_dimensiones_ih):
+        fila = int(np.flatnonzero(sin_dimensiones_ih)[0])
+        raise ValueError(f"Fila {fila}: {MENSAJE_DIMENSIONES_IH}")
+    if np.any(sin_dimensiones_otro):
+        fila = int(np.flatnonzero(sin_dimensiones_otro)[0])
+        raise ValueError(f"Fila {fila}: {MENSAJE_DIMENSIONES_OTRO}")
+
+    area_mm2 = np.empty(n)
+    inercia_mm4 = np.empty(n)
+
+    # Perfiles abiertos (I/H y no estándar)
+    abiertos = es_ih | es_otro
+    with np.errstate(invalid='ignore'):
+        area_abierto = 2 * ancho * espesor_alas + (altura - 2 * espesor_alas) * espesor_alma
+        inercia_ih = (ancho * altura**3) / 12 - ((ancho - espesor_alma) * (altura - 2 * espesor_alas)**3) / 12
+        inercia_otro = (ancho * altura**3) / 12
+    area_mm2[abiertos] = area_abierto[abiertos]
+    inercia_mm4[es_ih] = inercia_ih[es_ih]
+    inercia_mm4[es_otro] = inercia_otro[es_otro]
+
+    # Asignar valores para dimensiones tubulares para evitar valores 0
+    dimension_exterior = np.where(abiertos & np.isnan(dimension_exterior), altura * 0.8, dimension_exterior)
+    espesor = np.where(abiertos & np.isnan(espesor), espesor_alma * 1.2, espesor)
+
+    # Perfiles tubulares (valores por defecto si no se proporcionan)
+    dimension_exterior = np.where(es_tubular & np.isnan(dimension_exterior), 150.0, dimension_exterior)
+    espesor = np.where(es_tubular & np.isnan(espesor), 8.0, espesor)
+
+    es_cuadrado = tipo_perfil == 'Tubular cuadrado'
+    es_circular = tipo_perfil == 'Tubular circular'
+    interior = dimension_exterior - 2 * espesor
+    area_mm2[es_cuadrado] = (dimension_exterior**2 - interior**2)[es_cuadrado]
+    inercia_mm4[es_cuadrado] = ((dimension_exterior**4 - interior**4) / 12)[es_cuadrado]
+    radio_ext = dimension_exterior / 2
+    radio_int = radio_ext - espesor
+    area_mm2[es_circular] = (3.14159 * (radio_ext**2 - radio_int**2))[es_circular]
+    inercia_mm4[es_circular] = (3.14159 * (radio_ext**4 - radio_int**4) / 4)[es_circular]
+
+    # Asignar valores para dimensiones de perfiles I/H
+    altura = np.where(es_tubular & np.isnan(altura), dimension_exterior, altura)
+    ancho = np.where(es_tubular & np.isnan(ancho), dimension_exterior, ancho)
+    espesor_alma = np.where(es_tubular & np.isnan(espesor_alma), espesor, espesor_alma)
+    espesor_alas = np.where(es_tubular & np.isnan(espesor_alas), espesor, espesor_alas)
+
+    # Radio de giro y esbeltez mecánica
+    radio_giro_mm = (inercia_mm4 / area_mm2)**0.5
+    esbeltez_mecanica = longitud_pandeo_mm / radio_giro_mm
+
+    # Curva de pandeo y coeficiente de imperfección
+    curva_pandeo = pd.Series(tipo_perfil).map(CURVAS_PANDEO).fillna('c').to_numpy(dtype=object)
+    coef_imperfeccion = pd.Series(curva_pandeo).map(COEF_IMPERFECCION).fillna(0.34).to_numpy(dtype=float)
+
+    # Esbeltez relativa
+    esbeltez_base = 3.14159 * (modulo_elasticidad_MPa / limite_elastico_MPa)**0.5
+    esbeltez_relativa = esbeltez_mecanica / esbeltez_base
+
+    # Excentricidad inicial (valor medio entre L/1000 y L/200)
+    excentricidad_inicial_mm = longitud_mm / 500
+
+    return pd.DataFrame({
+        'tipo_perfil': tipo_perfil,
+        'tipo_acero': tipo_acero,
+        'longitud_mm': longitud_mm,
+        'condicion_apoyo': condicion_apoyo,
+        'factor_longitud_efectiva': factor_longitud_efectiva,
+        'longitud_pandeo_mm': longitud_pandeo_mm,
+        'area_mm2': area_mm2,
+        'inercia_mm4': inercia_mm4,
+        'radio_giro_mm': radio_giro_mm,
+        'esbeltez_mecanica': esbeltez_mecanica,
+        'modulo_elasticidad_MPa': modulo_elasticidad_MPa,
+        'limite_elastico_MPa': limite_elastico_MPa,
+        'tension_rotura_MPa': tension_rotura_MPa,
+        'excentricidad_inicial_mm': excentricidad_inicial_mm,
+        'curva_pandeo': curva_pandeo,
+        'coef_imperfeccion': coef_imperfeccion,
+        'esbeltez_relativa': esbeltez_relativa,
+        'altura_perfil_mm': altura,
+        'ancho_alas_mm': ancho,
+        'espesor_alma_mm': espesor_alma,
+        'espesor_alas_mm': espesor_alas,
+        'dimension_exterior_mm': dimension_exterior,
+        'espesor_mm': espesor
+    }, columns=FEATURE_COLUMNS)
+
+
+def compute_results(caracteristicas, carga_maxima_kN):
+    """
+    Calcular de forma vectorizada los resultados derivados de la predicción.
+
+    Args:
+        caracteristicas (pd.DataFrame): Salida de build_features.
+        carga_maxima_kN (np.ndarray): Carga máxima predicha por el modelo.
+
+    Returns:
+        pd.DataFrame: Resultados con las columnas de RESULT_COLUMNS.
+    """
+    carga_maxima_kN = np.asarray(carga_maxima_kN, dtype=float)
+    modulo = caracteristicas['modulo_elasticidad_MPa'].to_numpy(dtype=float)
+    inercia = caracteristicas['inercia_mm4'].to_numpy(dtype=float)
+    area = caracteristicas['area_mm2'].to_numpy(dtype=float)
+    limite_elastico = caracteristicas['limite_elastico_MPa'].to_numpy(dtype=float)
+    longitud_pandeo = caracteristicas['longitud_pandeo_mm'].to_numpy(dtype=float)
+    esbeltez_relativa = caracteristicas['esbeltez_relativa'].to_numpy(dtype=float)
+    coef_imperfeccion = caracteristicas['coef_imperfeccion'].to_numpy(dtype=float)
+    excentricidad = caracteristicas['excentricidad_inicial_mm'].to_numpy(dtype=float)
+
+    # Carga crítica de Euler
+    carga_critica_euler_kN = (np.pi**2 * modulo * inercia) / (longitud_pandeo**2) / 1000
+
+    # Factor de reducción por pandeo
+    phi = 0.5 * (1 + coef_imperfeccion * (esbeltez_relativa - 0.2) + esbeltez_relativa**2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        chi = 1 / (phi + np.sqrt(phi**2 - esbeltez_relativa**2))
+        amplificacion = 1 / (1 - carga_maxima_kN / carga_critica_euler_kN)
+    factor_reduccion = np.where(esbeltez_relativa <= 0.2, 1.0, chi)
+
+    # Desplazamiento lateral aproximado
+    desplazamiento_lateral_mm = np.where(esbeltez_relativa < 0.2, excentricidad * 1.1, excentricidad * amplificacion)
+
+    resultados = caracteristicas[[c for c in RESULT_COLUMNS if c in caracteristicas.columns]].copy()
+    resultados['carga_maxima_kN'] = carga_maxima_kN
+    resultados['carga_maxima_kg'] = carga_maxima_kN * 101.9716
+    resultados['carga_maxima_ton'] = carga_maxima_kN * 0.1019716
+    resultados['carga_critica_euler_kN'] = carga_critica_euler_kN
+    resultados['factor_reduccion'] = factor_reduccion
+    resultados['resistencia_plastica_kN'] = (area * limite_elastico) / 1000
+    resultados['desplazamiento_lateral_mm'] = desplazamiento_lateral_mm
+    return resultados[RESULT_COLUMNS]
+
+
+def _predict_loads(model, caracteristicas, thread_count=None):
+    """Llamar al modelo y devolver la carga máxima en kN como array."""
+    if thread_count is None:
+        carga_maxima_kN = model.predict(caracteristicas)
+    else:
+        carga_maxima_kN = model.predict(caracteristicas, thread_count=thread_count)
+    return np.asarray(carga_maxima_kN, dtype=float)
+
+
+def _predict_loads_cached(model, caracteristicas, cache, thread_count=None):
+    """Consultar la caché en bloque y evaluar con el modelo solo las filas ausentes."""
+    from app.utils.result_cache import feature_keys
+
+    claves = feature_keys(caracteristicas)
+    carga_maxima_kN = cache.lookup(claves)
+    faltan = np.flatnonzero(np.isnan(carga_maxima_kN))
+    if len(faltan) == 0:
+        return carga_maxima_kN
+
+    # Las filas repetidas dentro del lote se evalúan una sola vez
+    claves_nuevas, primera, inversa = np.unique(claves[faltan], axis=0, return_index=True, return_inverse=True)
+    cargas_nuevas = _predict_loads(model, caracteristicas.iloc[faltan[primera]], thread_count)
+    carga_maxima_kN[faltan] = cargas_nuevas[inversa.ravel()]
+    cache.store(claves_nuevas, cargas_nuevas)
+    return carga_maxima_kN
+
+
+def predict_frame(model, entradas, thread_count=None, cache=None):
+    """
+    Evaluar un lote de elementos con una única llamada al modelo.
+
+    Args:
+        model: Modelo entrenado (pipeline de scikit-learn con CatBoost).
+        entradas (pd.DataFrame | list): Parámetros de entrada, una fila por elemento.
+        thread_count (int, opcional): Hilos nativos de CatBoost para la predicción
+            (por defecto, los del modelo).
+        cache (ResultCache, opcional): Caché persistente de resultados; si se
+            indica, el modelo solo evalúa las filas que no están en ella.
+
+    Returns:
+        pd.DataFrame: Resultados, una fila por elemento y en el mismo orden.
+    """
+    if model is None:
+        raise ValueError("El modelo no está cargado")
+
+    if not isinstance(entradas, pd.DataFrame):
+        entradas = pd.DataFrame(list(entradas))
+    if len(entradas) == 0:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    caracteristicas = build_features(entradas)
+
+    if cache is None:
+        carga_maxima_kN = _predict_loads(model, caracteristicas, thread_count)
+    else:
+        carga_maxima_kN = _predict_loads_cached(model, caracteristicas, cache, thread_count)
+    return compute_results(caracteristicas, carga_maxima_kN)
+
+
+class BatchPredictor:
+    """Motor de predicción por lotes, sin dependencias de Qt."""
+
+    def __init__(self, model=None, model_path=None, thread_count=None, cache=None, audit=None):
+        """
+        Inicializar el motor de predicción.
+
+        Args:
+            model: Modelo ya cargado (opcional).
+            model_path (str): Ruta del modelo a cargar si no se proporciona uno.
+            thread_count (int, opcional): Hilos nativos de CatBoost por predicción.
+            cache (ResultCache, opcional): Caché persistente de resultados.
+            audit (AuditLog, opcional): Registro de auditoría de las predicciones.
+        """
+        self.model = model
+        self.model_path = model_path
+        self.thread_count = thread_count
+        self.cache = cache
+        self.audit = audit
+
+        if self.model is None:
+            self.load_model()
+
+    def load_model(self):
+        """Cargar el modelo de predicción desde el archivo joblib."""
+        import joblib
+
+        if self.model_path is None:
+            self.model_path = find_model_path()
+        if self.model_path is None:
+            raise FileNotFoundError("No se ha encontrado ningún modelo modelo_pandeo_acero_*.joblib")
+
+        inicio = time.perf_counter()
+        self.model = joblib.load(self.model_path)
+        metrics.CARGA_MODELO.set(time.perf_counter() - inicio)
+
+    def predict_frame(self, entradas):
+        """
+        Evaluar un lote de elementos.
+
+        Args:
+            entradas (pd.DataFrame | list): Parámetros de entrada, una fila por elemento.
+
+        Returns:
+            pd.DataFrame: Resultados, una fila por elemento.
+        """
+        inicio = time.perf_counter()
+        resultados = predict_frame(self.model, entradas, self.thread_count, self.cache)
+
+        filas = len(resultados)
+        metrics.DURACION_PREDICCION.observe(time.perf_counter() - inicio)
+        metrics.TAMANO_LOTE.observe(filas)
+        metrics.FILAS_PUNTUADAS.inc(filas)
+        metrics.LLAMADAS_MODELO.inc()
+
+        if self.audit is not None:
+            self.audit.record(entradas, resultados)
+        return resultados
+
+    def predict_batch(self, params_list):
+        """
+        Evaluar una lista de diccionarios de parámetros.
+
+        Args:
+            params_list (list): Lista de diccionarios como los de PredictionModel.predict.
+
+        Returns:
+            list: Lista de diccionarios de resultados.
+        """
+        return self.predict_frame(params_list).to_dict('records')
+
+    def predict(self, params):
+        """
+        Evaluar un único elemento.
+
+        Args:
+            params (dict): Parámetros de entrada.
+
+        Returns:
+            dict: Diccionario con los resultados de la predicción.
+        """
+        return self.predict_batch([params])[0]
+
+    def close(self):
+        """Cerrar el registro de auditoría y la caché de resultados, si los hay."""
+        if self.audit is not None:
+            self.audit.close()
+            self.audit = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+
+def open_predictor(model_path=None, thread_count=None, cache_path=None, cache_max_bytes=None,
+                   audit_dir=None, audit_format="parquet", audit_max_bytes=None, worker=False):
+    """
+    Crear un motor de predicción con sus recursos opcionales.
+
+    Los argumentos son simples y serializables, de modo que los procesos
+    trabajadores pueden recibirlos y abrir cada uno su propio motor con la
+    misma configuración que el proceso principal.
+
+    Args:
+        model_path (str, opcional): Ruta del modelo (por defecto se busca).
+        thread_count (int, opcional): Hilos nativos de CatBoost por predicción.
+        cache_path (str, opcional): Archivo SQLite de la caché de resultados.
+            La caché usa WAL, así que varios procesos pueden compartirla.
+        cache_max_bytes (int, opcional): Tamaño máximo de la caché.
+        audit_dir (str, opcional): Carpeta del registro de auditoría.
+        audit_format (str): Formato del registro ('parquet' o 'jsonl').
+        audit_max_bytes (int, opcional): Tamaño de rotación de los archivos de auditoría.
+        worker (bool): Si es un proceso trabajador; su registro de auditoría
+            usa entonces una secuencia de archivos propia del proceso.
+
+    Returns:
+        BatchPredictor: Motor de predicción listo para usar (hay que cerrarlo con close()).
+    """
+    predictor = BatchPredictor(model_path=model_path, thread_count=thread_count)
+    if cache_path:
+        from app.utils.result_cache import DEFAULT_MAX_BYTES, ResultCache
+        predictor.cache = ResultCache(cache_path, predictor.model_path, cache_max_bytes or DEFAULT_MAX_BYTES)
+    if audit_dir:
+        from app.utils.audit_log import DEFAULT_MAX_FILE_BYTES, DEFAULT_PREFIX, AuditLog, worker_prefix
+        predictor.audit = AuditLog(
+            audit_dir, predictor.model_path, audit_format, audit_max_bytes or DEFAULT_MAX_FILE_BYTES,
+            prefix=worker_prefix() if worker else DEFAULT_PREFIX
+        )
+    return predictor
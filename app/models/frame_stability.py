@@ -0,0 +1,376 @@
+import numpy as np
+import pandas as pd
+
+from app.models.batch_predictor import FACTORES_K, build_features
+from app.models.profile_catalog import catalog_sections, load_profile_data
+
+# Grados de libertad por nudo en pórticos planos: (u, v, θ)
+DOF_POR_NUDO = 3
+
+# Grados de libertad restringidos según el tipo de apoyo del nudo
+RESTRICCIONES_APOYO = {
+    'libre': (),
+    'articulado': (0, 1),
+    'empotrado': (0, 1, 2),
+    'deslizante': (1,),
+    'guiado': (0,),
+    'guiado-empotrado': (0, 2)
+}
+
+# Elementos finitos en que se divide cada barra. Con un único elemento cúbico
+# por barra la carga crítica se sobreestima (K = 0.907 en lugar de 1.0 para
+# un pilar biarticulado); con cuatro el error es inferior al 0.5 %
+ELEMENTOS_POR_BARRA = 4
+
+# Casos de referencia: apoyo en la base, apoyo en la cabeza y factor K teórico
+CASOS_REFERENCIA = [
+    ('Articulado-Articulado', 'articulado', 'guiado', 1.0),
+    ('Empotrado-Articulado', 'empotrado', 'guiado', 0.699),
+    ('Empotrado-Empotrado', 'empotrado', 'guiado-empotrado', 0.5),
+    ('Empotrado-Libre', 'empotrado', 'libre', 2.0)
+]
+
+# Por debajo de este número de grados de libertad se usa un solver denso
+MAX_DOF_DENSO = 200
+
+
+class FrameModel:
+    """Pórtico plano definido por nudos, barras y secciones."""
+
+    def __init__(self, nodos, miembros, elementos_por_barra=ELEMENTOS_POR_BARRA):
+        """
+        Inicializar el pórtico.
+
+        Args:
+            nodos (pd.DataFrame): Columnas id, x_mm, y_mm y apoyo (opcional).
+            miembros (pd.DataFrame): Columnas id, nodo_i, nodo_j, tipo_perfil,
+                tipo_acero, dimensiones de la sección y N_ref_kN (opcional,
+                axil de compresión de referencia).
+            elementos_por_barra (int): Elementos finitos en que se divide cada barra.
+        """
+        if elementos_por_barra < 1:
+            raise ValueError("Cada barra necesita al menos un elemento")
+        self.nodos = nodos.reset_index(drop=True)
+        self.miembros = miembros.reset_index(drop=True)
+        self.elementos_por_barra = int(elementos_por_barra)
+
+        if 'apoyo' not in self.nodos:
+            self.nodos['apoyo'] = 'libre'
+        self.nodos['apoyo'] = self.nodos['apoyo'].fillna('libre').astype(str).str.strip().str.lower()
+
+        # Índice consecutivo de cada nudo
+        self._indice_nudo = {nodo_id: i for i, nodo_id in enumerate(self.nodos['id'])}
+        for columna in ('nodo_i', 'nodo_j'):
+            desconocidos = set(self.miembros[columna]) - set(self._indice_nudo)
+            if desconocidos:
+                raise ValueError(f"Barras con nudos inexistentes: {sorted(map(str, desconocidos))[:5]}")
+
+        # Geometría de las barras
+        i = self.miembros['nodo_i'].map(self._indice_nudo).to_numpy()
+        j = self.miembros['nodo_j'].map(self._indice_nudo).to_numpy()
+        x = self.nodos['x_mm'].to_numpy(dtype=float)
+        y = self.nodos['y_mm'].to_numpy(dtype=float)
+        dx = x[j] - x[i]
+        dy = y[j] - y[i]
+        self.longitudes_mm = np.hypot(dx, dy)
+        if np.any(self.longitudes_mm <= 0):
+            raise ValueError("Hay barras de longitud nula")
+        self.cosenos = dx / self.longitudes_mm
+        self.senos = dy / self.longitudes_mm
+        self.nudo_i = i
+        self.nudo_j = j
+
+        # Pilares: barras predominantemente verticales
+        self.es_pilar = np.abs(dy) >= np.abs(dx)
+
+        # Propiedades de las secciones, calculadas como en el modelo de predicción
+        caracteristicas = build_features(self.section_inputs(self.longitudes_mm))
+        self.area_mm2 = caracteristicas['area_mm2'].to_numpy(dtype=float)
+        self.inercia_mm4 = caracteristicas['inercia_mm4'].to_numpy(dtype=float)
+        self.modulo_elasticidad_MPa = caracteristicas['modulo_elasticidad_MPa'].to_numpy(dtype=float)
+
+        # Axil de compresión de referencia (N); por defecto, 1 kN en cada pilar
+        if 'N_ref_kN' in self.miembros:
+            self.axil_ref_N = pd.to_numeric(self.miembros['N_ref_kN'], errors='coerce').fillna(0.0).to_numpy(dtype=float) * 1000
+        else:
+            self.axil_ref_N = np.where(self.es_pilar, 1000.0, 0.0)
+
+    @property
+    def n_nudos_internos(self):
+        """Nudos intermedios creados al dividir las barras en elementos."""
+        return len(self.miembros) * (self.elementos_por_barra - 1)
+
+    @property
+    def n_dof(self):
+        """Número total de grados de libertad (incluidos los nudos intermedios)."""
+        return (len(self.nodos) + self.n_nudos_internos) * DOF_POR_NUDO
+
+    def section_inputs(self, longitudes_mm):
+        """
+        Construir las entradas del modelo de predicción para cada barra.
+
+        Args:
+            longitudes_mm (array): Longitud de cada barra en mm.
+
+        Returns:
+            pd.DataFrame: Entradas con tipo de perfil, acero y dimensiones.
+        """
+        columnas = ['tipo_perfil', 'tipo_acero', 'altura_perfil_mm', 'ancho_alas_mm',
+                    'espesor_alma_mm', 'espesor_alas_mm', 'dimension_exterior_mm', 'espesor_mm']
+        entradas = self.miembros.reindex(columns=columnas).copy()
+        entradas['tipo_acero'] = entradas['tipo_acero'].fillna('S275')
+        entradas['longitud_mm'] = longitudes_mm
+        # Solo se usan las propiedades de la sección: la condición de apoyo
+        # real sale del análisis global (ver prediction_inputs)
+        entradas['condicion_apoyo'] = 'Articulado-Articulado'
+        return entradas
+
+    def restrained_dofs(self):
+        """Obtener los grados de libertad restringidos por los apoyos."""
+        restringidos = []
+        for i, apoyo in enumerate(self.nodos['apoyo']):
+            if apoyo not in RESTRICCIONES_APOYO:
+                raise ValueError(f"Tipo de apoyo desconocido: {apoyo}")
+            restringidos.extend(i * DOF_POR_NUDO + d for d in RESTRICCIONES_APOYO[apoyo])
+        return np.asarray(restringidos, dtype=int)
+
+    def assemble(self):
+        """
+        Ensamblar las matrices de rigidez elástica y geométrica en formato disperso.
+
+        Cada barra se divide en elementos_por_barra elementos; las matrices
+        elementales se calculan de forma vectorizada para todos ellos y se
+        ensamblan en una sola matriz COO.
+
+        Returns:
+            tuple: (K, K_G) como scipy.sparse.csr_matrix de tamaño n_dof.
+        """
+        from scipy import sparse
+
+        # Cada barra se divide en elementos iguales con la misma sección y axil
+        n = self.elementos_por_barra
+        L = np.repeat(self.longitudes_mm / n, n)
+        EA = np.repeat(self.modulo_elasticidad_MPa * self.area_mm2, n)
+        EI = np.repeat(self.modulo_elasticidad_MPa * self.inercia_mm4, n)
+        P = np.repeat(self.axil_ref_N, n)
+        cosenos = np.repeat(self.cosenos, n)
+        senos = np.repeat(self.senos, n)
+        m = len(L)
+
+        # Nudos de cada barra en orden: extremo i, intermedios y extremo j. Los
+        # intermedios se numeran a continuación de los nudos del pórtico
+        internos = len(self.nodos) + np.arange(self.n_nudos_internos).reshape(len(self.miembros), n - 1)
+        secuencia = np.column_stack([self.nudo_i, internos, self.nudo_j])
+        nudo_i = secuencia[:, :-1].ravel()
+        nudo_j = secuencia[:, 1:].ravel()
+
+        # Rigidez elástica local (viga Euler-Bernoulli)
+        k = np.zeros((m, 6, 6))
+        a = EA / L
+        b = 12 * EI / L**3
+        c = 6 * EI / L**2
+        d = 4 * EI / L
+        e = 2 * EI / L
+        k[:, 0, 0] = k[:, 3, 3] = a
+        k[:, 0, 3] = k[:, 3, 0] = -a
+        k[:, 1, 1] = k[:, 4, 4] = b
+        k[:, 1, 4] = k[:, 4, 1] = -b
+        k[:, 1, 2] = k[:, 2, 1] = k[:, 1, 5] = k[:, 5, 1] = c
+        k[:, 2, 4] = k[:, 4, 2] = k[:, 4, 5] = k[:, 5, 4] = -c
+        k[:, 2, 2] = k[:, 5, 5] = d
+        k[:, 2, 5] = k[:, 5, 2] = e
+
+        # Rigidez geométrica local para un axil de compresión P
+        g = np.zeros((m, 6, 6))
+        f = P / (30 * L)
+        g[:, 1, 1] = g[:, 4, 4] = 36 * f
+        g[:, 1, 4] = g[:, 4, 1] = -36 * f
+        g[:, 1, 2] = g[:, 2, 1] = g[:, 1, 5] = g[:, 5, 1] = 3 * L * f
+        g[:, 2, 4] = g[:, 4, 2] = g[:, 4, 5] = g[:, 5, 4] = -3 * L * f
+        g[:, 2, 2] = g[:, 5, 5] = 4 * L**2 * f
+        g[:, 2, 5] = g[:, 5, 2] = -L**2 * f
+
+        # Transformación a ejes globales
+        t = np.zeros((m, 6, 6))
+        for desplazamiento in (0, 3):
+            t[:, desplazamiento, desplazamiento] = cosenos
+            t[:, desplazamiento, desplazamiento + 1] = senos
+            t[:, desplazamiento + 1, desplazamiento] = -senos
+            t[:, desplazamiento + 1, desplazamiento + 1] = cosenos
+            t[:, desplazamiento + 2, desplazamiento + 2] = 1.0
+        k_global = np.einsum('mji,mjk,mkl->mil', t, k, t)
+        g_global = np.einsum('mji,mjk,mkl->mil', t, g, t)
+
+        # Ensamblaje disperso
+        dofs = np.concatenate([
+            nudo_i[:, None] * DOF_POR_NUDO + np.arange(3),
+            nudo_j[:, None] * DOF_POR_NUDO + np.arange(3)
+        ], axis=1)
+        filas = np.repeat(dofs, 6, axis=1).ravel()
+        columnas = np.tile(dofs, (1, 6)).ravel()
+        forma = (self.n_dof, self.n_dof)
+        K = sparse.coo_matrix((k_global.ravel(), (filas, columnas)), shape=forma).tocsr()
+        K_G = sparse.coo_matrix((g_global.ravel(), (filas, columnas)), shape=forma).tocsr()
+        return K, K_G
+
+    def critical_load_factor(self):
+        """
+        Calcular el factor de carga crítico del pórtico.
+
+        Resuelve el problema de autovalores generalizado (K - λ·K_G)·φ = 0 sobre
+        los grados de libertad libres, buscando el mayor μ = 1/λ de K_G·φ = μ·K·φ
+        con un solver disperso (ARPACK con factorización LU de K).
+
+        Returns:
+            float: Factor de carga crítico λ (mínimo positivo).
+        """
+        K, K_G = self.assemble()
+        libres = np.setdiff1d(np.arange(self.n_dof), self.restrained_dofs())
+        K = K[libres][:, libres]
+        K_G = K_G[libres][:, libres]
+
+        try:
+            if len(libres) <= MAX_DOF_DENSO:
+                from scipy.linalg import eigh
+                mu = eigh(K_G.toarray(), K.toarray(), eigvals_only=True)[-1]
+            else:
+                from scipy.sparse.linalg import eigsh
+                mu = eigsh(K_G.tocsc(), k=1, M=K.tocsc(), which='LA', return_eigenvectors=False)[0]
+        except (np.linalg.LinAlgError, RuntimeError, ValueError) as e:
+            raise ValueError(f"No se ha podido resolver la estabilidad del pórtico (¿mecanismo?): {str(e)}")
+
+        if mu <= 0:
+            raise ValueError("El pórtico no tiene barras comprimidas: no existe carga crítica")
+        return 1.0 / mu
+
+    def effective_lengths(self):
+        """
+        Obtener la longitud de pandeo de cada pilar a partir de la estabilidad global.
+
+        Para cada pilar comprimido, N_cr = λ·N_ref y L_k = π·sqrt(E·I / N_cr);
+        el factor K se refiere a la longitud de la barra completa, no a la de
+        sus elementos.
+
+        Returns:
+            pd.DataFrame: Una fila por pilar comprimido con id, longitud_mm,
+                N_cr_kN, longitud_pandeo_mm y factor_longitud_efectiva.
+        """
+        factor_critico = self.critical_load_factor()
+        pilares = self.es_pilar & (self.axil_ref_N > 0)
+
+        N_cr = factor_critico * self.axil_ref_N[pilares]
+        EI = (self.modulo_elasticidad_MPa * self.inercia_mm4)[pilares]
+        longitud_pandeo = np.pi * np.sqrt(EI / N_cr)
+
+        return pd.DataFrame({
+            'id': self.miembros['id'].to_numpy()[pilares],
+            'longitud_mm': self.longitudes_mm[pilares],
+            'N_cr_kN': N_cr / 1000,
+            'longitud_pandeo_mm': longitud_pandeo,
+            'factor_longitud_efectiva': longitud_pandeo / self.longitudes_mm[pilares]
+        })
+
+    def prediction_inputs(self):
+        """
+        Construir las entradas de predicción por lotes con las longitudes derivadas.
+
+        El factor K del análisis global sustituye al de la condición de apoyo;
+        como el modelo también recibe la condición como categoría, se indica la
+        de factor K más próximo para que ambas entradas sean coherentes.
+
+        Returns:
+            pd.DataFrame: Entradas para predict_frame, una fila por pilar, con la
+                columna factor_longitud_efectiva derivada del análisis global.
+        """
+        longitudes = self.effective_lengths()
+        pilares = self.miembros['id'].isin(longitudes['id']).to_numpy()
+        entradas = self.section_inputs(self.longitudes_mm)[pilares].reset_index(drop=True)
+        factores = longitudes['factor_longitud_efectiva'].to_numpy()
+        entradas.insert(0, 'id', longitudes['id'].to_numpy())
+        entradas['condicion_apoyo'] = nearest_support_condition(factores)
+        entradas['factor_longitud_efectiva'] = factores
+        return entradas
+
+
+def nearest_support_condition(factores):
+    """
+    Obtener la condición de apoyo cuyo factor K es el más próximo a cada factor.
+
+    Args:
+        factores (array): Factores de longitud efectiva.
+
+    Returns:
+        np.ndarray: Nombre de la condición de apoyo para cada factor.
+    """
+    nombres = np.array(list(FACTORES_K), dtype=object)
+    valores = np.array(list(FACTORES_K.values()), dtype=float)
+    factores = np.asarray(factores, dtype=float)
+    return nombres[np.argmin(np.abs(factores[:, None] - valores[None, :]), axis=1)]
+
+
+def verify_reference_cases(tolerancia=0.01, seccion='IPE 200', longitud_mm=3000.0):
+    """
+    Comprobar el análisis con pilares aislados de factor K conocido.
+
+    Args:
+        tolerancia (float): Error relativo máximo admitido en el factor K.
+        seccion (str): Designación del catálogo usada en los pilares.
+        longitud_mm (float): Longitud de los pilares.
+
+    Returns:
+        pd.DataFrame: Una fila por caso con el factor teórico, el calculado,
+            el error relativo y si está dentro de la tolerancia.
+    """
+    tipo_perfil = seccion.split()[0]
+    datos_seccion = load_profile_data(tipo_perfil, seccion)
+    filas = []
+    for nombre, apoyo_base, apoyo_cabeza, factor_teorico in CASOS_REFERENCIA:
+        nodos = pd.DataFrame({'id': [1, 2], 'x_mm': [0.0, 0.0], 'y_mm': [0.0, longitud_mm],
+                              'apoyo': [apoyo_base, apoyo_cabeza]})
+        miembros = pd.DataFrame([dict(id='P1', nodo_i=1, nodo_j=2, tipo_perfil=tipo_perfil,
+                                      tipo_acero='S275', **datos_seccion)])
+        factor = FrameModel(nodos, miembros).effective_lengths()['factor_longitud_efectiva'].iloc[0]
+        error = abs(factor - factor_teorico) / factor_teorico
+        filas.append({'caso': nombre, 'K_teorico': factor_teorico, 'K_calculado': factor,
+                      'error_relativo': error, 'correcto': error <= tolerancia})
+    return pd.DataFrame(filas)
+
+
+def load_frame_csv(nodos_csv, miembros_csv, secciones_csv=None, elementos_por_barra=ELEMENTOS_POR_BARRA):
+    """
+    Importar la geometría de un pórtico desde archivos CSV.
+
+    Formatos esperados:
+        - nodos: id, x_mm, y_mm, apoyo (libre/articulado/empotrado/deslizante/guiado)
+        - miembros: id, nodo_i, nodo_j, seccion y opcionalmente N_ref_kN
+        - secciones (opcional): seccion, tipo_perfil, tipo_acero y dimensiones.
+          Las secciones que no aparezcan se buscan en el catálogo por su
+          designación (p. ej., 'IPE 200'), con acero S275.
+
+    El parámetro elementos_por_barra se pasa a FrameModel.
+
+    Returns:
+        FrameModel: Pórtico listo para el análisis de estabilidad.
+    """
+    nodos = pd.read_csv(nodos_csv)
+    miembros = pd.read_csv(miembros_csv)
+
+    secciones = pd.read_csv(secciones_csv) if secciones_csv else pd.DataFrame(columns=['seccion'])
+    definidas = set(secciones['seccion'])
+
+    # Completar con secciones del catálogo
+    tipos_catalogo = {designacion: tipo_perfil for tipo_perfil, designacion in catalog_sections()}
+    del_catalogo = []
+    for seccion in miembros['seccion'].unique():
+        if seccion in definidas:
+            continue
+        if seccion not in tipos_catalogo:
+            raise ValueError(f"Sección desconocida: {seccion}")
+        tipo_perfil = tipos_catalogo[seccion]
+        del_catalogo.append(dict(seccion=seccion, tipo_perfil=tipo_perfil, tipo_acero='S275',
+                                 **load_profile_data(tipo_perfil, seccion)))
+    if del_catalogo:
+        secciones = pd.concat([secciones, pd.DataFrame(del_catalogo)], ignore_index=True)
+
+    miembros = miembros.merge(secciones, on='seccion', how='left', validate='many_to_one')
+    return FrameModel(nodos, miembros, elementos_por_barra)
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+from app.models.batch_predictor import build_features, compute_results
+
+
+def section_modulus_mm3(caracteristicas):
+    """
+    Calcular el módulo resistente elástico de cada sección.
+
+    Args:
+        caracteristicas (pd.DataFrame): Salida de build_features.
+
+    Returns:
+        np.ndarray: Módulo resistente W = I / (h/2) en mm³.
+    """
+    inercia = caracteristicas['inercia_mm4'].to_numpy(dtype=float)
+    es_tubular = caracteristicas['tipo_perfil'].isin(['Tubular cuadrado', 'Tubular circular']).to_numpy()
+    altura = np.where(
+        es_tubular,
+        caracteristicas['dimension_exterior_mm'].to_numpy(dtype=float),
+        caracteristicas['altura_perfil_mm'].to_numpy(dtype=float)
+    )
+    return inercia / (altura / 2)
+
+
+def compute_utilizations(model, miembros, N_Ed, M_1=None, M_2=None, nombres_combinaciones=None):
+    """
+    Calcular la utilización de cada par (miembro, combinación) de forma vectorizada.
+
+    Las capacidades se obtienen con una única llamada al modelo por lotes (una
+    fila por miembro) y se combinan por difusión con la matriz de cargas:
+
+        u = N_Ed / N_b,Rd + C_m · M_Ed / (M_Rd · (1 - N_Ed / N_cr))
+
+    con C_m = max(0.6 + 0.4·ψ, 0.4) y ψ = M_min / M_max de los momentos de extremo.
+
+    Args:
+        model: Modelo entrenado.
+        miembros (pd.DataFrame | list): Parámetros de entrada, una fila por miembro.
+        N_Ed (array): Axil de compresión de cálculo en kN, forma (miembros, combinaciones).
+        M_1 (array, opcional): Momento en el extremo 1 en kN·m, misma forma.
+        M_2 (array, opcional): Momento en el extremo 2 en kN·m, misma forma.
+        nombres_combinaciones (list, opcional): Nombre de cada combinación.
+
+    Returns:
+        dict: Diccionario con las claves:
+            - capacidades: DataFrame de resultados de predicción por miembro.
+            - utilizaciones: Matriz (miembros, combinaciones) de utilización.
+            - combinacion_gobernante: Nombre de la combinación gobernante por miembro.
+            - utilizacion_maxima: Utilización gobernante por miembro.
+            - resumen: DataFrame con la combinación gobernante de cada miembro.
+    """
+    N_Ed = np.asarray(N_Ed, dtype=float)
+    if N_Ed.size == 0 and N_Ed.ndim < 2:
+        # Sin miembros: matriz de cargas vacía con una columna por combinación
+        N_Ed = N_Ed.reshape(0, len(nombres_combinaciones) if nombres_combinaciones is not None else 0)
+    N_Ed = np.atleast_2d(N_Ed)
+    n_miembros, n_combinaciones = N_Ed.shape
+    M_1 = np.zeros_like(N_Ed) if M_1 is None else np.asarray(M_1, dtype=float).reshape(N_Ed.shape)
+    M_2 = np.zeros_like(N_Ed) if M_2 is None else np.asarray(M_2, dtype=float).reshape(N_Ed.shape)
+    if nombres_combinaciones is None:
+        nombres_combinaciones = [f"C{j + 1}" for j in range(n_combinaciones)]
+    if len(nombres_combinaciones) != n_combinaciones:
+        raise ValueError("El número de nombres no coincide con el número de combinaciones")
+
+    # Capacidades: una sola evaluación del modelo por miembro
+    if model is None:
+        raise ValueError("El modelo no está cargado")
+    caracteristicas = build_features(miembros)
+    if len(caracteristicas) != n_miembros:
+        raise ValueError(f"La matriz de cargas tiene {n_miembros} filas pero hay {len(caracteristicas)} miembros")
+    cargas = model.predict(caracteristicas) if n_miembros else np.empty(0)
+    capacidades = compute_results(caracteristicas, cargas)
+
+    N_b_Rd = capacidades['carga_maxima_kN'].to_numpy(dtype=float)[:, None]
+    N_cr = capacidades['carga_critica_euler_kN'].to_numpy(dtype=float)[:, None]
+    limite_elastico = caracteristicas['limite_elastico_MPa'].to_numpy(dtype=float)
+    M_Rd = (section_modulus_mm3(caracteristicas) * limite_elastico / 1e6)[:, None]
+
+    # Momento equivalente uniforme
+    abs_1 = np.abs(M_1)
+    abs_2 = np.abs(M_2)
+    M_max = np.maximum(abs_1, abs_2)
+    M_min_con_signo = np.where(abs_1 >= abs_2, M_2, M_1)
+    M_max_con_signo = np.where(abs_1 >= abs_2, M_1, M_2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        psi = np.where(M_max > 0, M_min_con_signo / M_max_con_signo, 1.0)
+        C_m = np.maximum(0.6 + 0.4 * psi, 0.4)
+
+        # Amplificación de segundo orden (infinita si se supera la carga crítica)
+        compresion = np.maximum(N_Ed, 0.0)
+        amplificacion = np.where(compresion < N_cr, 1 / (1 - compresion / N_cr), np.inf)
+        termino_momento = np.where(M_max > 0, C_m * M_max * amplificacion / M_Rd, 0.0)
+        utilizaciones = compresion / N_b_Rd + termino_momento
+
+    if n_combinaciones == 0:
+        raise ValueError("Se necesita al menos una combinación de cargas")
+    indice_gobernante = np.argmax(utilizaciones, axis=1)
+    utilizacion_maxima = utilizaciones[np.arange(n_miembros), indice_gobernante]
+    combinacion_gobernante = [nombres_combinaciones[j] for j in indice_gobernante]
+
+    resumen = pd.DataFrame({
+        'N_b_Rd_kN': N_b_Rd[:, 0],
+        'M_Rd_kNm': M_Rd[:, 0],
+        'combinacion_gobernante': combinacion_gobernante,
+        'utilizacion_maxima': utilizacion_maxima,
+        'cumple': utilizacion_maxima <= 1.0
+    })
+
+    return {
+        'capacidades': capacidades,
+        'utilizaciones': utilizaciones,
+        'combinacion_gobernante': combinacion_gobernante,
+        'utilizacion_maxima': utilizacion_maxima,
+        'resumen': resumen
+    }
+
@@ -0,0 +1,225 @@
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from app.models.batch_predictor import FACTORES_K, PROPIEDADES_ACERO, predict_frame
+from app.models.profile_catalog import catalog_sections, load_profile_data
+from app.utils import metrics
+
+# Rejilla de longitudes por defecto: de 0.5 m a 12 m cada 250 mm
+DEFAULT_LENGTHS_MM = np.arange(500.0, 12000.0 + 1.0, 250.0)
+
+# Archivos que componen una tabla de consulta
+INDEX_FILENAME = "indice.json"
+CAPACITY_FILENAME = "capacidades_kN.npy"
+
+
+def build_lookup_tables(model, output_dir, longitudes_mm=DEFAULT_LENGTHS_MM, chunk_size=50000, model_path=None):
+    """
+    Evaluar todo el catálogo sobre una rejilla de longitudes y guardarlo en .npy.
+
+    La tabla tiene forma (secciones, aceros, apoyos, longitudes) y se escribe
+    por bloques directamente sobre un archivo mapeado en memoria, de modo que
+    el consumo de memoria no depende del tamaño de la rejilla.
+
+    Args:
+        model: Modelo entrenado.
+        output_dir (str): Directorio de salida (se reemplaza de forma atómica).
+        longitudes_mm (array): Rejilla de longitudes en mm.
+        chunk_size (int): Número de filas evaluadas por llamada al modelo.
+        model_path (str, opcional): Ruta del modelo, registrada en el índice.
+
+    Returns:
+        str: Ruta del directorio con las tablas generadas.
+    """
+    secciones = catalog_sections()
+    aceros = list(PROPIEDADES_ACERO)
+    apoyos = list(FACTORES_K)
+    longitudes_mm = np.asarray(longitudes_mm, dtype=float)
+    forma = (len(secciones), len(aceros), len(apoyos), len(longitudes_mm))
+
+    # Dimensiones de cada sección en formato de columnas
+    dimensiones = pd.DataFrame([
+        dict(tipo_perfil=tipo_perfil, **load_profile_data(tipo_perfil, designacion))
+        for tipo_perfil, designacion in secciones
+    ])
+
+    parent_dir = os.path.dirname(os.path.abspath(output_dir))
+    os.makedirs(parent_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".tablas_", dir=parent_dir)
+
+    capacidades = np.lib.format.open_memmap(
+        os.path.join(tmp_dir, CAPACITY_FILENAME), mode='w+', dtype=np.float64, shape=forma
+    )
+    planas = capacidades.reshape(-1)
+
+    total = int(np.prod(forma))
+    for inicio in range(0, total, chunk_size):
+        indices = np.arange(inicio, min(inicio + chunk_size, total))
+        i_seccion, i_acero, i_apoyo, i_longitud = np.unravel_index(indices, forma)
+
+        entradas = dimensiones.iloc[i_seccion].reset_index(drop=True)
+        entradas['tipo_acero'] = np.asarray(aceros, dtype=object)[i_acero]
+        entradas['condicion_apoyo'] = np.asarray(apoyos, dtype=object)[i_apoyo]
+        entradas['longitud_mm'] = longitudes_mm[i_longitud]
+
+        planas[indices] = predict_frame(model, entradas)['carga_maxima_kN'].to_numpy(dtype=float)
+
+    capacidades.flush()
+    del capacidades, planas
+
+    indice = {
+        'secciones': [list(seccion) for seccion in secciones],
+        'aceros': aceros,
+        'apoyos': apoyos,
+        'longitudes_mm': longitudes_mm.tolist(),
+        'modelo': _model_identity(model_path)
+    }
+    with open(os.path.join(tmp_dir, INDEX_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(indice, f, indent=4, ensure_ascii=False)
+
+    # Reemplazar las tablas anteriores solo cuando las nuevas están completas
+    if os.path.exists(output_dir):
+        old_dir = output_dir + ".old"
+        os.replace(output_dir, old_dir)
+        os.replace(tmp_dir, output_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    else:
+        os.replace(tmp_dir, output_dir)
+
+    return output_dir
+
+
+def _model_identity(model_path):
+    """Identificar el modelo por nombre, tamaño y fecha de modificación."""
+    if model_path is None or not os.path.exists(model_path):
+        return None
+    estado = os.stat(model_path)
+    return {
+        'archivo': os.path.basename(model_path),
+        'tamano': estado.st_size,
+        'modificado': estado.st_mtime
+    }
+
+
+class CapacityLookup:
+    """Consulta de capacidades sobre tablas .npy mapeadas en memoria."""
+
+    def __init__(self, tables_dir, predictor=None):
+        """
+        Abrir las tablas de consulta.
+
+        El archivo de capacidades se mapea en memoria en modo de solo lectura,
+        por lo que la carga es casi inmediata y las páginas se comparten entre
+        procesos a través de la caché del sistema operativo.
+
+        Args:
+            tables_dir (str): Directorio generado por build_lookup_tables.
+            predictor (BatchPredictor, opcional): Motor para longitudes fuera
+                de la rejilla. Si no se proporciona, se crea al necesitarlo.
+        """
+        self.tables_dir = tables_dir
+        self.predictor = predictor
+        self._aciertos = metrics.CACHE_ACIERTOS.labels("tablas")
+        self._fallos = metrics.CACHE_FALLOS.labels("tablas")
+
+        with open(os.path.join(tables_dir, INDEX_FILENAME), 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+
+        self.capacidades = np.load(os.path.join(tables_dir, CAPACITY_FILENAME), mmap_mode='r')
+
+        # Índices O(1) por eje
+        self._secciones = {tuple(s): i for i, s in enumerate(self.index['secciones'])}
+        self._aceros = {a: i for i, a in enumerate(self.index['aceros'])}
+        self._apoyos = {a: i for i, a in enumerate(self.index['apoyos'])}
+        self._longitudes = {self._length_key(l): i for i, l in enumerate(self.index['longitudes_mm'])}
+
+    @staticmethod
+    def _length_key(longitud_mm):
+        """Clave de longitud tolerante a errores de redondeo (0.001 mm)."""
+        return int(round(float(longitud_mm) * 1000))
+
+    def capacity(self, tipo_perfil, designacion, tipo_acero, condicion_apoyo, longitud_mm):
+        """
+        Obtener la carga máxima de un perfil del catálogo.
+
+        Args:
+            tipo_perfil (str): Tipo de perfil.
+            designacion (str): Designación comercial del perfil.
+            tipo_acero (str): Tipo de acero.
+            condicion_apoyo (str): Condición de apoyo.
+            longitud_mm (float): Longitud del elemento en mm.
+
+        Returns:
+            float: Carga máxima en kN. Se lee de la tabla si la longitud está en
+                la rejilla y se evalúa con el modelo en caso contrario.
+        """
+        i_seccion = self._secciones[(tipo_perfil, designacion)]
+        i_acero = self._aceros[tipo_acero]
+        i_apoyo = self._apoyos[condicion_apoyo]
+
+        i_longitud = self._longitudes.get(self._length_key(longitud_mm))
+        if i_longitud is not None:
+            self._aciertos.inc()
+            return float(self.capacidades[i_seccion, i_acero, i_apoyo, i_longitud])
+        self._fallos.inc()
+
+        # Fuera de la rejilla: evaluación exacta con el modelo
+        params = dict(
+            tipo_perfil=tipo_perfil,
+            tipo_acero=tipo_acero,
+            condicion_apoyo=condicion_apoyo,
+            longitud_mm=float(longitud_mm),
+            **load_profile_data(tipo_perfil, designacion)
+        )
+        return float(self._get_predictor().predict(params)['carga_maxima_kN'])
+
+    def capacity_curve(self, tipo_perfil, designacion, tipo_acero, condicion_apoyo):
+        """
+        Obtener la curva capacidad-longitud de un perfil sobre la rejilla.
+
+        Returns:
+            tuple: (longitudes en mm, cargas máximas en kN) como arrays.
+        """
+        fila = self.capacidades[
+            self._secciones[(tipo_perfil, designacion)],
+            self._aceros[tipo_acero],
+            self._apoyos[condicion_apoyo]
+        ]
+        return np.asarray(self.index['longitudes_mm']), np.asarray(fila)
+
+    def _get_predictor(self):
+        """Crear el motor de predicción solo cuando hace falta."""
+        if self.predictor is None:
+            from app.models.batch_predictor import BatchPredictor
+            self.predictor = BatchPredictor()
+        return self.predictor
+
+
+def main():
+    """Generar las tablas de consulta desde la línea de comandos."""
+    import argparse
+    import time
+    from app.models.batch_predictor import BatchPredictor
+
+    parser = argparse.ArgumentParser(description="Generar tablas de capacidades del catálogo completo")
+    parser.add_argument("output_dir", help="Directorio de salida de las tablas")
+    parser.add_argument("--longitud-min", type=float, default=DEFAULT_LENGTHS_MM[0], help="Longitud mínima en mm")
+    parser.add_argument("--longitud-max", type=float, default=DEFAULT_LENGTHS_MM[-1], help="Longitud máxima en mm")
+    parser.add_argument("--paso", type=float, default=250.0, help="Paso de la rejilla de longitudes en mm")
+    args = parser.parse_args()
+
+    predictor = BatchPredictor()
+    longitudes = np.arange(args.longitud_min, args.longitud_max + args.paso / 2, args.paso)
+
+    inicio = time.perf_counter()
+    build_lookup_tables(predictor.model, args.output_dir, longitudes, model_path=predictor.model_path)
+    print(f"Tablas generadas en {args.output_dir} ({time.perf_counter() - inicio:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
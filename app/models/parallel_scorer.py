@@ -0,0 +1,205 @@
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from app.models.streaming_scorer import ChunkWriter, iter_input_chunks, score_chunk
+
+# Tamaño de bloque por defecto para el reparto de trabajo entre procesos
+DEFAULT_PARALLEL_CHUNK_SIZE = 20000
+
+# Segundos máximos de espera a que arranquen todos los procesos en measure_scaling
+WARMUP_TIMEOUT = 300.0
+
+# Motor de predicción del proceso trabajador (se carga una sola vez por proceso)
+_worker_predictor = None
+
+# Barrera de arranque del proceso trabajador (solo en measure_scaling)
+_worker_barrier = None
+
+
+def _init_worker(model_path, threads_per_worker, barrera=None, predictor_options=None):
+    """Cargar el modelo una única vez en cada proceso trabajador."""
+    global _worker_predictor, _worker_barrier
+    from multiprocessing.util import Finalize
+
+    from app.models.batch_predictor import open_predictor
+
+    # Limitar los hilos nativos de CatBoost para no sobresuscribir los núcleos
+    _worker_predictor = open_predictor(model_path, threads_per_worker, worker=True, **(predictor_options or {}))
+    _worker_barrier = barrera
+
+    # Los procesos del grupo terminan sin ejecutar atexit: el cierre se
+    # registra como finalizador de multiprocessing
+    Finalize(_worker_predictor, _worker_predictor.close, exitpriority=10)
+
+
+def _wait_for_all_workers():
+    """Bloquear el proceso hasta que todos los trabajadores hayan cargado el modelo."""
+    _worker_barrier.wait(WARMUP_TIMEOUT)
+
+
+def _score_worker_chunk(entradas):
+    """Puntuar un bloque en el proceso trabajador."""
+    return score_chunk(_worker_predictor, entradas)
+
+
+def default_workers():
+    """Número de procesos por defecto: un proceso por núcleo disponible."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _make_executor(model_path, workers, threads_per_worker, barrera=None, predictor_options=None):
+    """Crear el grupo de procesos con el modelo cargado en cada trabajador."""
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_path, threads_per_worker, barrera, predictor_options)
+    )
+
+
+def _iter_frame_chunks(entradas, chunk_size):
+    """Dividir un DataFrame en bloques consecutivos."""
+    for inicio in range(0, len(entradas), chunk_size):
+        yield entradas.iloc[inicio:inicio + chunk_size]
+
+
+def _ordered_results(executor, chunks, max_in_flight):
+    """
+    Repartir bloques entre los procesos y devolver los resultados en orden.
+
+    Se mantiene un número acotado de bloques en vuelo para que la memoria no
+    dependa del tamaño total de la entrada.
+    """
+    pendientes = deque()
+    for entradas in chunks:
+        pendientes.append((len(entradas), executor.submit(_score_worker_chunk, entradas)))
+        if len(pendientes) >= max_in_flight:
+            filas, future = pendientes.popleft()
+            yield filas, future.result()
+    while pendientes:
+        filas, future = pendientes.popleft()
+        yield filas, future.result()
+
+
+def score_parallel(entradas, model_path=None, workers=None, chunk_size=DEFAULT_PARALLEL_CHUNK_SIZE,
+                   threads_per_worker=1, predictor_options=None):
+    """
+    Puntuar un DataFrame repartiendo bloques entre varios procesos.
+
+    Args:
+        entradas (pd.DataFrame): Parámetros de entrada, una fila por miembro.
+        model_path (str, opcional): Ruta del modelo (por defecto se busca).
+        workers (int, opcional): Número de procesos (por defecto, uno por núcleo).
+        chunk_size (int): Filas por bloque de trabajo.
+        threads_per_worker (int): Hilos nativos de CatBoost por proceso.
+        predictor_options (dict, opcional): Argumentos de open_predictor
+            (caché de resultados y auditoría) para el motor de cada proceso.
+
+    Returns:
+        pd.DataFrame: Resultados en el mismo orden que la entrada.
+    """
+    workers = workers or default_workers()
+    with _make_executor(model_path, workers, threads_per_worker, predictor_options=predictor_options) as executor:
+        partes = [
+            resultado for _, resultado in
+            _ordered_results(executor, _iter_frame_chunks(entradas, chunk_size), 2 * workers)
+        ]
+    if not partes:
+        return pd.DataFrame()
+    return pd.concat(partes, ignore_index=True)
+
+
+def score_stream_parallel(input_path, output_path, model_path=None, workers=None,
+                          chunk_size=DEFAULT_PARALLEL_CHUNK_SIZE, threads_per_worker=1, progress=None,
+                          predictor_options=None):
+    """
+    Puntuar un archivo en streaming con varios procesos, conservando el orden.
+
+    Args:
+        input_path (str): Archivo de entrada (CSV, NDJSON o Parquet).
+        output_path (str): Archivo de salida (CSV, NDJSON o Parquet).
+        model_path (str, opcional): Ruta del modelo.
+        workers (int, opcional): Número de procesos.
+        chunk_size (int): Filas por bloque de trabajo.
+        threads_per_worker (int): Hilos nativos de CatBoost por proceso.
+        progress (callable, opcional): Función llamada con (filas, segundos, filas por segundo).
+        predictor_options (dict, opcional): Argumentos de open_predictor
+            (caché de resultados y auditoría) para el motor de cada proceso.
+
+    Returns:
+        dict: Estadísticas con filas, bloques, trabajadores, segundos y filas_por_s.
+    """
+    workers = workers or default_workers()
+    inicio = time.perf_counter()
+    filas = 0
+    bloques = 0
+
+    with _make_executor(model_path, workers, threads_per_worker, predictor_options=predictor_options) as executor, \
+            ChunkWriter(output_path) as writer:
+        chunks = iter_input_chunks(input_path, chunk_size)
+        for filas_bloque, resultado in _ordered_results(executor, chunks, 2 * workers):
+            writer.write(resultado)
+            filas += filas_bloque
+            bloques += 1
+
+            if progress is not None:
+                transcurrido = time.perf_counter() - inicio
+                progress(filas, transcurrido, filas / transcurrido if transcurrido > 0 else 0.0)
+
+    segundos = time.perf_counter() - inicio
+    return {
+        'filas': filas,
+        'bloques': bloques,
+        'trabajadores': workers,
+        'segundos': segundos,
+        'filas_por_s': filas / segundos if segundos > 0 else 0.0
+    }
+
+
+def measure_scaling(entradas, worker_counts, model_path=None, chunk_size=DEFAULT_PARALLEL_CHUNK_SIZE):
+    """
+    Medir la eficiencia de escalado de 1 a N procesos.
+
+    El tiempo de arranque del grupo (carga del modelo en cada proceso) se
+    excluye: antes de medir se envían tantas tareas como procesos, que se
+    bloquean en una barrera hasta que todos han arrancado y cargado el modelo.
+
+    Args:
+        entradas (pd.DataFrame): Lote de entrada para la medida.
+        worker_counts (list): Números de procesos a medir (p. ej., [1, 2, 4, 8]).
+        model_path (str, opcional): Ruta del modelo.
+        chunk_size (int): Filas por bloque de trabajo.
+
+    Returns:
+        pd.DataFrame: Una fila por número de procesos con segundos, filas_por_s,
+            aceleracion y eficiencia respecto a un proceso.
+    """
+    filas = []
+    for workers in worker_counts:
+        barrera = multiprocessing.get_context("spawn").Barrier(workers)
+        with _make_executor(model_path, workers, 1, barrera) as executor:
+            # Calentamiento: cada tarea ocupa un proceso hasta que todos están
+            # en marcha, lo que obliga al grupo a arrancar los N procesos
+            for future in [executor.submit(_wait_for_all_workers) for _ in range(workers)]:
+                future.result()
+
+            inicio = time.perf_counter()
+            for _ in _ordered_results(executor, _iter_frame_chunks(entradas, chunk_size), 2 * workers):
+                pass
+            segundos = time.perf_counter() - inicio
+
+        filas.append({'trabajadores': workers, 'segundos': segundos, 'filas_por_s': len(entradas) / segundos})
+
+    informe = pd.DataFrame(filas)
+    base = informe['segundos'].iloc[0] * informe['trabajadores'].iloc[0]
+    informe['aceleracion'] = base / informe['segundos']
+    informe['eficiencia'] = informe['aceleracion'] / informe['trabajadores']
+    return informe
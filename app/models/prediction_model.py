@@ -1,9 +1,11 @@
 import os
-import joblib
+import threading
 import numpy as np
-import pandas as pd
 from PyQt5.QtCore import QObject, pyqtSignal
 
+# joblib, pandas y CatBoost se importan al cargar el modelo o al predecir,
+# no al importar este módulo: así no retrasan la aparición de la ventana
+
 class PredictionModel(QObject):
     """Modelo para realizar predicciones de pandeo en elementos de acero."""
     
@@ -23,15 +25,74 @@ class PredictionModel(QObject):
                 self.model_path = os.path.join(root_dir, filename)
                 break
         
-        # Modelo de predicción
+        # Modelo de predicción. No se carga aquí: la ventana principal lanza
+        # load_model_async al arrancar y, si se predice antes de que termine,
+        # ensure_model_loaded espera a la carga
         self.model = None
+        self._load_lock = threading.Lock()
+        self._load_attempted = False
+        
+        # Proceso hijo de predicción (ProcessPredictor), si está activado
+        self.worker = None
+    
+    @property
+    def out_of_process(self):
+        """Indica si las predicciones se realizan en un proceso aparte."""
+        return self.worker is not None
+    
+    def set_out_of_process(self, enabled):
+        """
+        Activar o desactivar la predicción en un proceso hijo persistente.
         
-        # Cargar modelo
-        self.load_model()
+        Con la predicción en un proceso aparte, la inferencia no compite con el
+        pintado de la interfaz y un fallo en código nativo no cierra la ventana.
+        El proceso se arranca en segundo plano para tener el modelo cargado
+        antes de la primera predicción.
+        
+        Args:
+            enabled (bool): True para predecir en un proceso aparte.
+        """
+        if enabled and self.worker is None:
+            from app.models.process_worker import ProcessPredictor
+            
+            self.worker = ProcessPredictor(model_path=self.model_path)
+            threading.Thread(target=self._start_worker, args=(self.worker,),
+                             name="arranque-proceso-prediccion", daemon=True).start()
+        elif not enabled and self.worker is not None:
+            # Se cierra en segundo plano por si hay una predicción en curso
+            worker, self.worker = self.worker, None
+            threading.Thread(target=worker.close, name="cierre-proceso-prediccion", daemon=True).start()
+    
+    def _start_worker(self, worker):
+        """Arrancar el proceso de predicción (hilo de fondo)."""
+        try:
+            worker.start()
+        except Exception as e:
+            print(f"Error al arrancar el proceso de predicción: {str(e)}")
+    
+    def shutdown(self):
+        """Detener el proceso de predicción, si existe."""
+        if self.worker is not None:
+            self.worker.close()
+            self.worker = None
+    
+    def load_model_async(self):
+        """Cargar el modelo en un hilo de fondo (model_loaded se emite al terminar)."""
+        threading.Thread(target=self.ensure_model_loaded, name="carga-modelo", daemon=True).start()
+    
+    def ensure_model_loaded(self):
+        """Cargar el modelo si aún no se ha intentado; si otro hilo lo está cargando, esperar."""
+        with self._load_lock:
+            if self.model is None and not self._load_attempted:
+                self._load_attempted = True
+                self.load_model()
+        return self.model is not None
     
     def load_model(self):
         """Cargar el modelo de predicción desde el archivo joblib."""
         try:
+            import joblib
+            
             if self.model_path is not None:
                 self.model = joblib.load(self.model_path)
                 self.model_loaded.emit(True)
@@ -57,6 +118,9 @@ class PredictionModel(QObject):
                             self.model = joblib.load(self.model_path)
                             self.model_loaded.emit(True)
                             break
+                
+                if self.model is None:
+                    self.model_loaded.emit(False)
         except Exception as e:
             print(f"Error al cargar el modelo: {str(e)}")
             self.model_loaded.emit(False)
@@ -81,7 +145,13 @@ class PredictionModel(QObject):
         Returns:
             dict: Diccionario con los resultados de la predicción.
         """
-        if self.model is None:
+        import pandas as pd
+        
+        worker = self.worker
+        if worker is not None:
+            return worker.predict(params)
+        
+        if not self.ensure_model_loaded():
             raise ValueError("El modelo no está cargado")
         
         # Extraer parámetros
@@ -292,4 +362,42 @@ class PredictionModel(QObject):
             'desplazamiento_lateral_mm': desplazamiento_lateral_mm
         }
         
-        return results 
\ No newline at end of file
+        return results
+    
+    def predict_batch(self, params_list):
+        """
+        Realizar predicciones para varios elementos con una única llamada al modelo.
+        
+        Args:
+            params_list (list): Lista de diccionarios con los mismos parámetros que predict.
+        
+        Returns:
+            list: Lista de diccionarios de resultados, en el mismo orden.
+        """
+        from app.models.batch_predictor import predict_frame
+        
+        worker = self.worker
+        if worker is not None:
+            return worker.predict_batch(params_list)
+        
+        self.ensure_model_loaded()
+        return predict_frame(self.model, params_list).to_dict('records')
+    
+    def analyze_sensitivity(self, params):
+        """
+        Analizar la sensibilidad de la carga máxima respecto a los parámetros de entrada.
+        
+        Args:
+            params (dict): Parámetros de entrada del punto de diseño.
+        
+        Returns:
+            dict: Elasticidades y datos del diagrama de tornado (ver sensitivity.analyze_sensitivity).
+        """
+        from app.models.sensitivity import analyze_sensitivity
+        
+        worker = self.worker
+        if worker is not None:
+            return worker.analyze_sensitivity(params)
+        
+        self.ensure_model_loaded()
+        return analyze_sensitivity(self.model, params)
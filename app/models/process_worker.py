@@ -0,0 +1,375 @@
+"""Motor de predicción en un proceso hijo persistente.
+
+La interfaz gráfica puede delegar la inferencia en un proceso aparte para
+que los hilos nativos de CatBoost y el trabajo de pandas (que retiene el GIL)
+no compitan con el pintado de Qt, y para que un fallo en código nativo no
+cierre la ventana: si el proceso hijo muere o deja de responder, la petición
+en curso falla con WorkerCrashed y el proceso se vuelve a arrancar en la
+siguiente petición.
+
+Los mensajes viajan por una tubería en binario: pickle con protocolo 5 y
+los datos por columnas como arrays de numpy enviados fuera de banda, sin
+copias intermedias. Las columnas de texto se envían como códigos de
+categoría. Este módulo no importa Qt, para que el proceso hijo arranque
+ligero.
+"""
+import multiprocessing
+import pickle
+import threading
+import traceback
+
+import numpy as np
+
+# Segundos máximos de espera al arrancar el proceso hijo (incluye cargar el modelo)
+DEFAULT_START_TIMEOUT = 120.0
+
+# Segundos máximos de espera de cada petición: un proceso hijo colgado se
+# descarta y se vuelve a arrancar en la siguiente petición
+DEFAULT_REQUEST_TIMEOUT = 120.0
+
+# Segundos que close() espera a la petición en curso antes de terminar el proceso
+DEFAULT_CLOSE_TIMEOUT = 5.0
+
+# Intervalo con el que se comprueba si el proceso hijo sigue vivo mientras se espera
+_POLL_INTERVAL = 0.1
+
+
+class WorkerCrashed(RuntimeError):
+    """El proceso de predicción ha terminado de forma inesperada."""
+
+
+# ----------------------------------------------------------------------
+# Codificación de mensajes
+# ----------------------------------------------------------------------
+
+def encode_frame(tabla):
+    """
+    Codificar un DataFrame por columnas para enviarlo por la tubería.
+
+    Args:
+        tabla (pd.DataFrame): Tabla a codificar.
+
+    Returns:
+        dict: Número de filas y lista de columnas (nombre, tipo, datos). Las
+            numéricas se envían como arrays; las de texto, como códigos y categorías.
+    """
+    import pandas as pd
+
+    columnas = []
+    for nombre in tabla.columns:
+        serie = tabla[nombre]
+        if serie.dtype == object or isinstance(serie.dtype, pd.CategoricalDtype):
+            categorias = pd.Categorical(serie)
+            columnas.append((nombre, "categoria", (np.ascontiguousarray(categorias.codes),
+                                                   list(categorias.categories))))
+        else:
+            columnas.append((nombre, "array", np.ascontiguousarray(serie.to_numpy())))
+    return {"filas": len(tabla), "columnas": columnas}
+
+
+def decode_frame(mensaje):
+    """
+    Reconstruir un DataFrame codificado con encode_frame.
+
+    Args:
+        mensaje (dict): Tabla codificada.
+
+    Returns:
+        pd.DataFrame: Tabla con las mismas columnas y en el mismo orden.
+    """
+    import pandas as pd
+
+    datos = {}
+    for nombre, tipo, valores in mensaje["columnas"]:
+        if tipo == "categoria":
+            codigos, categorias = valores
+            datos[nombre] = pd.Categorical.from_codes(codigos, categorias).astype(object)
+        else:
+            datos[nombre] = valores
+    return pd.DataFrame(datos, index=pd.RangeIndex(mensaje["filas"]))
+
+
+def _send(conn, mensaje):
+    """Enviar un mensaje con los arrays grandes fuera de banda."""
+    buffers = []
+    cabecera = pickle.dumps(mensaje, protocol=5, buffer_callback=buffers.append)
+    conn.send_bytes(len(buffers).to_bytes(4, "little") + cabecera)
+    for buffer in buffers:
+        conn.send_bytes(buffer.raw())
+
+
+def _recv(conn):
+    """Recibir un mensaje enviado con _send."""
+    datos = conn.recv_bytes()
+    n_buffers = int.from_bytes(datos[:4], "little")
+    buffers = [conn.recv_bytes() for _ in range(n_buffers)]
+    return pickle.loads(memoryview(datos)[4:], buffers=buffers)
+
+
+# ----------------------------------------------------------------------
+# Proceso hijo
+# ----------------------------------------------------------------------
+
+def _handle_request(predictor, metodo, carga):
+    """Ejecutar una petición en el proceso hijo."""
+    if metodo == "predict_frame":
+        return encode_frame(predictor.predict_frame(decode_frame(carga)))
+    if metodo == "predict":
+        return predictor.predict(carga)
+    if metodo == "analyze_sensitivity":
+        from app.models.sensitivity import analyze_sensitivity
+        return analyze_sensitivity(predictor.model, carga)
+    if metodo == "ping":
+        return carga
+    raise ValueError(f"Petición no soportada: {metodo}")
+
+
+def _worker_main(conn, model_path, thread_count):
+    """Bucle del proceso hijo: cargar el modelo y atender peticiones hasta recibir None."""
+    try:
+        from app.models.batch_predictor import BatchPredictor
+        predictor = BatchPredictor(model_path=model_path, thread_count=thread_count)
+    except Exception as e:
+        _send(conn, (0, "error", str(e), traceback.format_exc()))
+        return
+    _send(conn, (0, "ok", predictor.model_path))
+
+    while True:
+        try:
+            peticion = _recv(conn)
+        except EOFError:
+            break
+        if peticion is None:
+            break
+
+        identificador, metodo, carga = peticion
+        try:
+            respuesta = (identificador, "ok", _handle_request(predictor, metodo, carga))
+        except Exception as e:
+            respuesta = (identificador, "error", str(e), traceback.format_exc())
+        _send(conn, respuesta)
+
+
+# ----------------------------------------------------------------------
+# Cliente
+# ----------------------------------------------------------------------
+
+class ProcessPredictor:
+    """
+    Cliente de un proceso hijo persistente que realiza las predicciones.
+
+    Ofrece los mismos métodos que BatchPredictor (predict, predict_batch,
+    predict_frame) y analyze_sensitivity. Las peticiones se atienden de una
+    en una; el proceso se arranca en la primera petición y se vuelve a
+    arrancar después de un fallo.
+    """
+
+    def __init__(self, model_path=None, thread_count=None, start_timeout=DEFAULT_START_TIMEOUT,
+                 request_timeout=DEFAULT_REQUEST_TIMEOUT, close_timeout=DEFAULT_CLOSE_TIMEOUT):
+        """
+        Preparar el cliente (el proceso hijo no se arranca hasta la primera petición).
+
+        Args:
+            model_path (str, opcional): Ruta del modelo (por defecto se busca).
+            thread_count (int, opcional): Hilos nativos de CatBoost del proceso hijo.
+            start_timeout (float): Segundos máximos para arrancar el proceso y cargar el modelo.
+            request_timeout (float): Segundos máximos de cada petición.
+            close_timeout (float): Segundos que close() espera a la petición
+                en curso antes de terminar el proceso.
+        """
+        self.model_path = model_path
+        self.thread_count = thread_count
+        self.start_timeout = start_timeout
+        self.request_timeout = request_timeout
+        self.close_timeout = close_timeout
+        self.reinicios = 0
+
+        self._lock = threading.Lock()
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._siguiente_id = 1
+        self._arrancado_alguna_vez = False
+
+    @property
+    def running(self):
+        """Indica si el proceso hijo está en marcha."""
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        """Arrancar el proceso hijo y esperar a que cargue el modelo."""
+        with self._lock:
+            self._ensure_started()
+
+    def _ensure_started(self):
+        if self.running:
+            return
+        self._discard_process()
+
+        conn_padre, conn_hijo = self._context.Pipe(duplex=True)
+        proceso = self._context.Process(
+            target=_worker_main, args=(conn_hijo, self.model_path, self.thread_count),
+            name="pandeo-prediccion", daemon=True
+        )
+        proceso.start()
+        conn_hijo.close()
+        self._process, self._conn = proceso, conn_padre
+
+        if self._arrancado_alguna_vez:
+            self.reinicios += 1
+        self._arrancado_alguna_vez = True
+
+        _, estado, *resto = self._wait_response(0, self.start_timeout)
+        if estado != "ok":
+            self._discard_process()
+            raise RuntimeError(f"No se ha podido cargar el modelo en el proceso de predicción: {resto[0]}")
+        self.model_path = resto[0]
+
+    def _wait_response(self, identificador, timeout=None):
+        """Esperar la respuesta a una petición, vigilando que el proceso siga vivo."""
+        esperado = 0.0
+        while True:
+            try:
+                if self._conn.poll(_POLL_INTERVAL):
+                    respuesta = _recv(self._conn)
+                    # Respuestas de peticiones abandonadas se descartan
+                    if respuesta[0] == identificador:
+                        return respuesta
+                    continue
+            except (EOFError, OSError):
+                pass
+            else:
+                if self._process.is_alive():
+                    esperado += _POLL_INTERVAL
+                    if timeout is not None and esperado >= timeout:
+                        self._discard_process()
+                        raise WorkerCrashed(
+                            "El proceso de predicción no responde; se volverá a arrancar en la siguiente predicción"
+                        )
+                    continue
+
+            raise self._crashed()
+
+    def _crashed(self):
+        """Recoger el código de salida del proceso hijo caído y preparar el error."""
+        self._process.join(1.0)
+        codigo = self._process.exitcode
+        self._discard_process()
+        return WorkerCrashed(
+            f"El proceso de predicción ha terminado inesperadamente (código {codigo}); "
+            "se volverá a arrancar en la siguiente predicción"
+        )
+
+    def _call(self, metodo, carga):
+        """Enviar una petición al proceso hijo y devolver su resultado."""
+        with self._lock:
+            self._ensure_started()
+            identificador = self._siguiente_id
+            self._siguiente_id += 1
+            try:
+                _send(self._conn, (identificador, metodo, carga))
+            except (BrokenPipeError, OSError):
+                raise self._crashed()
+
+            _, estado, *resto = self._wait_response(identificador, self.request_timeout)
+        if estado != "ok":
+            mensaje, traza = resto
+            raise RuntimeError(f"{mensaje}\n\nTraza del proceso de predicción:\n{traza}")
+        return resto[0]
+
+    def _discard_process(self):
+        """Cerrar la tubería y terminar el proceso hijo, si existe."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(1.0)
+                if self._process.is_alive():
+                    # Un proceso colgado puede no atender la señal de terminación
+                    self._process.kill()
+            self._process.join(1.0)
+            self._process = None
+
+    def close(self):
+        """Pedir al proceso hijo que termine y liberar los recursos."""
+        if not self._lock.acquire(timeout=self.close_timeout):
+            # Hay una petición en curso que no termina: se termina el proceso y
+            # el hilo que la espera recibe WorkerCrashed y libera el cerrojo
+            proceso = self._process
+            if proceso is not None and proceso.is_alive():
+                proceso.kill()
+            return
+        try:
+            if self.running:
+                try:
+                    _send(self._conn, None)
+                    self._process.join(2.0)
+                except (BrokenPipeError, OSError):
+                    pass
+            self._discard_process()
+        finally:
+            self._lock.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Predicción
+    # ------------------------------------------------------------------
+
+    def predict_frame(self, entradas):
+        """
+        Evaluar un lote de elementos en el proceso hijo.
+
+        Args:
+            entradas (pd.DataFrame | list): Parámetros de entrada, una fila por elemento.
+
+        Returns:
+            pd.DataFrame: Resultados, una fila por elemento.
+        """
+        import pandas as pd
+
+        if not isinstance(entradas, pd.DataFrame):
+            entradas = pd.DataFrame(list(entradas))
+        return decode_frame(self._call("predict_frame", encode_frame(entradas.reset_index(drop=True))))
+
+    def predict_batch(self, params_list):
+        """
+        Evaluar una lista de diccionarios de parámetros en el proceso hijo.
+
+        Args:
+            params_list (list): Lista de diccionarios como los de PredictionModel.predict.
+
+        Returns:
+            list: Lista de diccionarios de resultados.
+        """
+        return self.predict_frame(params_list).to_dict('records')
+
+    def predict(self, params):
+        """
+        Evaluar un único elemento en el proceso hijo.
+
+        Args:
+            params (dict): Parámetros de entrada.
+
+        Returns:
+            dict: Diccionario con los resultados de la predicción.
+        """
+        return self._call("predict", dict(params))
+
+    def analyze_sensitivity(self, params):
+        """
+        Analizar la sensibilidad de la carga máxima en el proceso hijo.
+
+        Args:
+            params (dict): Parámetros de entrada del punto de diseño.
+
+        Returns:
+            dict: Resultados como los de sensitivity.analyze_sensitivity.
+        """
+        return self._call("analyze_sensitivity", dict(params))
@@ -0,0 +1,153 @@
+# Catálogo de perfiles comerciales (dimensiones nominales en mm)
+# Perfiles I/H/U: (altura, ancho de alas, espesor de alma, espesor de alas)
+# Perfiles tubulares: (dimensión exterior, espesor)
+
+_PERFILES_ABIERTOS = {
+    'IPE': {
+        'IPE 80': (80, 46, 3.8, 5.2),
+        'IPE 100': (100, 55, 4.1, 5.7),
+        'IPE 120': (120, 64, 4.4, 6.3),
+        'IPE 140': (140, 73, 4.7, 6.9),
+        'IPE 160': (160, 82, 5.0, 7.4),
+        'IPE 180': (180, 91, 5.3, 8.0),
+        'IPE 200': (200, 100, 5.6, 8.5),
+        'IPE 220': (220, 110, 5.9, 9.2),
+        'IPE 240': (240, 120, 6.2, 9.8),
+        'IPE 270': (270, 135, 6.6, 10.2),
+        'IPE 300': (300, 150, 7.1, 10.7),
+        'IPE 330': (330, 160, 7.5, 11.5),
+        'IPE 360': (360, 170, 8.0, 12.7),
+        'IPE 400': (400, 180, 8.6, 13.5),
+        'IPE 450': (450, 190, 9.4, 14.6),
+        'IPE 500': (500, 200, 10.2, 16.0),
+        'IPE 550': (550, 210, 11.1, 17.2),
+        'IPE 600': (600, 220, 12.0, 19.0)
+    },
+    'HEA': {
+        'HEA 100': (96, 100, 5.0, 8.0),
+        'HEA 120': (114, 120, 5.0, 8.0),
+        'HEA 140': (133, 140, 5.5, 8.5),
+        'HEA 160': (152, 160, 6.0, 9.0),
+        'HEA 180': (171, 180, 6.0, 9.5),
+        'HEA 200': (190, 200, 6.5, 10.0),
+        'HEA 220': (210, 220, 7.0, 11.0),
+        'HEA 240': (230, 240, 7.5, 12.0),
+        'HEA 260': (250, 260, 7.5, 12.5),
+        'HEA 280': (270, 280, 8.0, 13.0),
+        'HEA 300': (290, 300, 8.5, 14.0)
+    },
+    'HEB': {
+        'HEB 100': (100, 100, 6.0, 10.0),
+        'HEB 120': (120, 120, 6.5, 11.0),
+        'HEB 140': (140, 140, 7.0, 12.0),
+        'HEB 160': (160, 160, 8.0, 13.0),
+        'HEB 180': (180, 180, 8.5, 14.0),
+        'HEB 200': (200, 200, 9.0, 15.0),
+        'HEB 220': (220, 220, 9.5, 16.0),
+        'HEB 240': (240, 240, 10.0, 17.0),
+        'HEB 260': (260, 260, 10.0, 17.5),
+        'HEB 280': (280, 280, 10.5, 18.0),
+        'HEB 300': (300, 300, 11.0, 19.0)
+    },
+    'HEM': {
+        'HEM 100': (120, 106, 12.0, 20.0),
+        'HEM 120': (140, 126, 12.5, 21.0),
+        'HEM 140': (160, 146, 13.0, 22.0),
+        'HEM 160': (180, 166, 14.0, 23.0),
+        'HEM 180': (200, 186, 14.5, 24.0),
+        'HEM 200': (220, 206, 15.0, 25.0),
+        'HEM 220': (240, 226, 15.5, 26.0),
+        'HEM 240': (270, 248, 18.0, 32.0),
+        'HEM 260': (290, 268, 18.0, 32.5),
+        'HEM 280': (310, 288, 18.5, 33.0),
+        'HEM 300': (340, 310, 21.0, 39.0)
+    },
+    'UPN': {
+        'UPN 80': (80, 45, 6.0, 8.0),
+        'UPN 100': (100, 50, 6.0, 8.5),
+        'UPN 120': (120, 55, 7.0, 9.0),
+        'UPN 140': (140, 60, 7.0, 10.0),
+        'UPN 160': (160, 65, 7.5, 10.5),
+        'UPN 180': (180, 70, 8.0, 11.0),
+        'UPN 200': (200, 75, 8.5, 11.5),
+        'UPN 220': (220, 80, 9.0, 12.5),
+        'UPN 240': (240, 85, 9.5, 13.0),
+        'UPN 260': (260, 90, 10.0, 14.0),
+        'UPN 280': (280, 95, 10.0, 15.0),
+        'UPN 300': (300, 100, 10.0, 16.0)
+    }
+}
+
+_PERFILES_TUBULARES = {
+    'Tubular cuadrado': {
+        'SHS 60x4': (60, 4.0),
+        'SHS 80x5': (80, 5.0),
+        'SHS 100x5': (100, 5.0),
+        'SHS 100x8': (100, 8.0),
+        'SHS 120x6': (120, 6.0),
+        'SHS 150x8': (150, 8.0),
+        'SHS 200x10': (200, 10.0),
+        'SHS 250x10': (250, 10.0),
+        'SHS 300x12': (300, 12.0)
+    },
+    'Tubular circular': {
+        'CHS 60.3x4': (60.3, 4.0),
+        'CHS 88.9x5': (88.9, 5.0),
+        'CHS 114.3x6': (114.3, 6.0),
+        'CHS 139.7x8': (139.7, 8.0),
+        'CHS 168.3x8': (168.3, 8.0),
+        'CHS 219.1x10': (219.1, 10.0),
+        'CHS 273x10': (273.0, 10.0),
+        'CHS 323.9x12': (323.9, 12.0)
+    }
+}
+
+
+def catalog_sections():
+    """
+    Obtener la lista de perfiles del catálogo.
+
+    Returns:
+        list: Lista de tuplas (tipo_perfil, designacion) en orden estable.
+    """
+    secciones = []
+    for tipo_perfil, perfiles in list(_PERFILES_ABIERTOS.items()) + list(_PERFILES_TUBULARES.items()):
+        secciones.extend((tipo_perfil, designacion) for designacion in perfiles)
+    return secciones
+
+
+def load_profile_data(tipo_perfil, designacion):
+    """
+    Obtener las dimensiones de un perfil del catálogo.
+
+    Args:
+        tipo_perfil (str): Tipo de perfil (p. ej., 'IPE').
+        designacion (str): Designación comercial (p. ej., 'IPE 200').
+
+    Returns:
+        dict: Dimensiones con las claves de entrada del modelo, o None si el
+            perfil no está en el catálogo.
+    """
+    if tipo_perfil in _PERFILES_ABIERTOS:
+        dimensiones = _PERFILES_ABIERTOS[tipo_perfil].get(designacion)
+        if dimensiones is None:
+            return None
+        altura, ancho, espesor_alma, espesor_alas = dimensiones
+        return {
+            "altura_perfil_mm": float(altura),
+            "ancho_alas_mm": float(ancho),
+            "espesor_alma_mm": float(espesor_alma),
+            "espesor_alas_mm": float(espesor_alas)
+        }
+
+    if tipo_perfil in _PERFILES_TUBULARES:
+        dimensiones = _PERFILES_TUBULARES[tipo_perfil].get(designacion)
+        if dimensiones is None:
+            return None
+        dimension_exterior, espesor = dimensiones
+        return {
+            "dimension_exterior_mm": float(dimension_exterior),
+            "espesor_mm": float(espesor)
+        }
+
+    return None
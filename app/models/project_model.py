@@ -0,0 +1,226 @@
+import json
+import os
+import re
+from collections import OrderedDict
+
+import pandas as pd
+
+from app.models.batch_predictor import INPUT_COLUMNS, predict_frame, validate_rows
+
+# Versión del formato de archivo de proyecto
+PROJECT_FORMAT_VERSION = 1
+
+
+class ProjectModel:
+    """Proyecto con múltiples miembros, resultados en caché y recálculo incremental."""
+
+    def __init__(self, nombre="Proyecto"):
+        """
+        Inicializar un proyecto vacío.
+
+        Args:
+            nombre (str): Nombre del proyecto.
+        """
+        self.nombre = nombre
+
+        # Miembros: id -> {'inputs': dict, 'results': dict | None, 'dirty': bool, 'error': str | None}
+        self.members = OrderedDict()
+
+    def __len__(self):
+        return len(self.members)
+
+    def add_member(self, member_id, params):
+        """
+        Añadir un miembro al proyecto (queda pendiente de cálculo).
+
+        Args:
+            member_id (str): Identificador único del miembro.
+            params (dict): Parámetros de entrada como los de PredictionModel.predict.
+        """
+        if member_id in self.members:
+            raise ValueError(f"Ya existe un miembro con identificador {member_id}")
+
+        self.members[member_id] = {
+            'inputs': self._clean_inputs(params),
+            'results': None,
+            'dirty': True,
+            'error': None
+        }
+
+    def update_member(self, member_id, params):
+        """
+        Actualizar los parámetros de un miembro.
+
+        El miembro solo se marca como pendiente si sus entradas cambian.
+
+        Args:
+            member_id (str): Identificador del miembro.
+            params (dict): Parámetros a modificar (se combinan con los actuales).
+
+        Returns:
+            bool: True si el miembro ha quedado marcado como pendiente.
+        """
+        member = self.members[member_id]
+        inputs = dict(member['inputs'])
+        inputs.update(self._clean_inputs(params))
+
+        if inputs != member['inputs']:
+            member['inputs'] = inputs
+            member['dirty'] = True
+        return member['dirty']
+
+    def remove_member(self, member_id):
+        """Eliminar un miembro del proyecto."""
+        del self.members[member_id]
+
+    def mark_all_dirty(self):
+        """Marcar todos los miembros como pendientes (p. ej., tras cambiar de modelo)."""
+        for member in self.members.values():
+            member['dirty'] = True
+
+    def dirty_members(self):
+        """
+        Obtener los identificadores de los miembros pendientes de cálculo.
+
+        Returns:
+            list: Identificadores de los miembros marcados como pendientes.
+        """
+        return [member_id for member_id, member in self.members.items() if member['dirty']]
+
+    def recompute(self, model):
+        """
+        Recalcular únicamente los miembros pendientes con una llamada por lotes.
+
+        Las entradas no válidas se detectan antes de llamar al modelo: su
+        error se guarda en el miembro y el resto se evalúa en un único lote.
+
+        Args:
+            model: Modelo entrenado.
+
+        Returns:
+            int: Número de miembros recalculados.
+        """
+        pendientes = self.dirty_members()
+        if not pendientes:
+            return 0
+
+        entradas = pd.DataFrame([self.members[member_id]['inputs'] for member_id in pendientes])
+        filas_proyecto = {member_id: indice for indice, member_id in enumerate(self.members)}
+        validas = []
+        for posicion, (member_id, error) in enumerate(zip(pendientes, validate_rows(entradas))):
+            if error is None:
+                validas.append(posicion)
+            elif isinstance(error, KeyError):
+                self._store(member_id, None, f"Fila {filas_proyecto[member_id]}: falta el parámetro {error.args[0]}")
+            else:
+                mensaje = str(error)
+                self._store(member_id, None, f"Fila {filas_proyecto[member_id]}: {mensaje[0].lower()}{mensaje[1:]}")
+
+        if validas:
+            self._score(model, [pendientes[posicion] for posicion in validas], entradas.iloc[validas], filas_proyecto)
+        return len(pendientes)
+
+    def _score(self, model, member_ids, entradas, filas_proyecto):
+        """
+        Evaluar un lote de miembros y guardar sus resultados.
+
+        Si el lote falla por un error que la validación no detecta, se divide
+        por la mitad hasta aislar los miembros que lo causan.
+        """
+        try:
+            resultados = predict_frame(model, entradas).to_dict('records')
+        except ValueError as e:
+            if len(member_ids) == 1:
+                # El error de un lote de una fila dice "Fila 0": se sustituye por la fila del proyecto
+                mensaje = re.sub(r'^Fila \d+:', f"Fila {filas_proyecto[member_ids[0]]}:", str(e))
+                self._store(member_ids[0], None, mensaje)
+                return
+            mitad = len(member_ids) // 2
+            self._score(model, member_ids[:mitad], entradas.iloc[:mitad], filas_proyecto)
+            self._score(model, member_ids[mitad:], entradas.iloc[mitad:], filas_proyecto)
+            return
+
+        for member_id, results in zip(member_ids, resultados):
+            self._store(member_id, results, None)
+
+    def results_frame(self):
+        """
+        Obtener los resultados calculados de todos los miembros.
+
+        Returns:
+            pd.DataFrame: Una fila por miembro con resultados, indexada por id.
+        """
+        filas = {
+            member_id: member['results']
+            for member_id, member in self.members.items()
+            if member['results'] is not None
+        }
+        return pd.DataFrame.from_dict(filas, orient='index')
+
+    def save(self, file_path):
+        """
+        Guardar el proyecto, incluidos los resultados en caché, en un archivo JSON.
+
+        Args:
+            file_path (str): Ruta del archivo de proyecto.
+        """
+        directorio = os.path.dirname(file_path)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+
+        data = {
+            'version': PROJECT_FORMAT_VERSION,
+            'nombre': self.nombre,
+            'members': [
+                dict(id=member_id, **member)
+                for member_id, member in self.members.items()
+            ]
+        }
+
+        # Escribir en un archivo temporal y reemplazar para no dejar archivos a medias
+        tmp_path = file_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, file_path)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Cargar un proyecto guardado sin recalcular ningún miembro.
+
+        Args:
+            file_path (str): Ruta del archivo de proyecto.
+
+        Returns:
+            ProjectModel: Proyecto con sus resultados en caché.
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"El archivo de proyecto no existe: {file_path}")
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        project = cls(data.get('nombre', "Proyecto"))
+        for member in data.get('members', []):
+            project.members[member['id']] = {
+                'inputs': member['inputs'],
+                'results': member.get('results'),
+                'dirty': bool(member.get('dirty', member.get('results') is None)),
+                'error': member.get('error')
+            }
+        return project
+
+    def _store(self, member_id, results, error):
+        """Guardar el resultado de un miembro y limpiar su marca de pendiente."""
+        member = self.members[member_id]
+        member['results'] = results
+        member['error'] = error
+        member['dirty'] = False
+
+    @staticmethod
+    def _clean_inputs(params):
+        """Conservar solo los parámetros de entrada reconocidos por el modelo."""
+        return {
+            key: value for key, value in params.items()
+            if key in INPUT_COLUMNS or key == 'factor_longitud_efectiva'
+        }
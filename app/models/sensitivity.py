@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from app.models.batch_predictor import FACTORES_K, PROPIEDADES_ACERO, PERFILES_IH, predict_frame
+
+# Variaciones relativas aplicadas a cada parámetro numérico
+PASOS_RELATIVOS = (-0.10, -0.05, 0.05, 0.10)
+
+# Parámetros numéricos que se perturban (solo los presentes en la entrada)
+PARAMETROS_NUMERICOS = [
+    'longitud_mm', 'altura_perfil_mm', 'ancho_alas_mm', 'espesor_alma_mm',
+    'espesor_alas_mm', 'dimension_exterior_mm', 'espesor_mm'
+]
+
+# Alternativas de los parámetros categóricos
+ALTERNATIVAS_CATEGORICAS = {
+    'tipo_acero': list(PROPIEDADES_ACERO),
+    'condicion_apoyo': list(FACTORES_K)
+}
+
+# Nombres legibles para los gráficos
+ETIQUETAS = {
+    'longitud_mm': 'Longitud',
+    'altura_perfil_mm': 'Altura del Perfil',
+    'ancho_alas_mm': 'Ancho de Alas',
+    'espesor_alma_mm': 'Espesor de Alma',
+    'espesor_alas_mm': 'Espesor de Alas',
+    'dimension_exterior_mm': 'Dimensión Exterior',
+    'espesor_mm': 'Espesor',
+    'tipo_acero': 'Tipo de Acero',
+    'condicion_apoyo': 'Condición de Apoyo',
+    'tipo_perfil': 'Tipo de Perfil'
+}
+
+
+def build_variants(params, pasos=PASOS_RELATIVOS):
+    """
+    Construir todas las variantes perturbadas de un punto de diseño.
+
+    Args:
+        params (dict): Parámetros de entrada del punto de diseño.
+        pasos (tuple): Variaciones relativas para los parámetros numéricos.
+
+    Returns:
+        tuple: (DataFrame de entradas, lista de descriptores). La primera fila
+            es siempre el punto base; cada descriptor es (parámetro, valor, paso),
+            con paso None para las alternativas categóricas.
+    """
+    filas = [dict(params)]
+    descriptores = [(None, None, 0.0)]
+
+    # Parámetros numéricos: ± pasos relativos
+    for parametro in PARAMETROS_NUMERICOS:
+        valor = params.get(parametro)
+        if not valor:
+            continue
+        for paso in pasos:
+            fila = dict(params)
+            fila[parametro] = valor * (1 + paso)
+            filas.append(fila)
+            descriptores.append((parametro, fila[parametro], paso))
+
+    # Parámetros categóricos: todas las alternativas al valor actual
+    alternativas = dict(ALTERNATIVAS_CATEGORICAS)
+    if params.get('tipo_perfil') in PERFILES_IH:
+        # Los perfiles I/H comparten dimensiones, por lo que son intercambiables
+        alternativas['tipo_perfil'] = PERFILES_IH
+    for parametro, valores in alternativas.items():
+        for valor in valores:
+            if valor == params.get(parametro):
+                continue
+            fila = dict(params)
+            fila[parametro] = valor
+            filas.append(fila)
+            descriptores.append((parametro, valor, None))
+
+    return pd.DataFrame(filas), descriptores
+
+
+def analyze_sensitivity(model, params, pasos=PASOS_RELATIVOS):
+    """
+    Analizar la sensibilidad de la carga máxima respecto a cada parámetro.
+
+    Todas las variantes se evalúan en una única llamada al modelo.
+
+    Args:
+        model: Modelo entrenado.
+        params (dict): Parámetros de entrada del punto de diseño.
+        pasos (tuple): Variaciones relativas para los parámetros numéricos.
+
+    Returns:
+        dict: Resultados del análisis con las claves:
+            - carga_base_kN: Carga máxima del punto base.
+            - elasticidades: {parámetro: elasticidad} de los parámetros numéricos,
+              estimada por diferencias centradas con el paso más pequeño.
+            - tornado: Lista de (etiqueta, carga mínima, carga máxima) ordenada
+              de mayor a menor rango.
+            - variantes: DataFrame con cada variante y su carga máxima.
+    """
+    entradas, descriptores = build_variants(params, pasos)
+    cargas = predict_frame(model, entradas)['carga_maxima_kN'].to_numpy(dtype=float)
+    carga_base = float(cargas[0])
+
+    variantes = pd.DataFrame(descriptores, columns=['parametro', 'valor', 'paso'])
+    variantes['carga_maxima_kN'] = cargas
+    variantes = variantes.iloc[1:].reset_index(drop=True)
+
+    # Elasticidades: dln(P)/dln(x) con el paso simétrico más pequeño
+    elasticidades = {}
+    paso_min = min(abs(p) for p in pasos)
+    numericas = variantes[variantes['paso'].notna()]
+    for parametro, grupo in numericas.groupby('parametro', sort=False):
+        arriba = grupo[np.isclose(grupo['paso'].astype(float), paso_min)]
+        abajo = grupo[np.isclose(grupo['paso'].astype(float), -paso_min)]
+        if arriba.empty or abajo.empty or carga_base == 0:
+            continue
+        diferencia = float(arriba['carga_maxima_kN'].iloc[0] - abajo['carga_maxima_kN'].iloc[0])
+        elasticidades[parametro] = diferencia / (2 * paso_min * carga_base)
+
+    # Datos del diagrama de tornado: rango de carga por parámetro
+    tornado = []
+    for parametro, grupo in variantes.groupby('parametro', sort=False):
+        cargas_parametro = np.append(grupo['carga_maxima_kN'].to_numpy(dtype=float), carga_base)
+        tornado.append((ETIQUETAS.get(parametro, parametro),
+                        float(cargas_parametro.min()),
+                        float(cargas_parametro.max())))
+    tornado.sort(key=lambda fila: fila[2] - fila[1], reverse=True)
+
+    return {
+        'carga_base_kN': carga_base,
+        'elasticidades': elasticidades,
+        'tornado': tornado,
+        'variantes': variantes
+    }
@@ -0,0 +1,168 @@
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+# Tamaño de bloque por defecto (filas)
+DEFAULT_CHUNK_SIZE = 100000
+
+
+def _file_format(path):
+    """Deducir el formato de un archivo por su extensión."""
+    extension = os.path.splitext(str(path))[1].lower()
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    if extension in (".ndjson", ".jsonl"):
+        return "ndjson"
+    return "csv"
+
+
+def iter_input_chunks(input_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Leer un archivo de miembros por bloques de tamaño fijo.
+
+    Args:
+        input_path (str): Archivo CSV, NDJSON o Parquet ('-' para CSV por stdin).
+        chunk_size (int): Número de filas por bloque.
+
+    Yields:
+        pd.DataFrame: Bloques de entrada consecutivos.
+    """
+    if input_path == "-":
+        yield from pd.read_csv(sys.stdin, chunksize=chunk_size)
+        return
+
+    formato = _file_format(input_path)
+    if formato == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(input_path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif formato == "ndjson":
+        yield from pd.read_json(input_path, lines=True, chunksize=chunk_size)
+    else:
+        yield from pd.read_csv(input_path, chunksize=chunk_size)
+
+
+class ChunkWriter:
+    """Escritor incremental de resultados en CSV, NDJSON o Parquet."""
+
+    def __init__(self, output_path):
+        """
+        Abrir el archivo de salida.
+
+        Args:
+            output_path (str): Archivo de salida ('-' para CSV por stdout).
+        """
+        self.output_path = output_path
+        self.formato = "csv" if output_path == "-" else _file_format(output_path)
+        self._stream = None
+        self._parquet_writer = None
+        self._header_written = False
+
+    def write(self, frame):
+        """Añadir un bloque de resultados al archivo de salida."""
+        if self.formato == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet_writer is None:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                self._parquet_writer = pq.ParquetWriter(self.output_path, table.schema)
+            else:
+                table = pa.Table.from_pandas(frame, schema=self._parquet_writer.schema, preserve_index=False)
+            self._parquet_writer.write_table(table)
+            return
+
+        if self._stream is None:
+            if self.output_path == "-":
+                self._stream = sys.stdout
+            else:
+                self._stream = open(self.output_path, "w", encoding="utf-8", newline="")
+
+        if self.formato == "ndjson":
+            registros = frame.astype(object).where(frame.notna(), None).to_dict("records")
+            self._stream.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in registros))
+        else:
+            frame.to_csv(self._stream, index=False, header=not self._header_written)
+            self._header_written = True
+        self._stream.flush()
+
+    def close(self):
+        """Cerrar el archivo de salida."""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self._stream is not None and self._stream is not sys.stdout:
+            self._stream.close()
+        self._stream = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def score_chunk(predictor, entradas):
+    """
+    Puntuar un bloque conservando las columnas que no son entradas del modelo.
+
+    Args:
+        predictor (BatchPredictor): Motor de predicción.
+        entradas (pd.DataFrame): Bloque de entrada.
+
+    Returns:
+        pd.DataFrame: Columnas de identificación seguidas de los resultados.
+    """
+    entradas = entradas.reset_index(drop=True)
+    results = predictor.predict_frame(entradas)
+    extra = [c for c in entradas.columns if c not in results.columns]
+    if extra:
+        results = pd.concat([entradas[extra], results], axis=1)
+    return results
+
+
+def score_stream(predictor, input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Puntuar un archivo de miembros en streaming, bloque a bloque.
+
+    Cada bloque se lee, se puntúa con una llamada por lotes y se añade a la
+    salida antes de leer el siguiente, por lo que el consumo de memoria solo
+    depende del tamaño de bloque y no del tamaño del archivo.
+
+    Args:
+        predictor (BatchPredictor): Motor de predicción.
+        input_path (str): Archivo de entrada (CSV, NDJSON o Parquet).
+        output_path (str): Archivo de salida (CSV, NDJSON o Parquet).
+        chunk_size (int): Número de filas por bloque.
+        progress (callable, opcional): Función llamada tras cada bloque con
+            (filas procesadas, segundos transcurridos, filas por segundo).
+
+    Returns:
+        dict: Estadísticas con filas, bloques, segundos y filas_por_s.
+    """
+    inicio = time.perf_counter()
+    filas = 0
+    bloques = 0
+
+    with ChunkWriter(output_path) as writer:
+        for entradas in iter_input_chunks(input_path, chunk_size):
+            writer.write(score_chunk(predictor, entradas))
+            filas += len(entradas)
+            bloques += 1
+
+            if progress is not None:
+                transcurrido = time.perf_counter() - inicio
+                progress(filas, transcurrido, filas / transcurrido if transcurrido > 0 else 0.0)
+
+    segundos = time.perf_counter() - inicio
+    return {
+        'filas': filas,
+        'bloques': bloques,
+        'segundos': segundos,
+        'filas_por_s': filas / segundos if segundos > 0 else 0.0
+    }
@@ -0,0 +1,545 @@
+"""Servicio HTTP local de inferencia basado en asyncio (solo biblioteca estándar).
+
+Rutas:
+    GET  /health   Estado del servicio.
+    GET  /metrics  Métricas en formato de texto de Prometheus.
+    POST /predict  Un elemento (objeto JSON). Las peticiones concurrentes se
+                   agrupan en una sola llamada al modelo (micro-lotes).
+    POST /batch    Lista de elementos (array JSON), evaluada en una llamada.
+    POST /batch/stream
+                   Elementos en NDJSON (un objeto por línea); los resultados se
+                   devuelven en NDJSON bloque a bloque, a medida que se puntúan.
+
+Control de admisión: la cola de peticiones está acotada; si se llena, la
+petición se rechaza de inmediato con 503 y una cabecera Retry-After. Cada
+petición tiene un plazo (cabecera X-Deadline-Ms o el plazo por defecto del
+servicio); si vence antes de evaluarse se descarta y se responde 504.
+"""
+import asyncio
+import io
+import json
+import math
+import time
+from functools import partial
+from urllib.parse import parse_qs
+
+import pandas as pd
+
+from app.service.micro_batcher import (
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_MAX_PENDING_BATCHES,
+    DEFAULT_MAX_QUEUE,
+    DEFAULT_MAX_WAIT_MS,
+    DEFAULT_TIMEOUT_MS,
+    DeadlineExceeded,
+    MicroBatcher,
+    Overloaded
+)
+from app.models.streaming_scorer import score_chunk
+from app.utils import metrics
+
+# Límites de tamaño de la petición
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+# Streaming NDJSON: filas por bloque y búfer de escritura máximo por conexión.
+# Con el búfer lleno se deja de leer la entrada hasta que el cliente consuma
+# la salida, de modo que un cliente lento frena al servidor (TCP hace el resto)
+STREAM_CHUNK_SIZE = 5000
+STREAM_WRITE_BUFFER_BYTES = 256 * 1024
+
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout"
+}
+
+
+class HttpError(Exception):
+    """Error que se devuelve al cliente con un código de estado HTTP."""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+def _score_ndjson(predictor, lineas):
+    """Decodificar, puntuar y serializar un bloque NDJSON (en el hilo del modelo)."""
+    entradas = pd.read_json(io.BytesIO(b"".join(lineas)), lines=True, orient="records")
+    return score_chunk(predictor, entradas).to_json(orient="records", lines=True, force_ascii=False)
+
+
+def _clean_json(value):
+    """Sustituir NaN/inf por null para producir JSON válido."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _clean_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clean_json(v) for v in value]
+    return value
+
+
+class Request:
+    """Petición HTTP ya analizada (línea de petición y cabeceras)."""
+
+    def __init__(self, method, target, headers, reader, writer):
+        self.method = method
+        self.path, _, query = target.partition("?")
+        self.query = {k: v[-1] for k, v in parse_qs(query).items()}
+        self.headers = headers
+        self.reader = reader
+        self.writer = writer
+        # Estado de las respuestas que escribe el propio manejador (streaming)
+        self.status = 200
+        # Lectura del cuerpo: si no se ha leído entero, hay que descartarlo
+        # antes de reutilizar la conexión (ver InferenceServer._discard_body)
+        self.body_started = False
+        self.body_consumed = False
+
+    @property
+    def keep_alive(self):
+        return self.headers.get("connection", "").lower() != "close"
+
+    @property
+    def chunked(self):
+        return "chunked" in self.headers.get("transfer-encoding", "").lower()
+
+    @property
+    def content_length(self):
+        """Longitud del cuerpo según Content-Length (0 si no se indica)."""
+        valor = self.headers.get("content-length", "0") or "0"
+        try:
+            longitud = int(valor)
+        except ValueError:
+            raise HttpError(400, f"Content-Length no válido: {valor}")
+        if longitud < 0:
+            raise HttpError(400, f"Content-Length no válido: {valor}")
+        return longitud
+
+    async def iter_body(self):
+        """Leer el cuerpo por fragmentos (Content-Length o Transfer-Encoding: chunked)."""
+        restante = 0 if self.chunked else self.content_length
+        self.body_started = True
+        if self.chunked:
+            while True:
+                linea = await self.reader.readuntil(b"\r\n")
+                try:
+                    tamano = int(linea.split(b";", 1)[0], 16)
+                except ValueError:
+                    raise HttpError(400, "Fragmento chunked no válido")
+                if tamano == 0:
+                    # Cabeceras finales opcionales hasta la línea vacía
+                    while await self.reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+                    self.body_consumed = True
+                    return
+                yield await self.reader.readexactly(tamano)
+                await self.reader.readexactly(2)
+        else:
+            while restante > 0:
+                fragmento = await self.reader.read(min(restante, 64 * 1024))
+                if not fragmento:
+                    raise asyncio.IncompleteReadError(b"", restante)
+                restante -= len(fragmento)
+                yield fragmento
+            self.body_consumed = True
+
+    async def iter_lines(self):
+        """Leer el cuerpo línea a línea, ignorando las líneas vacías."""
+        pendiente = b""
+        async for fragmento in self.iter_body():
+            lineas = (pendiente + fragmento).split(b"\n")
+            pendiente = lineas.pop()
+            for linea in lineas:
+                if linea.strip():
+                    yield linea + b"\n"
+        if pendiente.strip():
+            yield pendiente + b"\n"
+
+    async def read_body(self):
+        """Leer el cuerpo completo de la petición (Content-Length)."""
+        if self.chunked:
+            raise HttpError(400, "Transfer-Encoding chunked solo se admite en /batch/stream")
+        longitud = self.content_length
+        if longitud > MAX_BODY_BYTES:
+            raise HttpError(413, "El cuerpo de la petición es demasiado grande")
+        self.body_started = True
+        cuerpo = await self.reader.readexactly(longitud) if longitud else b""
+        self.body_consumed = True
+        return cuerpo
+
+    def timeout_ms(self, default):
+        """Plazo de la petición en ms (cabecera X-Deadline-Ms o valor por defecto)."""
+        valor = self.headers.get("x-deadline-ms")
+        if valor is None:
+            return default
+        try:
+            timeout = float(valor)
+        except ValueError:
+            raise HttpError(400, f"X-Deadline-Ms no válido: {valor}")
+        if timeout <= 0:
+            raise HttpError(400, "X-Deadline-Ms debe ser positivo")
+        return timeout
+
+    async def read_json(self):
+        """Leer y decodificar el cuerpo JSON de la petición."""
+        try:
+            return json.loads(await self.read_body() or b"null")
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise HttpError(400, f"JSON no válido: {str(e)}")
+
+
+class InferenceServer:
+    """Servidor HTTP asyncio que expone el modelo de predicción."""
+
+    def __init__(self, predictor, host="127.0.0.1", port=8765,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_queue=DEFAULT_MAX_QUEUE, max_pending_batches=DEFAULT_MAX_PENDING_BATCHES,
+                 timeout_ms=DEFAULT_TIMEOUT_MS):
+        """
+        Inicializar el servidor.
+
+        Args:
+            predictor (BatchPredictor): Motor de predicción.
+            host (str): Dirección de escucha (solo local por defecto).
+            port (int): Puerto de escucha (0 para uno libre).
+            max_wait_ms (float): Ventana de agrupación de peticiones individuales.
+            max_batch_size (int): Tamaño máximo de cada micro-lote.
+            max_queue (int): Peticiones individuales admitidas en cola.
+            max_pending_batches (int): Lotes completos admitidos a la vez.
+            timeout_ms (float): Plazo por defecto de cada petición.
+        """
+        self.predictor = predictor
+        self.host = host
+        self.port = port
+        self.timeout_ms = timeout_ms
+        self.batcher = MicroBatcher(predictor, max_wait_ms, max_batch_size, max_queue, max_pending_batches)
+        self._server = None
+
+        self.routes = {
+            ("GET", "/health"): self.handle_health,
+            ("GET", "/metrics"): self.handle_metrics,
+            ("POST", "/predict"): self.handle_predict,
+            ("POST", "/batch"): self.handle_batch,
+            ("POST", "/batch/stream"): self.handle_batch_stream
+        }
+
+    async def start(self):
+        """Arrancar el servidor y el agrupador de peticiones."""
+        await self.batcher.start()
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        # Puerto real cuando se solicita uno libre
+        self.port = self._server.sockets[0].getsockname()[1]
+        metrics.PROFUNDIDAD_COLA.set_function(lambda: self.batcher.queue_depth)
+
+    async def stop(self):
+        """Detener el servidor."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+
+    async def serve_forever(self):
+        """Arrancar el servidor y atender peticiones hasta que se cancele."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    # ------------------------------------------------------------------
+    # Rutas
+    # ------------------------------------------------------------------
+
+    async def handle_health(self, request):
+        return 200, {
+            "estado": "ok",
+            "modelo": self.predictor.model_path,
+            "cola": self.batcher.queue_depth,
+            "capacidad_cola": self.batcher.max_queue,
+            "lotes_en_espera": self.batcher.pending_batches,
+            "rechazadas": self.batcher.rechazadas,
+            "expiradas": self.batcher.expiradas
+        }
+
+    async def handle_metrics(self, request):
+        body = metrics.REGISTRY.render_prometheus().encode("utf-8")
+        self._write_head(request.writer, 200, "text/plain; version=0.0.4", len(body), request.keep_alive)
+        request.writer.write(body)
+        await request.writer.drain()
+        return None
+
+    async def handle_predict(self, request):
+        # El cuerpo se lee antes de validar las cabeceras para dejar la
+        # conexión lista para la siguiente petición aunque falle la validación
+        params = await request.read_json()
+        timeout_ms = request.timeout_ms(self.timeout_ms)
+        if not isinstance(params, dict):
+            raise HttpError(400, "Se esperaba un objeto JSON con los parámetros del elemento")
+        return 200, await self.batcher.submit(params, timeout_ms)
+
+    async def handle_batch(self, request):
+        miembros = await request.read_json()
+        timeout_ms = request.timeout_ms(None)
+        if isinstance(miembros, dict):
+            miembros = miembros.get("miembros")
+        if not isinstance(miembros, list) or not all(isinstance(m, dict) for m in miembros):
+            raise HttpError(400, "Se esperaba un array JSON de objetos con los parámetros de cada elemento")
+        resultados = await self.batcher.run_batch(miembros, timeout_ms)
+        return 200, resultados.to_dict('records')
+
+    async def handle_batch_stream(self, request):
+        """
+        Puntuar NDJSON en streaming.
+
+        Mientras el modelo puntúa un bloque se lee el siguiente; cada bloque
+        puntuado se escribe como un fragmento chunked y se espera a que el
+        búfer de salida se vacíe antes de seguir leyendo.
+        """
+        try:
+            chunk_size = int(request.query.get("chunk_size", STREAM_CHUNK_SIZE))
+        except ValueError:
+            raise HttpError(400, "chunk_size no válido")
+        if chunk_size <= 0:
+            raise HttpError(400, "chunk_size debe ser positivo")
+
+        writer = request.writer
+        score = partial(_score_ndjson, self.predictor)
+        cabecera_enviada = False
+        pendiente = None
+
+        async def enviar(tarea):
+            nonlocal cabecera_enviada
+            datos = (await tarea).encode("utf-8")
+            if not cabecera_enviada:
+                self._write_head(writer, 200, "application/x-ndjson", None, request.keep_alive)
+                cabecera_enviada = True
+            writer.write(f"{len(datos):x}\r\n".encode("latin-1") + datos + b"\r\n")
+            await writer.drain()
+
+        try:
+            bloque = []
+            async for linea in request.iter_lines():
+                bloque.append(linea)
+                if len(bloque) >= chunk_size:
+                    if pendiente is not None:
+                        await enviar(pendiente)
+                    pendiente = asyncio.ensure_future(self.batcher.run_batch(bloque, score=score))
+                    bloque = []
+            if bloque:
+                if pendiente is not None:
+                    await enviar(pendiente)
+                pendiente = asyncio.ensure_future(self.batcher.run_batch(bloque, score=score))
+            if pendiente is not None:
+                await enviar(pendiente)
+                pendiente = None
+        except (ValueError, KeyError, HttpError, Overloaded) as e:
+            # El resto del cuerpo no se ha leído: la conexión no puede reutilizarse
+            request.headers["connection"] = "close"
+            if isinstance(e, (ValueError, KeyError)):
+                e = HttpError(400, f"Bloque no válido: {str(e)}")
+            if not cabecera_enviada:
+                raise e
+            # La respuesta ya está en curso: se informa del error en la última línea
+            error = json.dumps({"error": str(e)}, ensure_ascii=False) + "\n"
+            datos = error.encode("utf-8")
+            writer.write(f"{len(datos):x}\r\n".encode("latin-1") + datos + b"\r\n0\r\n\r\n")
+            await writer.drain()
+            return None
+        finally:
+            if pendiente is not None:
+                pendiente.cancel()
+
+        if not cabecera_enviada:
+            self._write_head(writer, 200, "application/x-ndjson", None, request.keep_alive)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return None
+
+    # ------------------------------------------------------------------
+    # Protocolo HTTP/1.1 mínimo
+    # ------------------------------------------------------------------
+
+    async def _read_request(self, reader, writer):
+        """Leer la línea de petición y las cabeceras. Devuelve None al cerrar la conexión."""
+        try:
+            cabecera = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(413, "Cabeceras demasiado grandes")
+
+        lineas = cabecera.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lineas[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Línea de petición no válida")
+
+        headers = {}
+        for linea in lineas[1:]:
+            if ":" in linea:
+                nombre, valor = linea.split(":", 1)
+                headers[nombre.strip().lower()] = valor.strip()
+
+        return Request(method.upper(), target, headers, reader, writer)
+
+    def _write_head(self, writer, status, content_type, content_length, keep_alive, headers=None):
+        """Escribir la línea de estado y las cabeceras (chunked si no hay longitud)."""
+        lineas = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+            f"Content-Type: {content_type}; charset=utf-8",
+            f"Content-Length: {content_length}" if content_length is not None else "Transfer-Encoding: chunked",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ]
+        lineas.extend(f"{nombre}: {valor}" for nombre, valor in (headers or {}).items())
+        writer.write(("\r\n".join(lineas) + "\r\n\r\n").encode("latin-1"))
+
+    async def _write_response(self, writer, status, payload, keep_alive, headers=None):
+        """Escribir una respuesta JSON completa."""
+        body = json.dumps(_clean_json(payload), ensure_ascii=False).encode("utf-8")
+        self._write_head(writer, status, "application/json", len(body), keep_alive, headers)
+        writer.write(body)
+        await writer.drain()
+
+    async def _discard_body(self, request):
+        """
+        Descartar el cuerpo que el manejador no ha leído.
+
+        Si una petición falla antes de leer su cuerpo, sus bytes se tomarían
+        como la siguiente petición de la conexión. El cuerpo se descarta si su
+        tamaño es conocido y admisible; si no, la conexión debe cerrarse.
+
+        Returns:
+            bool: True si la conexión puede reutilizarse.
+        """
+        if request.body_consumed:
+            return True
+        if request.body_started or request.chunked:
+            return False
+        try:
+            longitud = request.content_length
+        except HttpError:
+            return False
+        if longitud > MAX_BODY_BYTES:
+            return False
+        try:
+            await request.reader.readexactly(longitud)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return False
+        request.body_consumed = True
+        return True
+
+    async def _write_error(self, writer, request, status, payload, headers=None):
+        """
+        Responder con un error, descartando antes el cuerpo no leído.
+
+        Returns:
+            bool: True si la conexión puede reutilizarse.
+        """
+        keep_alive = request is not None and request.keep_alive and await self._discard_body(request)
+        await self._write_response(writer, status, payload, keep_alive, headers)
+        return keep_alive
+
+    async def _dispatch(self, request):
+        """Encaminar una petición a su manejador."""
+        handler = self.routes.get((request.method, request.path))
+        if handler is None:
+            if any(path == request.path for _, path in self.routes):
+                raise HttpError(405, f"Método {request.method} no permitido en {request.path}")
+            raise HttpError(404, f"Ruta no encontrada: {request.path}")
+        return await handler(request)
+
+    async def _handle_connection(self, reader, writer):
+        """Atender las peticiones de una conexión (con keep-alive)."""
+        writer.transport.set_write_buffer_limits(high=STREAM_WRITE_BUFFER_BYTES)
+        try:
+            while True:
+                request = None
+                keep_alive = False
+                status = 500
+                try:
+                    request = await self._read_request(reader, writer)
+                    if request is None:
+                        break
+                    inicio = time.perf_counter()
+                    keep_alive = request.keep_alive
+                    respuesta = await self._dispatch(request)
+                    # Los manejadores en streaming escriben su propia respuesta
+                    if respuesta is not None:
+                        status, payload = respuesta
+                        keep_alive = keep_alive and await self._discard_body(request)
+                        await self._write_response(writer, status, payload, keep_alive)
+                    else:
+                        status = request.status
+                    keep_alive = keep_alive and request.keep_alive
+                except HttpError as e:
+                    status = e.status
+                    keep_alive = await self._write_error(writer, request, e.status, {"error": e.message}, e.headers)
+                except Overloaded as e:
+                    status = 503
+                    keep_alive = await self._write_error(
+                        writer, request, 503, {"error": str(e)}, {"Retry-After": e.retry_after}
+                    )
+                except DeadlineExceeded as e:
+                    status = 504
+                    keep_alive = await self._write_error(writer, request, 504, {"error": str(e)})
+                except ValueError as e:
+                    status = 400
+                    keep_alive = await self._write_error(writer, request, 400, {"error": str(e)})
+                except KeyError as e:
+                    status = 400
+                    keep_alive = await self._write_error(writer, request, 400, {"error": f"Falta el parámetro {str(e)}"})
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    break
+                except Exception as e:
+                    print(f"Error en el servicio de inferencia: {str(e)}")
+                    await self._write_response(writer, 500, {"error": "Error interno del servidor"}, False)
+                    keep_alive = False
+                finally:
+                    if request is not None:
+                        self._observe(request, status, inicio)
+
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def _observe(self, request, status, inicio):
+        """Registrar la petición en las métricas del servicio."""
+        # Las rutas desconocidas se agrupan para acotar el número de series
+        ruta = request.path if any(path == request.path for _, path in self.routes) else "otra"
+        metrics.PETICIONES.labels(ruta, status).inc()
+        metrics.LATENCIA_PETICION.labels(ruta).observe(time.perf_counter() - inicio)
+
+
+def run_server(predictor, host="127.0.0.1", port=8765, **opciones):
+    """
+    Ejecutar el servicio de inferencia hasta que se interrumpa.
+
+    Args:
+        predictor (BatchPredictor): Motor de predicción.
+        host (str): Dirección de escucha.
+        port (int): Puerto de escucha.
+        **opciones: Opciones de InferenceServer (max_wait_ms, max_batch_size,
+            max_queue, max_pending_batches, timeout_ms).
+    """
+    server = InferenceServer(predictor, host, port, **opciones)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
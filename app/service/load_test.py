@@ -0,0 +1,125 @@
+import asyncio
+import json
+import time
+
+import numpy as np
+
+
+async def _http_request(reader, writer, host, method, path, payload=None, deadline_ms=None):
+    """Enviar una petición HTTP/1.1 por una conexión abierta y leer la respuesta."""
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    cabecera = (
+        f"{method} {path} HTTP/1.1\r\n"
+        f"Host: {host}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        + (f"X-Deadline-Ms: {deadline_ms}\r\n" if deadline_ms is not None else "")
+        + "Connection: keep-alive\r\n\r\n"
+    )
+    writer.write(cabecera.encode("latin-1") + body)
+    await writer.drain()
+
+    respuesta = await reader.readuntil(b"\r\n\r\n")
+    lineas = respuesta.decode("latin-1").split("\r\n")
+    status = int(lineas[0].split(" ", 2)[1])
+    headers = {}
+    for linea in lineas[1:]:
+        if ":" in linea:
+            nombre, valor = linea.split(":", 1)
+            headers[nombre.strip().lower()] = valor.strip()
+    contenido = await reader.readexactly(int(headers.get("content-length", "0")))
+    return status, headers, contenido
+
+
+async def _client(host, port, path, payloads, indice, fin, latencias, estados, deadline_ms):
+    """Cliente con conexión persistente que envía peticiones hasta el instante final."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < fin:
+            payload = payloads[indice % len(payloads)]
+            indice += 1
+            inicio = time.perf_counter()
+            status, _, _ = await _http_request(reader, writer, host, "POST", path, payload, deadline_ms)
+            estados[status] = estados.get(status, 0) + 1
+            # Las latencias solo incluyen respuestas correctas; los rechazos
+            # (503) y plazos vencidos (504) se cuentan aparte
+            if status == 200:
+                latencias.append(time.perf_counter() - inicio)
+    finally:
+        writer.close()
+
+
+async def run_load_test(host, port, payloads, concurrency=32, duration=10.0, path="/predict", deadline_ms=None):
+    """
+    Generar carga concurrente contra el servicio de inferencia.
+
+    Args:
+        host (str): Dirección del servicio.
+        port (int): Puerto del servicio.
+        payloads (list): Cuerpos JSON que se envían de forma cíclica.
+        concurrency (int): Número de clientes simultáneos.
+        duration (float): Duración de la prueba en segundos.
+        path (str): Ruta a la que se envían las peticiones.
+        deadline_ms (float, opcional): Plazo enviado en la cabecera X-Deadline-Ms.
+
+    Returns:
+        dict: Peticiones, peticiones por segundo, latencias p50/p95/p99 en ms
+            de las respuestas correctas y recuento por código de estado.
+    """
+    latencias = []
+    estados = {}
+    inicio = time.perf_counter()
+    fin = inicio + duration
+
+    await asyncio.gather(*[
+        _client(host, port, path, payloads, i, fin, latencias, estados, deadline_ms)
+        for i in range(concurrency)
+    ])
+    segundos = time.perf_counter() - inicio
+
+    ms = np.array(latencias) * 1000 if latencias else np.zeros(1)
+    return {
+        "concurrencia": concurrency,
+        "peticiones": sum(estados.values()),
+        "correctas": len(latencias),
+        "segundos": segundos,
+        "peticiones_por_s": len(latencias) / segundos,
+        "latencia_media_ms": float(ms.mean()),
+        "latencia_p50_ms": float(np.percentile(ms, 50)),
+        "latencia_p95_ms": float(np.percentile(ms, 95)),
+        "latencia_p99_ms": float(np.percentile(ms, 99)),
+        "latencia_max_ms": float(ms.max()),
+        "estados": {str(k): v for k, v in sorted(estados.items())}
+    }
+
+
+async def run_local_load_test(predictor, payloads, concurrency=32, duration=10.0, deadline_ms=None, **opciones):
+    """
+    Arrancar el servicio en un puerto libre de localhost y medirlo.
+
+    Args:
+        predictor (BatchPredictor): Motor de predicción.
+        payloads (list): Cuerpos JSON que se envían de forma cíclica.
+        concurrency (int): Número de clientes simultáneos.
+        duration (float): Duración de la prueba en segundos.
+        deadline_ms (float, opcional): Plazo enviado en cada petición.
+        **opciones: Opciones de InferenceServer (max_wait_ms, max_queue, ...).
+
+    Returns:
+        dict: Resultados de la prueba de carga.
+    """
+    from app.service.inference_server import InferenceServer
+
+    server = InferenceServer(predictor, "127.0.0.1", 0, **opciones)
+    await server.start()
+    try:
+        # Calentamiento del modelo antes de medir
+        await server.batcher.run_batch(payloads[:1])
+        informe = await run_load_test(
+            "127.0.0.1", server.port, payloads, concurrency, duration, deadline_ms=deadline_ms
+        )
+        informe["rechazadas"] = server.batcher.rechazadas
+        informe["expiradas"] = server.batcher.expiradas
+        return informe
+    finally:
+        await server.stop()
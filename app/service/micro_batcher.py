@@ -0,0 +1,261 @@
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from app.models.batch_predictor import validate_rows
+from app.utils import metrics
+
+# Ventana de agrupación por defecto (ms) y tamaño máximo de lote
+DEFAULT_MAX_WAIT_MS = 5.0
+DEFAULT_MAX_BATCH_SIZE = 1024
+
+# Control de admisión: peticiones individuales en cola, lotes completos en
+# espera y plazo por defecto de cada petición (ms)
+DEFAULT_MAX_QUEUE = 4096
+DEFAULT_MAX_PENDING_BATCHES = 4
+DEFAULT_TIMEOUT_MS = 1000.0
+
+
+class Overloaded(Exception):
+    """El servicio está saturado y rechaza la petición sin encolarla."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(Exception):
+    """El plazo de la petición venció antes de obtener el resultado."""
+
+
+class MicroBatcher:
+    """Agrupa peticiones individuales concurrentes en una sola llamada al modelo."""
+
+    def __init__(self, predictor, max_wait_ms=DEFAULT_MAX_WAIT_MS, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_queue=DEFAULT_MAX_QUEUE, max_pending_batches=DEFAULT_MAX_PENDING_BATCHES):
+        """
+        Inicializar el agrupador.
+
+        Args:
+            predictor (BatchPredictor): Motor de predicción.
+            max_wait_ms (float): Tiempo máximo que se espera a más peticiones
+                desde la llegada de la primera de un lote.
+            max_batch_size (int): Número máximo de filas por llamada al modelo.
+            max_queue (int): Peticiones individuales que admite la cola; por
+                encima se rechazan de inmediato.
+            max_pending_batches (int): Lotes completos admitidos a la vez.
+        """
+        self.predictor = predictor
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max_batch_size
+        self.max_queue = max_queue
+        self.max_pending_batches = max_pending_batches
+
+        # Filas por segundo observadas (media móvil) para estimar Retry-After
+        self.filas_por_s = None
+        self.pending_batches = 0
+        self.rechazadas = 0
+        self.expiradas = 0
+
+        # Las llamadas al modelo se serializan en un hilo dedicado para no
+        # bloquear el bucle de eventos
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="modelo")
+
+        self._queue = None
+        self._task = None
+
+    async def start(self):
+        """Arrancar la tarea de agrupación en el bucle de eventos actual."""
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Detener la tarea de agrupación y el hilo del modelo."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.executor.shutdown(wait=False)
+
+    @property
+    def queue_depth(self):
+        """Peticiones individuales en espera."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def retry_after(self, filas=None):
+        """
+        Estimar en segundos cuándo volverá a haber capacidad.
+
+        Args:
+            filas (int, opcional): Filas pendientes (por defecto, la cola actual).
+
+        Returns:
+            int: Segundos de espera recomendados (al menos 1).
+        """
+        filas = self.queue_depth if filas is None else filas
+        if not self.filas_por_s:
+            return 1
+        return max(1, math.ceil(filas / self.filas_por_s))
+
+    def _reject(self, message, filas=None):
+        self.rechazadas += 1
+        metrics.RECHAZADAS.inc()
+        raise Overloaded(message, self.retry_after(filas))
+
+    async def _wait(self, future, timeout_ms):
+        """Esperar un resultado como mucho hasta el plazo de la petición."""
+        try:
+            return await asyncio.wait_for(future, None if timeout_ms is None else timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            # wait_for cancela el futuro: la petición se descarta sin evaluarla
+            self.expiradas += 1
+            metrics.EXPIRADAS.inc()
+            raise DeadlineExceeded(f"Plazo de {timeout_ms:.0f} ms vencido")
+
+    async def submit(self, params, timeout_ms=DEFAULT_TIMEOUT_MS):
+        """
+        Encolar una petición individual y esperar su resultado.
+
+        Args:
+            params (dict): Parámetros de entrada de un elemento.
+            timeout_ms (float, opcional): Plazo de la petición (None sin plazo).
+
+        Returns:
+            dict: Resultados de la predicción.
+
+        Raises:
+            Overloaded: Si la cola está llena.
+            DeadlineExceeded: Si el plazo vence antes del resultado.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        deadline = None if timeout_ms is None else loop.time() + timeout_ms / 1000
+        try:
+            self._queue.put_nowait((params, future, deadline))
+        except asyncio.QueueFull:
+            self._reject("Cola de peticiones llena")
+        return await self._wait(future, timeout_ms)
+
+    async def run_batch(self, entradas, timeout_ms=None, score=None):
+        """
+        Evaluar un lote completo en el hilo del modelo.
+
+        Args:
+            entradas (pd.DataFrame | list): Parámetros de entrada.
+            timeout_ms (float, opcional): Plazo del lote (None sin plazo).
+            score (callable, opcional): Función de puntuación que se ejecuta en
+                el hilo del modelo (por defecto, predictor.predict_frame).
+
+        Returns:
+            pd.DataFrame: Resultados de la predicción.
+
+        Raises:
+            Overloaded: Si ya hay demasiados lotes en espera.
+            DeadlineExceeded: Si el plazo vence antes del resultado.
+        """
+        if self.pending_batches >= self.max_pending_batches:
+            self._reject("Demasiados lotes en espera", self.queue_depth + len(entradas))
+
+        self.pending_batches += 1
+        try:
+            # Si el plazo vence mientras el lote espera al hilo del modelo, el
+            # lote se cancela sin llegar a evaluarse
+            return await self._wait(self._evaluate_frame(entradas, score), timeout_ms)
+        finally:
+            self.pending_batches -= 1
+
+    async def _evaluate_frame(self, entradas, score=None):
+        """Evaluar filas en el hilo del modelo y actualizar el rendimiento observado."""
+        loop = asyncio.get_running_loop()
+        inicio = loop.time()
+        resultados = await loop.run_in_executor(self.executor, score or self.predictor.predict_frame, entradas)
+        segundos = loop.time() - inicio
+        if segundos > 0:
+            tasa = len(entradas) / segundos
+            self.filas_por_s = tasa if self.filas_por_s is None else 0.8 * self.filas_por_s + 0.2 * tasa
+        return resultados
+
+    async def _collect(self):
+        """Esperar la primera petición y agrupar las que lleguen dentro de la ventana."""
+        loop = asyncio.get_running_loop()
+        lote = [await self._queue.get()]
+        limite = loop.time() + self.max_wait_ms / 1000
+
+        while len(lote) < self.max_batch_size:
+            # Recoger sin esperar todo lo que ya está encolado
+            while len(lote) < self.max_batch_size and not self._queue.empty():
+                lote.append(self._queue.get_nowait())
+            restante = limite - loop.time()
+            if len(lote) >= self.max_batch_size or restante <= 0:
+                break
+            try:
+                lote.append(await asyncio.wait_for(self._queue.get(), restante))
+            except asyncio.TimeoutError:
+                break
+        return lote
+
+    async def _run(self):
+        """Bucle principal: agrupar, evaluar y repartir resultados."""
+        while True:
+            lote = await self._collect()
+            await self._evaluate(lote)
+
+    async def _evaluate(self, lote):
+        """Evaluar un lote y resolver los futuros de cada petición."""
+        # Descartar peticiones cuyo cliente ya no espera respuesta o cuyo
+        # plazo ha vencido: no tiene sentido gastar tiempo de modelo en ellas
+        ahora = asyncio.get_running_loop().time()
+        vigentes = []
+        for params, future, deadline in lote:
+            if future.done():
+                continue
+            if deadline is not None and deadline <= ahora:
+                self.expiradas += 1
+                metrics.EXPIRADAS.inc()
+                future.set_exception(DeadlineExceeded("Plazo vencido antes de la evaluación"))
+                continue
+            vigentes.append((params, future))
+        lote = vigentes
+        if not lote:
+            return
+
+        # Las filas no válidas se responden con su error sin llegar al modelo,
+        # para que una petición errónea no obligue a evaluar el resto por separado
+        entradas = pd.DataFrame([params for params, _ in lote])
+        validas = []
+        for posicion, ((_, future), error) in enumerate(zip(lote, validate_rows(entradas))):
+            if error is None:
+                validas.append(posicion)
+            elif not future.done():
+                future.set_exception(error)
+        if validas:
+            await self._evaluate_rows(entradas.iloc[validas], [lote[posicion][1] for posicion in validas])
+
+    async def _evaluate_rows(self, entradas, futures):
+        """
+        Evaluar filas y resolver sus futuros.
+
+        Si la llamada falla por un error que la validación no detecta, el lote
+        se divide por la mitad y cada parte se evalúa por separado, de modo que
+        el error llega solo a las peticiones que lo causan con pocas llamadas
+        adicionales al modelo.
+        """
+        try:
+            resultados = await self._evaluate_frame(entradas)
+        except Exception as e:
+            if len(futures) == 1:
+                if not futures[0].done():
+                    futures[0].set_exception(e)
+                return
+            mitad = len(futures) // 2
+            await self._evaluate_rows(entradas.iloc[:mitad], futures[:mitad])
+            await self._evaluate_rows(entradas.iloc[mitad:], futures[mitad:])
+            return
+        for future, registro in zip(futures, resultados.to_dict('records')):
+            if not future.done():
+                future.set_result(registro)
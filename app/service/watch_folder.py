@@ -0,0 +1,431 @@
+import fnmatch
+import json
+import os
+import shutil
+import socket
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.streaming_scorer import DEFAULT_CHUNK_SIZE, score_stream
+
+# Subcarpeta donde se mueven los archivos mientras se procesan. Cada proceso
+# usa dentro su propia carpeta, con el nombre "<equipo>@<pid>@<token>"
+PROCESSING_DIRNAME = ".procesando"
+
+# Archivo de latido de cada proceso: su fecha de modificación se renueva
+# periódicamente y marca hasta cuándo son suyos los archivos que ha tomado
+HEARTBEAT_FILENAME = ".latido"
+
+# Segundos sin latido tras los que se consideran abandonados los archivos de un proceso
+DEFAULT_LEASE_SECONDS = 60.0
+
+# Registro de archivos ya procesados (uno por línea, JSON)
+LEDGER_FILENAME = ".pandeo_procesados.jsonl"
+
+# Sufijos de los archivos que genera la vigilancia (nunca se toman como entrada)
+RESULT_SUFFIX = "_resultados"
+ERROR_SUFFIX = "_error"
+
+
+def _move_no_replace(origen, destino):
+    """
+    Mover un archivo sin sobrescribir el destino.
+
+    os.rename sobrescribe en POSIX; un enlace duro, en cambio, falla si el
+    destino ya existe.
+
+    Returns:
+        bool: False si el destino ya existía (el origen no se toca).
+    """
+    try:
+        os.link(origen, destino)
+    except FileExistsError:
+        return False
+    except FileNotFoundError:
+        raise
+    except OSError:
+        # Sistemas de archivos sin enlaces duros (en Windows os.rename no sobrescribe)
+        if os.path.exists(destino):
+            return False
+        try:
+            os.rename(origen, destino)
+        except FileExistsError:
+            return False
+        return True
+    os.unlink(origen)
+    return True
+
+
+class WatchFolder:
+    """
+    Vigila una carpeta y puntúa automáticamente los archivos de miembros nuevos.
+
+    Un archivo se toma cuando su tamaño y fecha de modificación no cambian
+    entre dos sondeos (la herramienta de origen ha terminado de escribirlo).
+    Para tomarlo se mueve con os.rename a la subcarpeta de trabajo del
+    proceso, lo que es atómico: si varios procesos vigilan la misma carpeta,
+    solo uno lo consigue. Al terminar, el archivo vuelve a su sitio, el
+    resultado se escribe a su lado y el archivo queda anotado en el registro
+    para no volver a procesarlo. Si entretanto ha llegado otro archivo con el
+    mismo nombre, no se sobrescribe: el procesado se conserva como
+    '<nombre>.procesado-<propietario>'.
+
+    Cada proceso renueva un latido en su subcarpeta. Los archivos de otro
+    proceso solo se devuelven a la carpeta para reprocesarlos si ese proceso
+    ha terminado (mismo equipo) o si su latido ha caducado.
+    """
+
+    def __init__(self, predictor, directory, patterns=("*.csv",), poll_interval=2.0, workers=2,
+                 chunk_size=DEFAULT_CHUNK_SIZE, output_format=None, log=print,
+                 lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        Inicializar la vigilancia.
+
+        Args:
+            predictor (BatchPredictor): Motor de predicción.
+            directory (str): Carpeta a vigilar.
+            patterns (tuple): Patrones de los archivos de entrada.
+            poll_interval (float): Segundos entre sondeos.
+            workers (int): Archivos que se procesan a la vez.
+            chunk_size (int): Filas por bloque al puntuar cada archivo.
+            output_format (str, opcional): Extensión de los resultados
+                ('csv', 'ndjson' o 'parquet'); por defecto, la de la entrada.
+            log (callable): Función para informar de la actividad.
+            lease_seconds (float): Segundos sin latido tras los que otro
+                proceso puede recuperar los archivos tomados por este.
+        """
+        self.predictor = predictor
+        self.directory = os.path.abspath(directory)
+        self.patterns = tuple(patterns)
+        self.poll_interval = poll_interval
+        self.chunk_size = chunk_size
+        self.output_format = output_format
+        self.log = log
+        self.lease_seconds = lease_seconds
+
+        # Subcarpeta de trabajo propia, identificada por equipo y proceso
+        self.host = socket.gethostname()
+        self.owner = f"{self.host}@{os.getpid()}@{uuid.uuid4().hex[:8]}"
+        self.processing_root = os.path.join(self.directory, PROCESSING_DIRNAME)
+        self.processing_dir = os.path.join(self.processing_root, self.owner)
+        self.ledger_path = os.path.join(self.directory, LEDGER_FILENAME)
+        os.makedirs(self.processing_dir, exist_ok=True)
+        self._heartbeat()
+
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vigilancia")
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._en_curso = set()
+        self._candidatos = {}
+        self._procesados = set()
+        self._ledger_offset = 0
+        self._load_ledger()
+
+        # El latido se renueva en un hilo propio para que no dependa de que
+        # el sondeo siga activo mientras se terminan los archivos en curso
+        self._closed = threading.Event()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="vigilancia-latido", daemon=True)
+        self._heartbeat_thread.start()
+
+        self._recover(arranque=True)
+
+    # ------------------------------------------------------------------
+    # Registro de procesados
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _file_key(nombre, stat):
+        """Identidad de un archivo: nombre, tamaño y fecha de modificación."""
+        return (nombre, stat.st_size, stat.st_mtime_ns)
+
+    def _load_ledger(self):
+        """
+        Leer las líneas nuevas del registro de archivos procesados.
+
+        El registro se lee de forma incremental en cada sondeo para tener en
+        cuenta lo que hayan procesado otros procesos que vigilan la carpeta.
+        """
+        if not os.path.exists(self.ledger_path):
+            return
+        with self._lock:
+            with open(self.ledger_path, "rb") as f:
+                f.seek(self._ledger_offset)
+                for linea in f:
+                    if not linea.endswith(b"\n"):
+                        # Línea que otro proceso aún está escribiendo
+                        break
+                    self._ledger_offset += len(linea)
+                    try:
+                        registro = json.loads(linea)
+                        self._procesados.add((registro["archivo"], registro["tamano"], registro["mtime_ns"]))
+                    except (json.JSONDecodeError, KeyError):
+                        # Línea dañada por una escritura interrumpida
+                        continue
+
+    def _record(self, clave, **datos):
+        """Anotar un archivo en el registro (se añade una línea y se sincroniza)."""
+        nombre, tamano, mtime_ns = clave
+        registro = dict(archivo=nombre, tamano=tamano, mtime_ns=mtime_ns, fecha=time.time(), **datos)
+        with self._lock:
+            with open(self.ledger_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._procesados.add(clave)
+
+    # ------------------------------------------------------------------
+    # Propiedad de los archivos tomados
+    # ------------------------------------------------------------------
+
+    def _heartbeat(self):
+        """Renovar el latido de este proceso."""
+        ruta = os.path.join(self.processing_dir, HEARTBEAT_FILENAME)
+        with open(ruta, "a"):
+            pass
+        os.utime(ruta)
+
+    def _heartbeat_loop(self):
+        """Renovar el latido hasta que se cierre la vigilancia."""
+        while not self._closed.wait(self.lease_seconds / 4):
+            try:
+                self._heartbeat()
+            except OSError as e:
+                self.log(f"No se ha podido renovar el latido: {str(e)}")
+
+    def _owner_gone(self, propietario):
+        """
+        Comprobar si el proceso propietario de una subcarpeta de trabajo ya no la atiende.
+
+        Args:
+            propietario (str): Nombre de la subcarpeta ("<equipo>@<pid>@<token>").
+
+        Returns:
+            bool: True si el proceso ha terminado o su latido ha caducado.
+        """
+        equipo, _, resto = propietario.partition("@")
+        pid = resto.partition("@")[0]
+        if equipo == self.host and pid.isdigit() and os.name == "posix":
+            try:
+                os.kill(int(pid), 0)
+            except ProcessLookupError:
+                return True
+            except PermissionError:
+                pass
+
+        try:
+            latido = os.path.getmtime(os.path.join(self.processing_root, propietario, HEARTBEAT_FILENAME))
+        except FileNotFoundError:
+            # Sin latido: se toma la fecha de la propia subcarpeta
+            try:
+                latido = os.path.getmtime(os.path.join(self.processing_root, propietario))
+            except FileNotFoundError:
+                return False
+        return time.time() - latido > self.lease_seconds
+
+    def _set_aside(self, origen, nombre, motivo, propietario=None):
+        """
+        Dejar en la carpeta vigilada, con un nombre que no se toma como
+        entrada, un archivo que no puede volver a su nombre original.
+
+        Returns:
+            bool: True si se ha movido.
+        """
+        sufijo = f"{motivo}-{propietario}" if propietario else motivo
+        apartado = f"{nombre}.{sufijo}"
+        if not _move_no_replace(origen, os.path.join(self.directory, apartado)):
+            return False
+        self.log(f"Ya existe un archivo nuevo llamado {nombre}; el anterior se conserva como {apartado}")
+        return True
+
+    def _return_file(self, origen, nombre, propietario=None):
+        """
+        Devolver a la carpeta vigilada un archivo tomado que no se terminó.
+
+        Si entretanto ha aparecido un archivo con el mismo nombre, el tomado
+        se conserva aparte como '<nombre>.recuperado-<propietario>'.
+
+        Returns:
+            bool: False si el archivo sigue en la subcarpeta de trabajo.
+        """
+        try:
+            if _move_no_replace(origen, os.path.join(self.directory, nombre)):
+                self.log(f"Recuperado para reprocesar: {nombre}")
+                return True
+            return self._set_aside(origen, nombre, "recuperado", propietario)
+        except FileNotFoundError:
+            # Otro proceso lo ha recuperado antes
+            return True
+
+    def _recover(self, arranque=False):
+        """
+        Devolver a la carpeta los archivos tomados por procesos que ya no los atienden.
+
+        Args:
+            arranque (bool): Recuperar también los archivos del formato
+                anterior, sin propietario (solo al arrancar).
+        """
+        self._ultima_recuperacion = time.monotonic()
+        for nombre in os.listdir(self.processing_root):
+            ruta = os.path.join(self.processing_root, nombre)
+            if os.path.isfile(ruta):
+                if arranque and not nombre.startswith("."):
+                    self._return_file(ruta, nombre)
+                continue
+            if nombre == self.owner or not self._owner_gone(nombre):
+                continue
+            completo = True
+            for archivo in os.listdir(ruta):
+                # Los nombres ocultos son el latido y resultados a medias
+                if not archivo.startswith(".") and not self._return_file(os.path.join(ruta, archivo), archivo, nombre):
+                    completo = False
+            # La subcarpeta solo se borra si no queda ninguna entrada sin devolver
+            if completo:
+                shutil.rmtree(ruta, ignore_errors=True)
+            else:
+                self.log(f"Quedan archivos sin recuperar en {ruta}")
+
+    # ------------------------------------------------------------------
+    # Sondeo
+    # ------------------------------------------------------------------
+
+    def _is_input(self, nombre):
+        """Comprobar si un nombre de archivo es una entrada válida."""
+        if nombre.startswith("."):
+            return False
+        raiz = os.path.splitext(nombre)[0]
+        if raiz.endswith(RESULT_SUFFIX) or raiz.endswith(ERROR_SUFFIX):
+            return False
+        return any(fnmatch.fnmatch(nombre, patron) for patron in self.patterns)
+
+    def poll(self):
+        """
+        Buscar archivos nuevos y enviar a procesar los que ya son estables.
+
+        Returns:
+            list: Futuros de los archivos enviados en este sondeo.
+        """
+        self._load_ledger()
+
+        # Recuperar los archivos de procesos caídos (como mucho dos veces por plazo)
+        if time.monotonic() - self._ultima_recuperacion >= self.lease_seconds / 2:
+            try:
+                self._recover()
+            except OSError as e:
+                self.log(f"Error al recuperar archivos abandonados: {str(e)}")
+
+        futuros = []
+        vistos = {}
+        with os.scandir(self.directory) as entradas:
+            for entrada in entradas:
+                if not entrada.is_file() or not self._is_input(entrada.name):
+                    continue
+                clave = self._file_key(entrada.name, entrada.stat())
+                with self._lock:
+                    if clave in self._procesados or entrada.name in self._en_curso:
+                        continue
+                vistos[entrada.name] = clave
+
+                # Solo se toma si no ha cambiado desde el sondeo anterior
+                if self._candidatos.get(entrada.name) == clave:
+                    with self._lock:
+                        self._en_curso.add(entrada.name)
+                    futuros.append(self.executor.submit(self._process, entrada.name, clave))
+
+        with self._lock:
+            self._candidatos = {n: c for n, c in vistos.items() if n not in self._en_curso}
+        return futuros
+
+    def _output_path(self, nombre):
+        """Ruta del archivo de resultados junto a la entrada."""
+        raiz, extension = os.path.splitext(nombre)
+        if self.output_format:
+            extension = "." + self.output_format
+        return os.path.join(self.directory, f"{raiz}{RESULT_SUFFIX}{extension}")
+
+    def _process(self, nombre, clave):
+        """Tomar un archivo, puntuarlo y escribir el resultado a su lado."""
+        origen = os.path.join(self.directory, nombre)
+        trabajo = os.path.join(self.processing_dir, nombre)
+        try:
+            # Toma atómica: si otro proceso se adelantó, el archivo ya no está
+            try:
+                os.rename(origen, trabajo)
+            except FileNotFoundError:
+                return None
+
+            salida = self._output_path(nombre)
+            raiz, extension = os.path.splitext(os.path.basename(salida))
+            # Oculto para que una recuperación no lo tome como entrada
+            temporal = os.path.join(self.processing_dir, f".{raiz}.tmp{extension}")
+            try:
+                stats = score_stream(self.predictor, trabajo, temporal, self.chunk_size)
+                os.replace(temporal, salida)
+                self._record(clave, resultado=os.path.basename(salida), filas=stats['filas'],
+                             segundos=stats['segundos'])
+                self.log(f"Procesado {nombre}: {stats['filas']} filas en {stats['segundos']:.1f} s -> "
+                         f"{os.path.basename(salida)}")
+                return stats
+            except Exception as e:
+                # El error se deja junto a la entrada y el archivo no se reintenta
+                ruta_error = os.path.join(self.directory, f"{os.path.splitext(nombre)[0]}{ERROR_SUFFIX}.txt")
+                with open(ruta_error, "w", encoding="utf-8") as f:
+                    f.write(f"{str(e)}\n\n{traceback.format_exc()}")
+                self._record(clave, error=str(e))
+                self.log(f"Error al procesar {nombre}: {str(e)}")
+                if os.path.exists(temporal):
+                    os.remove(temporal)
+                return None
+            finally:
+                try:
+                    # Sin sobrescribir un archivo nuevo con el mismo nombre que
+                    # haya dejado la herramienta de origen mientras se puntuaba
+                    if not _move_no_replace(trabajo, origen) and not self._set_aside(
+                            trabajo, nombre, "procesado", self.owner):
+                        self.log(f"{nombre} se conserva en {self.processing_dir}")
+                except FileNotFoundError:
+                    # Recuperado por otro proceso tras caducar el latido
+                    self.log(f"{nombre} fue recuperado por otro proceso mientras se procesaba")
+        finally:
+            with self._lock:
+                self._en_curso.discard(nombre)
+
+    # ------------------------------------------------------------------
+    # Ejecución
+    # ------------------------------------------------------------------
+
+    def run(self, once=False):
+        """
+        Sondear la carpeta hasta que se llame a stop().
+
+        Args:
+            once (bool): Procesar los archivos presentes y terminar.
+        """
+        self.log(f"Vigilando {self.directory} ({', '.join(self.patterns)})")
+        try:
+            if once:
+                # Dos sondeos seguidos bastan para dar por estables los archivos presentes
+                self.poll()
+                time.sleep(self.poll_interval)
+                for future in self.poll():
+                    future.result()
+                return
+            while not self._stop.is_set():
+                self.poll()
+                self._stop.wait(self.poll_interval)
+        finally:
+            self.executor.shutdown(wait=True)
+            self.close()
+
+    def close(self):
+        """Dejar de renovar el latido y retirar la subcarpeta de trabajo propia."""
+        self._closed.set()
+        self._heartbeat_thread.join()
+        if os.path.isdir(self.processing_dir) and not any(not nombre.startswith(".") for nombre in os.listdir(self.processing_dir)):
+            shutil.rmtree(self.processing_dir, ignore_errors=True)
+
+    def stop(self):
+        """Detener el sondeo (los archivos en curso se terminan)."""
+        self._stop.set()
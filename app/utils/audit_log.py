@@ -0,0 +1,276 @@
+"""Registro de auditoría de predicciones, solo de escritura.
+
+Cada predicción se anota con sus entradas, sus resultados, la versión del
+modelo y la fecha. El coste en el hilo que predice se limita a guardar una
+referencia al lote: la conversión, la compresión y la escritura se hacen en
+un hilo de fondo, por lotes, en archivos que rotan al alcanzar un tamaño.
+"""
+import gzip
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+# Formatos de archivo admitidos
+FORMATS = ("jsonl", "parquet")
+
+# Prefijo de los nombres de archivo
+DEFAULT_PREFIX = "auditoria"
+
+# Resultados que se anotan junto a las entradas. El resto de columnas de
+# compute_results se deriva de las entradas y no aporta trazabilidad
+AUDIT_RESULT_COLUMNS = [
+    'carga_maxima_kN', 'carga_critica_euler_kN', 'factor_reduccion', 'resistencia_plastica_kN',
+    'desplazamiento_lateral_mm'
+]
+
+# Entradas opcionales que también se anotan: el factor K explícito de los
+# pilares de un pórtico sustituye al de la condición de apoyo, y sin él la
+# predicción no se puede reproducir (vacío si no se indicó)
+AUDIT_OPTIONAL_COLUMNS = ['factor_longitud_efectiva']
+
+# Tamaño a partir del cual se abre un archivo nuevo (bytes comprimidos)
+DEFAULT_MAX_FILE_BYTES = 64 * 1024 * 1024
+
+# Segundos entre volcados del hilo de fondo
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Filas pendientes a partir de las cuales quien predice espera al hilo de
+# fondo. En auditoría no se descartan registros: si la escritura no da
+# abasto, se frena la predicción
+DEFAULT_MAX_PENDING_ROWS = 1_000_000
+
+
+def _has_pyarrow():
+    """Comprobar si pyarrow está disponible para escribir Parquet."""
+    import importlib.util
+
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def worker_prefix():
+    """Prefijo de archivo propio del proceso actual, para los procesos trabajadores."""
+    return f"{DEFAULT_PREFIX}-p{os.getpid()}"
+
+
+class AuditLog:
+    """
+    Registro de auditoría con escritura por lotes en un hilo de fondo.
+
+    Los archivos se llaman auditoria-<fecha>-<n>.jsonl.gz (JSON por líneas
+    comprimido con gzip) o auditoria-<fecha>-<n>.parquet (columnar, binario).
+    El archivo en curso lleva el sufijo .parcial hasta que se cierra, de modo
+    que los archivos sin ese sufijo están siempre completos. Varios procesos
+    pueden escribir en la misma carpeta si cada uno usa un prefijo distinto.
+    """
+
+    def __init__(self, directory, model_path=None, fmt="parquet", max_file_bytes=DEFAULT_MAX_FILE_BYTES,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, max_pending_rows=DEFAULT_MAX_PENDING_ROWS,
+                 prefix=DEFAULT_PREFIX):
+        """
+        Abrir el registro e iniciar el hilo de escritura.
+
+        Args:
+            directory (str): Carpeta de los archivos de auditoría.
+            model_path (str, opcional): Modelo cuya versión se anota.
+            fmt (str): 'parquet' (binario, el más barato de escribir) o 'jsonl'.
+                Sin pyarrow se usa 'jsonl'.
+            max_file_bytes (int): Tamaño a partir del cual se rota el archivo.
+            flush_interval (float): Segundos entre volcados.
+            max_pending_rows (int): Filas en memoria a partir de las cuales
+                record() espera a que se escriban.
+            prefix (str): Prefijo de los nombres de archivo.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato de auditoría no soportado: {fmt}")
+        if fmt == "parquet" and not _has_pyarrow():
+            print("Aviso: pyarrow no está instalado; el registro de auditoría se escribe en JSON por líneas",
+                  file=sys.stderr)
+            fmt = "jsonl"
+
+        self.directory = directory
+        self.fmt = fmt
+        self.max_file_bytes = max_file_bytes
+        self.flush_interval = flush_interval
+        self.max_pending_rows = max_pending_rows
+        self.prefix = prefix
+        os.makedirs(directory, exist_ok=True)
+
+        self.modelo = os.path.basename(model_path) if model_path else None
+        self.version = None
+        if model_path:
+            from app.utils.result_cache import model_fingerprint
+            self.version = model_fingerprint(model_path)[:16]
+
+        self.filas_escritas = 0
+        self.archivos = 0
+        self._pendientes = deque()
+        self._filas_pendientes = 0
+        self._condition = threading.Condition()
+        self._stop = False
+        self._error = None
+
+        self._archivo = None
+        self._ruta = None
+        self._escritor = None
+        self._secuencia = 0
+
+        self._thread = threading.Thread(target=self._run, name="auditoria", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Registro
+    # ------------------------------------------------------------------
+
+    def record(self, entradas, resultados):
+        """
+        Anotar un lote de predicciones.
+
+        Solo se guarda una referencia a los datos; no deben modificarse
+        después de llamar a este método.
+
+        Args:
+            entradas (pd.DataFrame | list): Parámetros de entrada del lote.
+            resultados (pd.DataFrame): Resultados, en el mismo orden.
+        """
+        if self._error is not None:
+            raise RuntimeError(f"El registro de auditoría ha fallado: {self._error}")
+
+        filas = len(resultados)
+        with self._condition:
+            while self._filas_pendientes >= self.max_pending_rows and not self._stop:
+                self._condition.wait()
+            self._pendientes.append((time.time(), entradas, resultados))
+            self._filas_pendientes += filas
+
+    def flush(self):
+        """Esperar a que se escriban todos los registros pendientes."""
+        with self._condition:
+            self._condition.notify_all()
+            while self._pendientes and self._error is None:
+                self._condition.wait(0.1)
+
+    def close(self):
+        """Escribir lo pendiente, cerrar el archivo en curso y detener el hilo."""
+        with self._condition:
+            self._stop = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Hilo de escritura
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        try:
+            while True:
+                with self._condition:
+                    if not self._pendientes and not self._stop:
+                        self._condition.wait(self.flush_interval)
+                    lotes = list(self._pendientes)
+                    parar = self._stop
+                if lotes:
+                    self._write(self._to_frame(lotes))
+                    with self._condition:
+                        for _ in lotes:
+                            _, _, resultados = self._pendientes.popleft()
+                            self._filas_pendientes -= len(resultados)
+                        self._condition.notify_all()
+                if parar and not lotes:
+                    break
+        except Exception as e:
+            self._error = str(e)
+            print(f"Error en el registro de auditoría: {str(e)}")
+            with self._condition:
+                self._condition.notify_all()
+        finally:
+            self._close_file()
+
+    def _to_frame(self, lotes):
+        """Unir los lotes pendientes en una tabla con una fila por predicción."""
+        from app.models.batch_predictor import DIMENSION_COLUMNS, INPUT_COLUMNS
+
+        tablas = []
+        for fecha, entradas, resultados in lotes:
+            if not isinstance(entradas, pd.DataFrame):
+                entradas = pd.DataFrame(list(entradas))
+            tabla = entradas.reindex(columns=INPUT_COLUMNS + AUDIT_OPTIONAL_COLUMNS).reset_index(drop=True)
+            # Tipos fijos para que todos los lotes de un archivo tengan el mismo esquema
+            for columna in ['longitud_mm'] + DIMENSION_COLUMNS + AUDIT_OPTIONAL_COLUMNS:
+                tabla[columna] = pd.to_numeric(tabla[columna], errors='coerce')
+            tabla = pd.concat([tabla, resultados[AUDIT_RESULT_COLUMNS].reset_index(drop=True)], axis=1)
+            tabla.insert(0, "fecha", fecha)
+            tablas.append(tabla)
+
+        tabla = pd.concat(tablas, ignore_index=True) if len(tablas) > 1 else tablas[0]
+        tabla.insert(1, "modelo", self.modelo)
+        tabla.insert(2, "version_modelo", self.version)
+        return tabla
+
+    def _open_file(self):
+        fecha = time.strftime("%Y%m%d-%H%M%S")
+        self._secuencia += 1
+        extension = "jsonl.gz" if self.fmt == "jsonl" else "parquet"
+        self._ruta = os.path.join(self.directory, f"{self.prefix}-{fecha}-{self._secuencia:04d}.{extension}")
+        self._archivo = open(self._ruta + ".parcial", "wb")
+        if self.fmt == "jsonl":
+            # Nivel 1: la compresión más rápida, para no competir con la predicción
+            self._escritor = gzip.GzipFile(fileobj=self._archivo, mode="wb", compresslevel=1)
+
+    def _write(self, tabla):
+        if self._archivo is None:
+            self._open_file()
+
+        if self.fmt == "jsonl":
+            texto = tabla.to_json(orient="records", lines=True, force_ascii=False)
+            if not texto.endswith("\n"):
+                texto += "\n"
+            self._escritor.write(texto.encode("utf-8"))
+            self._escritor.flush()
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            lote = pa.Table.from_pandas(tabla, preserve_index=False)
+            if self._escritor is None:
+                self._escritor = pq.ParquetWriter(self._archivo, lote.schema, compression="zstd")
+            self._escritor.write_table(lote.cast(self._escritor.schema))
+
+        self.filas_escritas += len(tabla)
+        if self._archivo.tell() >= self.max_file_bytes:
+            self._close_file()
+
+    def _close_file(self):
+        """Cerrar el archivo en curso y quitarle el sufijo .parcial."""
+        if self._archivo is None:
+            return
+        if self._escritor is not None:
+            self._escritor.close()
+        self._archivo.close()
+        os.replace(self._ruta + ".parcial", self._ruta)
+        self.archivos += 1
+        self._archivo = None
+        self._escritor = None
+
+    def stats(self):
+        """
+        Obtener el estado del registro.
+
+        Returns:
+            dict: Filas escritas, filas pendientes y archivos cerrados.
+        """
+        with self._condition:
+            return {
+                'filas_escritas': self.filas_escritas,
+                'filas_pendientes': self._filas_pendientes,
+                'archivos': self.archivos
+            }
@@ -0,0 +1,240 @@
+import threading
+import time
+import traceback
+from functools import partial
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# Intervalo mínimo entre avisos de progreso (s): más avisos solo saturarían
+# el bucle de eventos de la interfaz
+MIN_PROGRESS_INTERVAL = 0.1
+
+# Trabajos largos que pueden ejecutarse a la vez
+DEFAULT_JOB_THREADS = 2
+
+
+class TaskCancelled(Exception):
+    """Excepción con la que una tarea abandona el trabajo al ser cancelada."""
+
+
+class CancellationToken:
+    """
+    Indicador de cancelación compartido entre la interfaz y una tarea.
+
+    La interfaz llama a cancel() cuando el resultado ya no interesa (por
+    ejemplo, porque se ha lanzado un cálculo más reciente) y la tarea lo
+    comprueba entre pasos con check().
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Marcar la tarea como cancelada."""
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Lanzar TaskCancelled si la tarea ha sido cancelada."""
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+class TaskSignals(QObject):
+    """
+    Señales de una tarea en segundo plano.
+
+    El objeto se crea en el hilo de la interfaz, de modo que las señales
+    emitidas desde el hilo de trabajo llegan a los slots a través del bucle
+    de eventos, en el hilo de la interfaz.
+    """
+
+    # Resultado de la función de la tarea
+    finished = pyqtSignal(object)
+
+    # Mensaje de error y traza
+    failed = pyqtSignal(str, str)
+
+    # La tarea terminó sin resultado por haber sido cancelada
+    cancelled = pyqtSignal()
+    
+    # Progreso: hecho, total, segundos restantes estimados (-1 si aún no se
+    # pueden estimar) y mensaje de la etapa en curso
+    progress = pyqtSignal(int, int, float, str)
+
+
+class FunctionTask(QRunnable):
+    """
+    Tarea de QThreadPool que ejecuta una función con un token de cancelación.
+
+    La función recibe el token como argumento 'token' y debe comprobarlo
+    entre pasos. Si el token se cancela, la tarea no emite el resultado
+    aunque la función llegue a terminar.
+    """
+
+    def __init__(self, function, *args, token=None, **kwargs):
+        """
+        Preparar la tarea.
+
+        Args:
+            function (callable): Función a ejecutar en el hilo de trabajo.
+            *args: Argumentos posicionales de la función.
+            token (CancellationToken, opcional): Token de cancelación.
+            **kwargs: Argumentos con nombre de la función.
+        """
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.token = token or CancellationToken()
+        self.signals = TaskSignals()
+
+    def cancel(self):
+        """Cancelar la tarea (si aún no ha empezado, no llega a ejecutarse)."""
+        self.token.cancel()
+
+    def run(self):
+        try:
+            self.token.check()
+            resultado = self.function(*self.args, token=self.token, **self.kwargs)
+            self.token.check()
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            if self.token.cancelled:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.failed.emit(str(e), traceback.format_exc())
+        else:
+            self.signals.finished.emit(resultado)
+
+
+class ProgressReporter:
+    """
+    Función de progreso que recibe la función de un trabajo.
+
+    Se llama con (hecho, total, mensaje). Comprueba la cancelación en cada
+    llamada, estima el tiempo restante por extrapolación lineal desde el
+    inicio y limita los avisos a la interfaz a uno cada MIN_PROGRESS_INTERVAL
+    segundos (salvo el último y los cambios de mensaje).
+    """
+
+    def __init__(self, signal, token, min_interval=MIN_PROGRESS_INTERVAL):
+        """
+        Preparar el informe de progreso.
+
+        Args:
+            signal: Señal progress de las TaskSignals del trabajo.
+            token (CancellationToken): Token de cancelación del trabajo.
+            min_interval (float): Segundos mínimos entre avisos.
+        """
+        self.signal = signal
+        self.token = token
+        self.min_interval = min_interval
+        self.start()
+
+    def start(self):
+        """Empezar a medir el tiempo (al comenzar el trabajo)."""
+        self.inicio = time.perf_counter()
+        self._ultimo_aviso = None
+        self._ultimo_mensaje = None
+
+    def remaining(self, hecho, total):
+        """Segundos restantes estimados, o -1 si aún no se pueden estimar."""
+        if hecho <= 0 or total <= 0:
+            return -1.0
+        transcurrido = time.perf_counter() - self.inicio
+        return transcurrido * max(total - hecho, 0) / hecho
+
+    def __call__(self, hecho, total, mensaje=""):
+        self.token.check()
+        ahora = time.perf_counter()
+        if (self._ultimo_aviso is not None and hecho < total and mensaje == self._ultimo_mensaje
+                and ahora - self._ultimo_aviso < self.min_interval):
+            return
+        self._ultimo_aviso = ahora
+        self._ultimo_mensaje = mensaje
+        self.signal.emit(int(hecho), int(total), self.remaining(hecho, total), mensaje)
+
+
+class Job(FunctionTask):
+    """
+    Operación larga con título, progreso y cancelación.
+
+    Además del token, la función recibe el argumento 'progress', un
+    ProgressReporter al que debe llamar con (hecho, total, mensaje) entre
+    pasos. Los trabajos se lanzan con JobManager, que los muestra en el
+    indicador de progreso compartido.
+    """
+
+    def __init__(self, title, function, *args, token=None, **kwargs):
+        """
+        Preparar el trabajo.
+
+        Args:
+            title (str): Nombre del trabajo que se muestra en la interfaz.
+            function (callable): Función a ejecutar en el hilo de trabajo.
+            *args: Argumentos posicionales de la función.
+            token (CancellationToken, opcional): Token de cancelación.
+            **kwargs: Argumentos con nombre de la función.
+        """
+        super().__init__(function, *args, token=token, **kwargs)
+        self.title = title
+        self.progress = ProgressReporter(self.signals.progress, self.token)
+        self.kwargs['progress'] = self.progress
+
+    def run(self):
+        self.progress.start()
+        super().run()
+
+
+class JobManager(QObject):
+    """
+    Lanzador de trabajos largos en un grupo de hilos propio.
+
+    Mantiene la referencia de los trabajos en curso y avisa con job_started
+    para que el indicador de progreso compartido los muestre.
+    """
+
+    # Trabajo lanzado (Job)
+    job_started = pyqtSignal(object)
+
+    def __init__(self, max_threads=DEFAULT_JOB_THREADS):
+        super().__init__()
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(max_threads)
+        self.jobs = []
+
+    def start(self, job):
+        """
+        Lanzar un trabajo.
+
+        Args:
+            job (Job): Trabajo a ejecutar.
+
+        Returns:
+            Job: El mismo trabajo, para conectar sus señales.
+        """
+        self.jobs.append(job)
+        job.signals.finished.connect(partial(self._forget, job))
+        job.signals.failed.connect(partial(self._forget, job))
+        job.signals.cancelled.connect(partial(self._forget, job))
+        self.job_started.emit(job)
+        self.thread_pool.start(job)
+        return job
+
+    def _forget(self, job, *args):
+        if job in self.jobs:
+            self.jobs.remove(job)
+
+    def cancel_all(self):
+        """Cancelar todos los trabajos en curso."""
+        for job in list(self.jobs):
+            job.cancel()
+
+    def wait(self, msecs=-1):
+        """Esperar a que terminen los trabajos (-1: sin límite)."""
+        return self.thread_pool.waitForDone(msecs)
@@ -0,0 +1,239 @@
+"""Historial de cálculos con los resultados completos memorizados.
+
+Cada cálculo se guarda con sus entradas, sus resultados y su análisis de
+sensibilidad, de modo que puede volver a mostrarse sin llamar al modelo. El
+número de entradas está acotado: al superarlo se descarta la usada hace más
+tiempo. El historial puede guardarse en un archivo JSON para conservarlo
+entre sesiones.
+"""
+import json
+import os
+import time
+from collections import OrderedDict
+
+# Entradas que se conservan por defecto
+DEFAULT_MAX_ENTRIES = 50
+
+# Decimales con los que se normalizan los parámetros numéricos de la clave
+_DECIMALES = 6
+
+# Versión del formato del archivo del historial
+_FORMAT_VERSION = 1
+
+
+def calculation_key(params):
+    """
+    Clave de un cálculo a partir de sus parámetros de entrada.
+
+    Args:
+        params (dict): Parámetros de entrada.
+
+    Returns:
+        str: Clave estable (JSON con las claves ordenadas y los números redondeados).
+    """
+    normalizados = {
+        nombre: round(float(valor), _DECIMALES) if isinstance(valor, (int, float)) else valor
+        for nombre, valor in params.items() if valor is not None
+    }
+    return json.dumps(normalizados, sort_keys=True, ensure_ascii=False)
+
+
+def describe_params(params):
+    """
+    Descripción breve de un cálculo para listarlo.
+
+    Args:
+        params (dict): Parámetros de entrada.
+
+    Returns:
+        str: Texto como "IPE 200×100 · S275 · L = 3000 mm".
+    """
+    tipo_perfil = params.get("tipo_perfil", "")
+    if params.get("dimension_exterior_mm") and tipo_perfil.startswith("Tubular"):
+        dimensiones = f"{params['dimension_exterior_mm']:g}×{params.get('espesor_mm', 0):g}"
+    elif params.get("altura_perfil_mm"):
+        dimensiones = f"{params['altura_perfil_mm']:g}×{params.get('ancho_alas_mm', 0):g}"
+    else:
+        dimensiones = ""
+    perfil = f"{tipo_perfil} {dimensiones}".strip()
+    return f"{perfil} · {params.get('tipo_acero', '')} · L = {params.get('longitud_mm', 0):g} mm"
+
+
+def _json_default(valor):
+    """Convertir a JSON los escalares de numpy que puedan venir en los resultados."""
+    if hasattr(valor, "item"):
+        return valor.item()
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+def _sensitivity_to_json(sensitivity):
+    """Convertir el análisis de sensibilidad a tipos de JSON."""
+    if sensitivity is None:
+        return None
+    datos = dict(sensitivity)
+    variantes = datos.get("variantes")
+    if variantes is not None and hasattr(variantes, "to_dict"):
+        datos["variantes"] = variantes.to_dict("records")
+    return datos
+
+
+def _sensitivity_from_json(datos):
+    """Reconstruir el análisis de sensibilidad leído de JSON."""
+    if datos is None:
+        return None
+    import pandas as pd
+
+    sensitivity = dict(datos)
+    sensitivity["tornado"] = [tuple(fila) for fila in sensitivity.get("tornado", [])]
+    sensitivity["variantes"] = pd.DataFrame(sensitivity.get("variantes", []))
+    return sensitivity
+
+
+class CalculationHistory:
+    """
+    Historial acotado de cálculos con expulsión LRU.
+
+    Las entradas son diccionarios con las claves 'clave', 'entradas',
+    'resultados', 'sensibilidad' y 'fecha'. Repetir un cálculo con las mismas
+    entradas sustituye la entrada anterior.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, path=None):
+        """
+        Crear el historial.
+
+        Args:
+            max_entries (int): Número máximo de entradas.
+            path (str, opcional): Archivo JSON donde se guarda el historial. Si
+                se indica y existe, se carga; si no se indica, el historial
+                solo se conserva en memoria.
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self._entradas = OrderedDict()
+
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, clave):
+        return clave in self._entradas
+
+    def add(self, params, results, sensitivity=None):
+        """
+        Añadir un cálculo (o sustituir el que tenga las mismas entradas).
+
+        Args:
+            params (dict): Parámetros de entrada.
+            results (dict): Resultados de la predicción.
+            sensitivity (dict, opcional): Análisis de sensibilidad.
+
+        Returns:
+            str: Clave de la entrada.
+        """
+        clave = calculation_key(params)
+        self._entradas.pop(clave, None)
+        self._entradas[clave] = {
+            "clave": clave,
+            "entradas": dict(params),
+            "resultados": results,
+            "sensibilidad": sensitivity,
+            "fecha": time.time()
+        }
+        while len(self._entradas) > self.max_entries:
+            self._entradas.popitem(last=False)
+        self._autosave()
+        return clave
+
+    def get(self, clave):
+        """
+        Obtener una entrada y marcarla como usada recientemente.
+
+        Args:
+            clave (str): Clave de la entrada.
+
+        Returns:
+            dict | None: La entrada, o None si no está (o ha sido expulsada).
+        """
+        entrada = self._entradas.get(clave)
+        if entrada is not None:
+            self._entradas.move_to_end(clave)
+        return entrada
+
+    def entries(self):
+        """
+        Obtener las entradas, de la más reciente a la más antigua.
+
+        Returns:
+            list: Entradas ordenadas por fecha de cálculo.
+        """
+        return sorted(self._entradas.values(), key=lambda entrada: entrada["fecha"], reverse=True)
+
+    def clear(self):
+        """Vaciar el historial."""
+        self._entradas.clear()
+        self._autosave()
+
+    def set_path(self, path):
+        """
+        Activar o desactivar el guardado en disco.
+
+        Args:
+            path (str | None): Archivo del historial, o None para conservarlo
+                solo en memoria (el archivo anterior se borra).
+        """
+        anterior, self.path = self.path, path
+        if path is None:
+            if anterior is not None and os.path.exists(anterior):
+                os.remove(anterior)
+        else:
+            self.save(path)
+
+    def _autosave(self):
+        if self.path is not None:
+            try:
+                self.save(self.path)
+            except OSError as e:
+                print(f"Error al guardar el historial: {str(e)}")
+
+    def save(self, path):
+        """
+        Guardar el historial en un archivo JSON.
+
+        Args:
+            path (str): Ruta del archivo.
+        """
+        datos = {
+            "version": _FORMAT_VERSION,
+            "entradas": [
+                dict(entrada, sensibilidad=_sensitivity_to_json(entrada["sensibilidad"]))
+                for entrada in self._entradas.values()
+            ]
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Escritura atómica: un cierre a medias no deja el archivo corrupto
+        temporal = path + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(datos, f, ensure_ascii=False, default=_json_default)
+        os.replace(temporal, path)
+
+    def load(self, path):
+        """
+        Cargar el historial de un archivo JSON (sustituye al actual).
+
+        Args:
+            path (str): Ruta del archivo.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error al cargar el historial: {str(e)}")
+            return
+
+        self._entradas.clear()
+        for entrada in datos.get("entradas", [])[-self.max_entries:]:
+            entrada["sensibilidad"] = _sensitivity_from_json(entrada.get("sensibilidad"))
+            self._entradas[entrada["clave"]] = entrada
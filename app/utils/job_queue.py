@@ -0,0 +1,502 @@
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from app.models.streaming_scorer import ChunkWriter, iter_input_chunks, score_chunk
+
+# Tamaño de bloque por defecto de los trabajos (cada bloque es un punto de control)
+DEFAULT_JOB_CHUNK_SIZE = 20000
+
+# Segundos que un trabajador retiene un bloque antes de que otro pueda reclamarlo
+DEFAULT_LEASE_SECONDS = 120.0
+
+# Intentos por bloque antes de marcarlo como erróneo
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre TEXT NOT NULL,
+    salida TEXT NOT NULL,
+    directorio TEXT NOT NULL,
+    total_filas INTEGER NOT NULL DEFAULT 0,
+    total_bloques INTEGER NOT NULL DEFAULT 0,
+    estado TEXT NOT NULL,
+    error TEXT,
+    lease_hasta REAL,
+    creado REAL NOT NULL,
+    iniciado REAL,
+    terminado REAL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    job_id INTEGER NOT NULL REFERENCES jobs(id),
+    indice INTEGER NOT NULL,
+    filas INTEGER NOT NULL,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    trabajador TEXT,
+    lease_hasta REAL,
+    intentos INTEGER NOT NULL DEFAULT 0,
+    segundos REAL,
+    terminado REAL,
+    error TEXT,
+    PRIMARY KEY (job_id, indice)
+);
+CREATE INDEX IF NOT EXISTS chunks_estado ON chunks (estado, job_id, indice);
+"""
+
+
+class JobQueue:
+    """
+    Cola de trabajos persistente en SQLite.
+
+    Cada trabajo se divide en bloques cuyas entradas se guardan en disco al
+    enviarlo. Los trabajadores reclaman bloques con un arrendamiento (lease)
+    y registran su finalización en la base de datos, de modo que si un
+    proceso muere solo se repite el bloque en curso: al vencer el
+    arrendamiento, otro trabajador lo reclama y continúa.
+    """
+
+    def __init__(self, db_path):
+        """
+        Abrir (o crear) la cola.
+
+        Args:
+            db_path (str): Archivo SQLite de la cola. Los bloques de cada
+                trabajo se guardan junto a él, en '<db_path>.d/<id>'.
+        """
+        self.db_path = db_path
+        self.data_dir = db_path + ".d"
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        # Modo autocommit: las transacciones se abren explícitamente
+        self.conn = sqlite3.connect(db_path, timeout=30.0, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """Cerrar la conexión."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Envío de trabajos
+    # ------------------------------------------------------------------
+
+    def _chunk_path(self, directorio, tipo, indice):
+        return os.path.join(directorio, f"{tipo}_{indice:06d}.pkl")
+
+    def submit_chunks(self, chunks, output_path, nombre=None):
+        """
+        Crear un trabajo a partir de bloques de entrada.
+
+        Args:
+            chunks (iterable): Bloques de entrada (pd.DataFrame).
+            output_path (str): Archivo de resultados (CSV, NDJSON o Parquet).
+            nombre (str, opcional): Nombre descriptivo del trabajo.
+
+        Returns:
+            int: Identificador del trabajo.
+        """
+        ahora = time.time()
+        cursor = self.conn.execute(
+            "INSERT INTO jobs (nombre, salida, directorio, estado, creado) VALUES (?, ?, '', 'preparando', ?)",
+            (nombre or os.path.basename(output_path), os.path.abspath(output_path), ahora)
+        )
+        job_id = cursor.lastrowid
+        directorio = os.path.join(self.data_dir, str(job_id))
+        os.makedirs(directorio, exist_ok=True)
+
+        # Las entradas se escriben antes de registrar los bloques: un bloque
+        # registrado siempre tiene su archivo de entrada completo
+        filas_por_bloque = []
+        for indice, entradas in enumerate(chunks):
+            entradas.reset_index(drop=True).to_pickle(self._chunk_path(directorio, "entrada", indice))
+            filas_por_bloque.append((job_id, indice, len(entradas)))
+
+        if not filas_por_bloque:
+            self.conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            os.rmdir(directorio)
+            raise ValueError("El trabajo no contiene filas")
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.executemany("INSERT INTO chunks (job_id, indice, filas) VALUES (?, ?, ?)", filas_por_bloque)
+        self.conn.execute(
+            "UPDATE jobs SET directorio = ?, total_filas = ?, total_bloques = ?, estado = 'pendiente' WHERE id = ?",
+            (directorio, sum(f for _, _, f in filas_por_bloque), len(filas_por_bloque), job_id)
+        )
+        self.conn.execute("COMMIT")
+        return job_id
+
+    def submit_file(self, input_path, output_path, chunk_size=DEFAULT_JOB_CHUNK_SIZE, nombre=None):
+        """
+        Crear un trabajo que puntúa un archivo de miembros.
+
+        Args:
+            input_path (str): Archivo de entrada (CSV, NDJSON o Parquet).
+            output_path (str): Archivo de resultados.
+            chunk_size (int): Filas por bloque.
+            nombre (str, opcional): Nombre descriptivo del trabajo.
+
+        Returns:
+            int: Identificador del trabajo.
+        """
+        return self.submit_chunks(iter_input_chunks(input_path, chunk_size), output_path,
+                                  nombre or os.path.basename(input_path))
+
+    def submit_frame(self, entradas, output_path, chunk_size=DEFAULT_JOB_CHUNK_SIZE, nombre=None):
+        """
+        Crear un trabajo a partir de un DataFrame (barridos, Monte Carlo...).
+
+        Args:
+            entradas (pd.DataFrame): Parámetros de entrada, una fila por miembro.
+            output_path (str): Archivo de resultados.
+            chunk_size (int): Filas por bloque.
+            nombre (str, opcional): Nombre descriptivo del trabajo.
+
+        Returns:
+            int: Identificador del trabajo.
+        """
+        chunks = (entradas.iloc[inicio:inicio + chunk_size] for inicio in range(0, len(entradas), chunk_size))
+        return self.submit_chunks(chunks, output_path, nombre)
+
+    # ------------------------------------------------------------------
+    # Reclamación y finalización de bloques
+    # ------------------------------------------------------------------
+
+    def claim_chunk(self, trabajador, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        Reclamar el siguiente bloque pendiente (o abandonado por otro trabajador).
+
+        Args:
+            trabajador (str): Identificador del trabajador.
+            lease_seconds (float): Duración del arrendamiento.
+
+        Returns:
+            dict: job_id, indice, filas y ruta de entrada, o None si no hay trabajo.
+        """
+        ahora = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Un bloque cuyo arrendamiento vence en todos sus intentos detiene
+            # a su trabajador: se marca como erróneo en vez de repartirlo otra vez
+            self.conn.execute(
+                """
+                UPDATE chunks SET estado = 'error', lease_hasta = NULL,
+                    error = COALESCE(error, 'Arrendamiento vencido en todos los intentos')
+                WHERE estado = 'en_curso' AND lease_hasta < ? AND intentos >= ?
+                """,
+                (ahora, MAX_ATTEMPTS)
+            )
+            fila = self.conn.execute(
+                """
+                SELECT c.job_id, c.indice, c.filas, j.directorio FROM chunks c JOIN jobs j ON j.id = c.job_id
+                WHERE c.estado = 'pendiente' OR (c.estado = 'en_curso' AND c.lease_hasta < ?)
+                ORDER BY c.job_id, c.indice LIMIT 1
+                """,
+                (ahora,)
+            ).fetchone()
+            if fila is None:
+                self.conn.execute("COMMIT")
+                return None
+
+            self.conn.execute(
+                """
+                UPDATE chunks SET estado = 'en_curso', trabajador = ?, lease_hasta = ?, intentos = intentos + 1
+                WHERE job_id = ? AND indice = ?
+                """,
+                (trabajador, ahora + lease_seconds, fila["job_id"], fila["indice"])
+            )
+            self.conn.execute(
+                "UPDATE jobs SET estado = 'en_curso', iniciado = COALESCE(iniciado, ?) WHERE id = ?",
+                (ahora, fila["job_id"])
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        return {
+            "job_id": fila["job_id"],
+            "indice": fila["indice"],
+            "filas": fila["filas"],
+            "entrada": self._chunk_path(fila["directorio"], "entrada", fila["indice"]),
+            "resultado": self._chunk_path(fila["directorio"], "resultado", fila["indice"])
+        }
+
+    def renew_lease(self, chunk, trabajador, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        Prolongar el arrendamiento de un bloque en curso.
+
+        Returns:
+            bool: False si el bloque ya no pertenecía a este trabajador.
+        """
+        cursor = self.conn.execute(
+            """
+            UPDATE chunks SET lease_hasta = ?
+            WHERE job_id = ? AND indice = ? AND estado = 'en_curso' AND trabajador = ?
+            """,
+            (time.time() + lease_seconds, chunk["job_id"], chunk["indice"], trabajador)
+        )
+        return cursor.rowcount == 1
+
+    def complete_chunk(self, chunk, trabajador, segundos):
+        """
+        Registrar un bloque como terminado (punto de control).
+
+        Returns:
+            bool: False si el bloque ya no pertenecía a este trabajador.
+        """
+        cursor = self.conn.execute(
+            """
+            UPDATE chunks SET estado = 'hecho', segundos = ?, terminado = ?, lease_hasta = NULL
+            WHERE job_id = ? AND indice = ? AND estado = 'en_curso' AND trabajador = ?
+            """,
+            (segundos, time.time(), chunk["job_id"], chunk["indice"], trabajador)
+        )
+        return cursor.rowcount == 1
+
+    def fail_chunk(self, chunk, trabajador, error):
+        """Devolver un bloque a la cola o marcarlo como erróneo si agotó sus intentos."""
+        self.conn.execute(
+            """
+            UPDATE chunks SET estado = CASE WHEN intentos >= ? THEN 'error' ELSE 'pendiente' END,
+                error = ?, lease_hasta = NULL
+            WHERE job_id = ? AND indice = ? AND trabajador = ?
+            """,
+            (MAX_ATTEMPTS, error, chunk["job_id"], chunk["indice"], trabajador)
+        )
+
+    def finalize_ready_jobs(self, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        Ensamblar los resultados de los trabajos con todos sus bloques terminados.
+
+        Args:
+            lease_seconds (float): Tiempo tras el cual un ensamblado
+                interrumpido puede retomarlo otro trabajador.
+
+        Returns:
+            list: Identificadores de los trabajos finalizados por esta llamada.
+        """
+        finalizados = []
+        listo = """
+            (estado IN ('pendiente', 'en_curso') OR (estado = 'ensamblando' AND lease_hasta < ?))
+            AND NOT EXISTS (SELECT 1 FROM chunks c WHERE c.job_id = jobs.id AND c.estado != 'hecho')
+        """
+        candidatos = self.conn.execute(f"SELECT id FROM jobs WHERE {listo}", (time.time(),)).fetchall()
+        for (job_id,) in candidatos:
+            # Solo un trabajador ensambla cada trabajo
+            ahora = time.time()
+            cursor = self.conn.execute(
+                f"UPDATE jobs SET estado = 'ensamblando', lease_hasta = ? WHERE id = ? AND {listo}",
+                (ahora + lease_seconds, job_id, ahora)
+            )
+            if cursor.rowcount != 1:
+                continue
+            try:
+                self._assemble(job_id)
+                self.conn.execute(
+                    "UPDATE jobs SET estado = 'terminado', terminado = ?, lease_hasta = NULL WHERE id = ?",
+                    (time.time(), job_id)
+                )
+                # Los bloques ya no son necesarios una vez escrita la salida
+                shutil.rmtree(os.path.join(self.data_dir, str(job_id)), ignore_errors=True)
+                finalizados.append(job_id)
+            except Exception as e:
+                self.conn.execute("UPDATE jobs SET estado = 'error', error = ? WHERE id = ?", (str(e), job_id))
+
+        # Trabajos con bloques que agotaron sus intentos
+        self.conn.execute(
+            """
+            UPDATE jobs SET estado = 'error', error = 'Bloques con errores: revise el estado de los bloques'
+            WHERE estado IN ('pendiente', 'en_curso')
+            AND EXISTS (SELECT 1 FROM chunks c WHERE c.job_id = jobs.id AND c.estado = 'error')
+            AND NOT EXISTS (SELECT 1 FROM chunks c WHERE c.job_id = jobs.id AND c.estado IN ('pendiente', 'en_curso'))
+            """
+        )
+        return finalizados
+
+    def _assemble(self, job_id):
+        """Unir los resultados de los bloques, en orden, en el archivo de salida."""
+        job = self.conn.execute("SELECT salida, directorio, total_bloques FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        salida = job["salida"]
+        raiz, extension = os.path.splitext(salida)
+        temporal = f"{raiz}.tmp{extension}"
+
+        with ChunkWriter(temporal) as writer:
+            for indice in range(job["total_bloques"]):
+                writer.write(pd.read_pickle(self._chunk_path(job["directorio"], "resultado", indice)))
+        os.replace(temporal, salida)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def status(self, job_id=None):
+        """
+        Consultar el progreso y el rendimiento de los trabajos.
+
+        Args:
+            job_id (int, opcional): Trabajo concreto (por defecto, todos).
+
+        Returns:
+            list: Un diccionario por trabajo con bloques y filas terminadas,
+                progreso, filas por segundo y tiempo restante estimado.
+        """
+        consulta = """
+            SELECT j.*,
+                COALESCE(SUM(CASE WHEN c.estado = 'hecho' THEN 1 END), 0) AS bloques_hechos,
+                COALESCE(SUM(CASE WHEN c.estado = 'hecho' THEN c.filas END), 0) AS filas_hechas,
+                COALESCE(SUM(CASE WHEN c.estado = 'en_curso' THEN 1 END), 0) AS bloques_en_curso,
+                COALESCE(SUM(CASE WHEN c.estado = 'error' THEN 1 END), 0) AS bloques_error,
+                MAX(c.terminado) AS ultimo_bloque,
+                COUNT(DISTINCT CASE WHEN c.estado = 'en_curso' THEN c.trabajador END) AS trabajadores
+            FROM jobs j LEFT JOIN chunks c ON c.job_id = j.id
+        """
+        parametros = ()
+        if job_id is not None:
+            consulta += " WHERE j.id = ?"
+            parametros = (job_id,)
+        consulta += " GROUP BY j.id ORDER BY j.id"
+
+        informe = []
+        for fila in self.conn.execute(consulta, parametros).fetchall():
+            datos = dict(fila)
+            if datos["estado"] == "en_curso":
+                fin = time.time()
+            else:
+                fin = datos["terminado"] or datos["ultimo_bloque"] or time.time()
+            transcurrido = fin - datos["iniciado"] if datos["iniciado"] else 0.0
+            filas_por_s = datos["filas_hechas"] / transcurrido if transcurrido > 0 else 0.0
+            restantes = datos["total_filas"] - datos["filas_hechas"]
+
+            datos["progreso"] = datos["filas_hechas"] / datos["total_filas"] if datos["total_filas"] else 0.0
+            datos["segundos"] = transcurrido
+            datos["filas_por_s"] = filas_por_s
+            datos["restante_s"] = restantes / filas_por_s if filas_por_s > 0 and restantes > 0 else None
+            informe.append(datos)
+        return informe
+
+
+def default_worker_id():
+    """Identificador del trabajador: equipo y proceso."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _renew_lease_loop(db_path, chunk, trabajador, lease_seconds, terminado):
+    """Renovar el arrendamiento de un bloque hasta que termine de puntuarse."""
+    # Conexión propia: la de la cola pertenece al hilo que puntúa
+    with JobQueue(db_path) as queue:
+        while not terminado.wait(lease_seconds / 4):
+            try:
+                if not queue.renew_lease(chunk, trabajador, lease_seconds):
+                    break
+            except sqlite3.Error as e:
+                print(f"No se ha podido renovar el arrendamiento del bloque {chunk['indice']}: {str(e)}")
+
+
+def run_worker(queue, predictor, trabajador=None, lease_seconds=DEFAULT_LEASE_SECONDS,
+               max_chunks=None, progress=None):
+    """
+    Procesar bloques de la cola hasta que no quede trabajo.
+
+    Args:
+        queue (JobQueue): Cola de trabajos.
+        predictor (BatchPredictor): Motor de predicción.
+        trabajador (str, opcional): Identificador del trabajador.
+        lease_seconds (float): Duración del arrendamiento de cada bloque.
+        max_chunks (int, opcional): Número máximo de bloques a procesar.
+        progress (callable, opcional): Función llamada con (chunk, segundos).
+
+    Returns:
+        int: Bloques procesados.
+    """
+    trabajador = trabajador or default_worker_id()
+    procesados = 0
+
+    while max_chunks is None or procesados < max_chunks:
+        chunk = queue.claim_chunk(trabajador, lease_seconds)
+        if chunk is None:
+            break
+
+        # El arrendamiento se renueva mientras se puntúa, para que un bloque
+        # lento no lo reclame (y lo repita) otro trabajador
+        terminado = threading.Event()
+        latido = threading.Thread(
+            target=_renew_lease_loop, args=(queue.db_path, chunk, trabajador, lease_seconds, terminado),
+            name="cola-latido", daemon=True
+        )
+        latido.start()
+        inicio = time.perf_counter()
+        try:
+            resultados = score_chunk(predictor, pd.read_pickle(chunk["entrada"]))
+            # Escritura atómica: un resultado parcial nunca se da por bueno
+            temporal = chunk["resultado"] + ".tmp"
+            resultados.to_pickle(temporal)
+            os.replace(temporal, chunk["resultado"])
+        except Exception as e:
+            print(f"Error en el bloque {chunk['indice']} del trabajo {chunk['job_id']}: {str(e)}")
+            queue.fail_chunk(chunk, trabajador, str(e))
+            continue
+        finally:
+            terminado.set()
+            latido.join()
+
+        segundos = time.perf_counter() - inicio
+        if not queue.complete_chunk(chunk, trabajador, segundos):
+            print(f"El bloque {chunk['indice']} del trabajo {chunk['job_id']} ya lo había reclamado otro trabajador")
+            continue
+        procesados += 1
+        if progress is not None:
+            progress(chunk, segundos)
+
+    queue.finalize_ready_jobs(lease_seconds)
+    return procesados
+
+
+def _worker_process(db_path, model_path, lease_seconds, predictor_options=None):
+    """Punto de entrada de un proceso trabajador."""
+    from app.models.batch_predictor import open_predictor
+
+    predictor = open_predictor(model_path, worker=True, **(predictor_options or {}))
+    try:
+        with JobQueue(db_path) as queue:
+            run_worker(queue, predictor, lease_seconds=lease_seconds)
+    finally:
+        predictor.close()
+
+
+def run_workers(db_path, model_path=None, workers=1, lease_seconds=DEFAULT_LEASE_SECONDS, predictor_options=None):
+    """
+    Lanzar varios procesos trabajadores sobre la misma cola y esperarlos.
+
+    Args:
+        db_path (str): Archivo SQLite de la cola.
+        model_path (str, opcional): Ruta del modelo.
+        workers (int): Número de procesos.
+        lease_seconds (float): Duración del arrendamiento de cada bloque.
+        predictor_options (dict, opcional): Argumentos de open_predictor
+            (caché de resultados y auditoría) para el motor de cada proceso.
+    """
+    import multiprocessing
+
+    contexto = multiprocessing.get_context("spawn")
+    procesos = [
+        contexto.Process(target=_worker_process, args=(db_path, model_path, lease_seconds, predictor_options))
+        for _ in range(workers)
+    ]
+    for proceso in procesos:
+        proceso.start()
+    for proceso in procesos:
+        proceso.join()
@@ -0,0 +1,394 @@
+"""Registro de métricas con exposición en formato de texto de Prometheus.
+
+Los contadores e histogramas se reparten en una celda por hilo: cada hilo
+solo escribe en su propia celda, sin bloqueos, y las celdas se suman al
+exportar. El único bloqueo se toma la primera vez que un hilo usa una
+métrica.
+"""
+import bisect
+import json
+import math
+import os
+import threading
+import time
+
+# Límites por defecto de los histogramas de latencia (segundos)
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+# Límites por defecto de los histogramas de tamaño de lote (filas)
+DEFAULT_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536, 262144)
+
+
+class _ThreadCells:
+    """Celdas por hilo que se suman al leer."""
+
+    def __init__(self, size):
+        self._size = size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cells = []
+
+    def cell(self):
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = [0] * self._size
+            with self._lock:
+                self._cells.append(cell)
+            self._local.cell = cell
+            return cell
+
+    def totals(self):
+        with self._lock:
+            cells = list(self._cells)
+        return [sum(valores) for valores in zip(*cells)] if cells else [0] * self._size
+
+
+class _Metric:
+    """Base de las métricas: nombre, ayuda y etiquetas."""
+
+    tipo = "untyped"
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, **opciones):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._opciones = opciones
+        self._children = {}
+        self._lock = threading.Lock()
+
+        if not self.labelnames:
+            self._init_child()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def labels(self, *valores):
+        """Obtener la serie de unas etiquetas concretas."""
+        valores = tuple(str(v) for v in valores)
+        hijo = self._children.get(valores)
+        if hijo is None:
+            with self._lock:
+                hijo = self._children.get(valores)
+                if hijo is None:
+                    hijo = self.__class__.__new__(self.__class__)
+                    hijo.__dict__.update(self.__dict__)
+                    hijo._init_child()
+                    self._children[valores] = hijo
+        return hijo
+
+    def _init_child(self):
+        pass
+
+    def _series(self):
+        """Pares (etiquetas, métrica) de todas las series."""
+        if not self.labelnames:
+            return [((), self)]
+        with self._lock:
+            return list(self._children.items())
+
+    def _label_text(self, valores, extra=()):
+        pares = list(zip(self.labelnames, valores)) + list(extra)
+        if not pares:
+            return ""
+        texto = ",".join(
+            '{}="{}"'.format(nombre, str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for nombre, valor in pares
+        )
+        return "{" + texto + "}"
+
+
+class Counter(_Metric):
+    """Contador monótono."""
+
+    tipo = "counter"
+
+    def _init_child(self):
+        self._cells = _ThreadCells(1)
+
+    def inc(self, amount=1):
+        self._cells.cell()[0] += amount
+
+    @property
+    def value(self):
+        return self._cells.totals()[0]
+
+    def _samples(self):
+        for valores, serie in self._series():
+            yield f"{self.name}_total", self._label_text(valores), serie.value
+
+    def _snapshot(self, serie):
+        return serie.value
+
+
+class Gauge(_Metric):
+    """Valor instantáneo; puede calcularse al exportar con set_function."""
+
+    tipo = "gauge"
+
+    def _init_child(self):
+        self._value = 0.0
+        self._function = None
+
+    def set(self, value):
+        self._value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set_function(self, function):
+        """Calcular el valor al exportar (p. ej., la profundidad de una cola)."""
+        self._function = function
+
+    @property
+    def value(self):
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                return math.nan
+        return self._value
+
+    def _samples(self):
+        for valores, serie in self._series():
+            yield self.name, self._label_text(valores), serie.value
+
+    def _snapshot(self, serie):
+        return serie.value
+
+
+class Histogram(_Metric):
+    """Histograma acumulado con percentiles estimados por interpolación."""
+
+    tipo = "histogram"
+
+    def _init_child(self):
+        self.buckets = tuple(self._opciones.get("buckets", DEFAULT_LATENCY_BUCKETS))
+        # Una celda por cubeta, más +Inf y la suma de observaciones
+        self._cells = _ThreadCells(len(self.buckets) + 2)
+
+    def observe(self, value):
+        cell = self._cells.cell()
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def time(self):
+        """Medir la duración de un bloque 'with'."""
+        return _Timer(self)
+
+    def _state(self):
+        totales = self._cells.totals()
+        return totales[:-1], totales[-1]
+
+    def quantile(self, q):
+        """
+        Estimar un percentil a partir de las cubetas.
+
+        Args:
+            q (float): Percentil entre 0 y 1.
+
+        Returns:
+            float: Valor estimado (NaN si no hay observaciones).
+        """
+        cuentas, _ = self._state()
+        total = sum(cuentas)
+        if total == 0:
+            return math.nan
+        rango = q * total
+        acumulado = 0
+        for i, cuenta in enumerate(cuentas):
+            if acumulado + cuenta >= rango and cuenta > 0:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                inferior = self.buckets[i - 1] if i > 0 else 0.0
+                return inferior + (self.buckets[i] - inferior) * (rango - acumulado) / cuenta
+            acumulado += cuenta
+        return self.buckets[-1]
+
+    def _samples(self):
+        for valores, serie in self._series():
+            cuentas, suma = serie._state()
+            acumulado = 0
+            for limite, cuenta in zip(serie.buckets + (math.inf,), cuentas):
+                acumulado += cuenta
+                le = "+Inf" if limite == math.inf else repr(float(limite))
+                yield f"{self.name}_bucket", self._label_text(valores, [("le", le)]), acumulado
+            yield f"{self.name}_sum", self._label_text(valores), suma
+            yield f"{self.name}_count", self._label_text(valores), acumulado
+
+    def _snapshot(self, serie):
+        cuentas, suma = serie._state()
+        total = sum(cuentas)
+        return {
+            "count": total,
+            "sum": suma,
+            "media": suma / total if total else None,
+            "p50": serie.quantile(0.50) if total else None,
+            "p95": serie.quantile(0.95) if total else None,
+            "p99": serie.quantile(0.99) if total else None
+        }
+
+
+class _Timer:
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.histogram.observe(time.perf_counter() - self.inicio)
+
+
+class MetricsRegistry:
+    """Conjunto de métricas exportables."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render_prometheus(self):
+        """
+        Exportar todas las métricas en formato de texto de Prometheus.
+
+        Returns:
+            str: Texto de exposición (versión 0.0.4).
+        """
+        with self._lock:
+            metricas = list(self._metrics.values())
+        lineas = []
+        for metrica in metricas:
+            lineas.append(f"# HELP {metrica.name} {metrica.documentation}")
+            lineas.append(f"# TYPE {metrica.name} {metrica.tipo}")
+            for nombre, etiquetas, valor in metrica._samples():
+                lineas.append(f"{nombre}{etiquetas} {_format_value(valor)}")
+        return "\n".join(lineas) + "\n"
+
+    def snapshot(self):
+        """
+        Obtener los valores actuales como diccionario (histogramas con percentiles).
+
+        Returns:
+            dict: Nombre de métrica -> valor, o etiquetas -> valor si tiene etiquetas.
+        """
+        with self._lock:
+            metricas = list(self._metrics.values())
+        datos = {}
+        for metrica in metricas:
+            if metrica.labelnames:
+                datos[metrica.name] = {
+                    ",".join(valores): metrica._snapshot(serie) for valores, serie in metrica._series()
+                }
+            else:
+                datos[metrica.name] = metrica._snapshot(metrica)
+        return datos
+
+
+def _format_value(valor):
+    if isinstance(valor, float):
+        if math.isnan(valor):
+            return "NaN"
+        if math.isinf(valor):
+            return "+Inf" if valor > 0 else "-Inf"
+        return repr(valor)
+    return str(valor)
+
+
+# Registro global de la aplicación
+REGISTRY = MetricsRegistry()
+
+
+def write_metrics_file(path, registry=None):
+    """
+    Volcar las métricas a un archivo (JSON si la extensión es .json, texto
+    de Prometheus en otro caso). La escritura es atómica.
+
+    Args:
+        path (str): Archivo de destino.
+        registry (MetricsRegistry, opcional): Registro a volcar.
+    """
+    registry = registry or REGISTRY
+    if path.endswith(".json"):
+        contenido = json.dumps(
+            {"fecha": time.time(), "metricas": registry.snapshot()}, indent=2, ensure_ascii=False, default=str
+        )
+    else:
+        contenido = registry.render_prometheus()
+
+    temporal = path + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        f.write(contenido)
+    os.replace(temporal, path)
+
+
+class MetricsDumper:
+    """Hilo que vuelca las métricas a un archivo periódicamente."""
+
+    def __init__(self, path, interval=15.0, registry=None):
+        """
+        Args:
+            path (str): Archivo de destino (.prom o .json).
+            interval (float): Segundos entre volcados.
+            registry (MetricsRegistry, opcional): Registro a volcar.
+        """
+        self.path = path
+        self.interval = interval
+        self.registry = registry or REGISTRY
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="volcado-metricas", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Detener el hilo y hacer un último volcado."""
+        self._stop.set()
+        self._thread.join()
+        self._dump()
+
+    def _dump(self):
+        try:
+            write_metrics_file(self.path, self.registry)
+        except OSError as e:
+            print(f"Error al volcar las métricas: {str(e)}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._dump()
+
+
+# ----------------------------------------------------------------------
+# Métricas de la aplicación
+# ----------------------------------------------------------------------
+
+FILAS_PUNTUADAS = Counter("pandeo_filas_puntuadas", "Filas evaluadas por el modelo")
+LLAMADAS_MODELO = Counter("pandeo_llamadas_modelo", "Llamadas por lotes al modelo")
+DURACION_PREDICCION = Histogram(
+    "pandeo_prediccion_segundos", "Duración de cada llamada por lotes al modelo"
+)
+TAMANO_LOTE = Histogram(
+    "pandeo_lote_filas", "Filas por llamada al modelo", buckets=DEFAULT_SIZE_BUCKETS
+)
+CARGA_MODELO = Gauge("pandeo_carga_modelo_segundos", "Tiempo de carga del modelo")
+
+CACHE_ACIERTOS = Counter("pandeo_cache_aciertos", "Aciertos de caché", ["cache"])
+CACHE_FALLOS = Counter("pandeo_cache_fallos", "Fallos de caché", ["cache"])
+
+PETICIONES = Counter("pandeo_peticiones", "Peticiones HTTP atendidas", ["ruta", "estado"])
+LATENCIA_PETICION = Histogram("pandeo_peticion_segundos", "Latencia de las peticiones HTTP", ["ruta"])
+PROFUNDIDAD_COLA = Gauge("pandeo_cola_peticiones", "Peticiones individuales en espera de micro-lote")
+RECHAZADAS = Counter("pandeo_peticiones_rechazadas", "Peticiones rechazadas por saturación")
+EXPIRADAS = Counter("pandeo_peticiones_expiradas", "Peticiones descartadas por plazo vencido")
@@ -0,0 +1,282 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.utils import metrics
+
+# Tamaño máximo por defecto de la caché en disco
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Claves de las dos funciones hash de 64 bits que forman la clave de 128 bits
+_HASH_KEYS = ("pandeo-cache-001", "pandeo-cache-002")
+
+# Claves por consulta (se envían como un único parámetro JSON)
+_LOOKUP_CHUNK = 100000
+
+# Segundos tras los que un acierto renueva la fecha de uso de la entrada.
+# Renovarla en cada acierto duplicaría el coste de la consulta
+_REFRESH_SECONDS = 3600.0
+
+# Decimales con los que se normalizan las características numéricas
+_DECIMALES = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS modelos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    huella TEXT UNIQUE NOT NULL,
+    archivo TEXT
+);
+CREATE TABLE IF NOT EXISTS resultados (
+    modelo INTEGER NOT NULL,
+    clave INTEGER NOT NULL,
+    verificacion INTEGER NOT NULL,
+    carga_maxima_kN REAL NOT NULL,
+    usado REAL NOT NULL,
+    PRIMARY KEY (modelo, clave)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS resultados_usado ON resultados (usado);
+"""
+
+# Huellas de modelo ya calculadas: ruta -> (tamaño, fecha, huella)
+_huellas = {}
+
+
+def model_fingerprint(model_path):
+    """
+    Calcular la huella SHA-256 del archivo del modelo.
+
+    El resultado se recuerda mientras el archivo no cambie de tamaño ni de
+    fecha de modificación.
+
+    Args:
+        model_path (str): Ruta del modelo .joblib.
+
+    Returns:
+        str: Huella hexadecimal.
+    """
+    estado = os.stat(model_path)
+    guardada = _huellas.get(model_path)
+    if guardada and guardada[:2] == (estado.st_size, estado.st_mtime_ns):
+        return guardada[2]
+
+    sha = hashlib.sha256()
+    with open(model_path, "rb") as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(bloque)
+    huella = sha.hexdigest()
+    _huellas[model_path] = (estado.st_size, estado.st_mtime_ns, huella)
+    return huella
+
+
+def feature_keys(caracteristicas):
+    """
+    Calcular de forma vectorizada la clave canónica de cada fila.
+
+    La clave se obtiene de las características que recibe el modelo (salida
+    de build_features), no de las entradas en bruto: dos filas que el modelo
+    ve iguales comparten resultado aunque difieran en columnas irrelevantes.
+    Los valores numéricos se redondean para que el ruido de coma flotante no
+    genere claves distintas.
+
+    Args:
+        caracteristicas (pd.DataFrame): Características del modelo.
+
+    Returns:
+        np.ndarray: Array (n, 2) de enteros de 64 bits: la clave indexada y
+            un segundo hash de verificación (128 bits en total).
+    """
+    normalizadas = caracteristicas.copy()
+    for columna in normalizadas.columns:
+        if pd.api.types.is_float_dtype(normalizadas[columna]):
+            # +0.0 evita que -0.0 y 0.0 den claves distintas
+            normalizadas[columna] = normalizadas[columna].round(_DECIMALES) + 0.0
+
+    partes = [
+        pd.util.hash_pandas_object(normalizadas, index=False, hash_key=clave).to_numpy(dtype='<u8').view('<i8')
+        for clave in _HASH_KEYS
+    ]
+    return np.stack(partes, axis=1)
+
+
+class ResultCache:
+    """
+    Caché persistente en SQLite de las predicciones del modelo.
+
+    Solo se guarda la carga máxima que devuelve el modelo: el resto de
+    resultados se deriva de las características con compute_results, que
+    es barato y vectorizado. Las entradas de cada modelo se distinguen por
+    la huella de su archivo, de modo que al cambiar el modelo no se
+    reutilizan resultados antiguos.
+    """
+
+    def __init__(self, db_path, model_path, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Abrir (o crear) la caché.
+
+        Args:
+            db_path (str): Archivo SQLite de la caché.
+            model_path (str): Ruta del modelo cuyos resultados se guardan.
+            max_bytes (int): Tamaño máximo de la caché; al superarlo se
+                descartan las entradas usadas hace más tiempo.
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._aciertos = metrics.CACHE_ACIERTOS.labels("resultados")
+        self._fallos = metrics.CACHE_FALLOS.labels("resultados")
+
+        directorio = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directorio, exist_ok=True)
+
+        # La caché se usa desde el hilo del modelo del servicio y desde los
+        # hilos de la vigilancia de carpetas: el acceso se serializa con _lock
+        self.conn = sqlite3.connect(db_path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+        huella = model_fingerprint(model_path)
+        self.conn.execute(
+            "INSERT OR IGNORE INTO modelos (huella, archivo) VALUES (?, ?)", (huella, os.path.basename(model_path))
+        )
+        self.model_id = self.conn.execute("SELECT id FROM modelos WHERE huella = ?", (huella,)).fetchone()[0]
+
+    def close(self):
+        """Cerrar la conexión."""
+        with self._lock:
+            self.conn.close()
+
+    def lookup(self, claves):
+        """
+        Buscar en bloque las cargas máximas de un conjunto de claves.
+
+        Args:
+            claves (np.ndarray): Claves de feature_keys.
+
+        Returns:
+            np.ndarray: Cargas máximas en kN (NaN para las claves ausentes).
+        """
+        cargas = np.full(len(claves), np.nan)
+        if len(claves) == 0:
+            return cargas
+
+        # La consulta solo usa la clave indexada; la verificación se compara
+        # después, fila a fila, con la que devuelve la base de datos
+        unicas = np.unique(claves[:, 0])
+        ahora = time.time()
+
+        with self._lock:
+            for inicio in range(0, len(unicas), _LOOKUP_CHUNK):
+                bloque = unicas[inicio:inicio + _LOOKUP_CHUNK]
+                # Una sola consulta por bloque: las claves viajan como un array JSON
+                filas = self.conn.execute(
+                    """
+                    SELECT clave, verificacion, carga_maxima_kN, usado FROM resultados
+                    WHERE modelo = ? AND clave IN (SELECT value FROM json_each(?))
+                    """,
+                    (self.model_id, json.dumps(bloque.tolist()))
+                ).fetchall()
+                if not filas:
+                    continue
+
+                encontradas = np.array(filas, dtype=object)
+                clave_bd = encontradas[:, 0].astype(np.int64)
+                orden = np.argsort(clave_bd)
+                clave_bd = clave_bd[orden]
+                posicion = np.searchsorted(clave_bd, claves[:, 0]).clip(max=len(clave_bd) - 1)
+                verificacion = encontradas[orden, 1].astype(np.int64)[posicion]
+                acierto = (clave_bd[posicion] == claves[:, 0]) & (verificacion == claves[:, 1])
+                cargas[acierto] = encontradas[orden, 2].astype(float)[posicion][acierto]
+
+                # Renovar la fecha de uso solo de las entradas que llevan tiempo sin usarse
+                usado = encontradas[orden, 3].astype(float)
+                renovar = clave_bd[usado < ahora - _REFRESH_SECONDS]
+                if len(renovar):
+                    self.conn.execute(
+                        "UPDATE resultados SET usado = ? WHERE modelo = ? AND clave IN (SELECT value FROM json_each(?))",
+                        (ahora, self.model_id, json.dumps(renovar.tolist()))
+                    )
+
+        aciertos = int(np.count_nonzero(~np.isnan(cargas)))
+        self._aciertos.inc(aciertos)
+        self._fallos.inc(len(cargas) - aciertos)
+        return cargas
+
+    def store(self, claves, cargas):
+        """
+        Guardar en bloque las cargas máximas calculadas.
+
+        Args:
+            claves (np.ndarray): Claves de feature_keys.
+            cargas (np.ndarray): Cargas máximas en kN.
+        """
+        if len(claves) == 0:
+            return
+        ahora = time.time()
+        filas = zip(
+            [self.model_id] * len(claves), claves[:, 0].tolist(), claves[:, 1].tolist(),
+            np.asarray(cargas, dtype=float).tolist(), [ahora] * len(claves)
+        )
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO resultados (modelo, clave, verificacion, carga_maxima_kN, usado)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    filas
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self._evict()
+
+    def size_bytes(self):
+        """Tamaño ocupado por la caché (páginas en uso)."""
+        paginas = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        libres = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        tamano_pagina = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        return (paginas - libres) * tamano_pagina
+
+    def _evict(self):
+        """Descartar las entradas usadas hace más tiempo hasta volver bajo el límite."""
+        tamano = self.size_bytes()
+        if tamano <= self.max_bytes:
+            return
+        total = self.conn.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+        if total == 0:
+            return
+        # Se elimina la fracción necesaria más un margen del 10 % para no
+        # desalojar en cada escritura
+        fraccion = min(1.0, 1 - self.max_bytes / tamano + 0.1)
+        self.conn.execute(
+            """
+            DELETE FROM resultados WHERE (modelo, clave) IN
+                (SELECT modelo, clave FROM resultados ORDER BY usado LIMIT ?)
+            """,
+            (max(1, int(total * fraccion)),)
+        )
+
+    def stats(self):
+        """
+        Obtener el estado de la caché.
+
+        Returns:
+            dict: Entradas del modelo actual, entradas totales y tamaño en bytes.
+        """
+        with self._lock:
+            return {
+                'entradas_modelo': self.conn.execute(
+                    "SELECT COUNT(*) FROM resultados WHERE modelo = ?", (self.model_id,)
+                ).fetchone()[0],
+                'entradas': self.conn.execute("SELECT COUNT(*) FROM resultados").fetchone()[0],
+                'bytes': self.size_bytes()
+            }
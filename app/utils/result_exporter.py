@@ -1,16 +1,22 @@
 import os
 from datetime import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet
 import numpy as np
-import pandas as pd
-import xlsxwriter
 import random
 
+# matplotlib, reportlab y pandas (con xlsxwriter) se importan en cada método
+# de exportación: solo se cargan si el usuario llega a exportar.
+# Los gráficos usan Figure directamente (sin pyplot), de modo que las
+# exportaciones pueden ejecutarse fuera del hilo de la interfaz
+
+# Pasos en que se informa del progreso de la exportación a Excel
+EXCEL_STEPS = 7
+
+
+def _report(progress, paso, pasos, mensaje):
+    """Informar del progreso de una exportación, si se ha pedido."""
+    if progress is not None:
+        progress(paso, pasos, mensaje)
+
 class ResultExporter:
     """Clase para exportar resultados de predicción de pandeo."""
     
@@ -21,7 +27,7 @@ class ResultExporter:
         if not os.path.exists(self.export_dir):
             os.makedirs(self.export_dir)
     
-    def export_to_pdf(self, file_path, results, input_data):
+    def export_to_pdf(self, file_path, results, input_data, progress=None):
         """
         Exportar resultados a un archivo PDF.
         
@@ -29,7 +35,13 @@ class ResultExporter:
             file_path (str): Ruta del archivo PDF a generar.
             results (dict): Diccionario con los resultados de la predicción.
             input_data (dict): Diccionario con los datos de entrada.
+            progress (callable, opcional): Función llamada con (paso, pasos, mensaje).
         """
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib import colors
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+        from reportlab.lib.styles import getSampleStyleSheet
+        
         # Crear documento PDF
         doc = SimpleDocTemplate(file_path, pagesize=letter)
         elements = []
@@ -151,19 +163,27 @@ class ResultExporter:
         elements.append(Spacer(1, 12))
         
         # Generar gráficos y añadirlos al PDF
-        self._add_charts_to_pdf(elements, results)
+        self._add_charts_to_pdf(elements, results, progress)
         
         # Construir PDF
+        _report(progress, 4, 5, "Componiendo el documento PDF")
         doc.build(elements)
+        _report(progress, 5, 5, "PDF generado")
     
-    def _add_charts_to_pdf(self, elements, results):
+    def _add_charts_to_pdf(self, elements, results, progress=None):
         """
         Añadir gráficos al PDF.
         
         Args:
             elements (list): Lista de elementos del PDF.
             results (dict): Diccionario con los resultados de la predicción.
+            progress (callable, opcional): Función llamada con (paso, pasos, mensaje).
         """
+        from reportlab.platypus import Paragraph, Spacer, Image
+        from reportlab.lib.styles import getSampleStyleSheet
+        
+        styles = getSampleStyleSheet()
+        
         # Crear gráficos temporales
         temp_dir = os.path.join(self.export_dir, "temp")
         if not os.path.exists(temp_dir):
@@ -171,6 +191,7 @@ class ResultExporter:
         
         # Gráfico 1: Relación carga-esbeltez
         chart1_path = os.path.join(temp_dir, "chart1.png")
+        _report(progress, 1, 5, "Generando gráficos")
         self._create_load_slenderness_chart(chart1_path, results)
         elements.append(Paragraph("Relación Carga-Esbeltez", styles['Heading3']))
         elements.append(Image(chart1_path, width=450, height=300))
@@ -178,6 +199,7 @@ class ResultExporter:
         
         # Gráfico 2: Comparación con carga crítica de Euler
         chart2_path = os.path.join(temp_dir, "chart2.png")
+        _report(progress, 2, 5, "Generando gráficos")
         self._create_comparison_chart(chart2_path, results)
         elements.append(Paragraph("Comparación de Cargas", styles['Heading3']))
         elements.append(Image(chart2_path, width=450, height=300))
@@ -185,13 +207,17 @@ class ResultExporter:
         
         # Gráfico 3: Factor de reducción
         chart3_path = os.path.join(temp_dir, "chart3.png")
+        _report(progress, 3, 5, "Generando gráficos")
         self._create_reduction_factor_chart(chart3_path, results)
         elements.append(Paragraph("Factor de Reducción", styles['Heading3']))
         elements.append(Image(chart3_path, width=450, height=300))
     
     def _create_load_slenderness_chart(self, file_path, results):
         """Crear gráfico de relación carga-esbeltez."""
-        fig, ax = plt.subplots(figsize=(8, 5))
+        from matplotlib.figure import Figure
+        
+        fig = Figure(figsize=(8, 5))
+        ax = fig.subplots()
         
         # Generar datos para la curva de pandeo
         esbeltez_rel_range = np.linspace(0, 2.5, 100)
@@ -223,13 +249,15 @@ class ResultExporter:
         ax.legend()
         
         # Guardar gráfico
-        plt.tight_layout()
-        plt.savefig(file_path)
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(file_path)
     
     def _create_comparison_chart(self, file_path, results):
         """Crear gráfico de comparación de cargas."""
-        fig, ax = plt.subplots(figsize=(8, 5))
+        from matplotlib.figure import Figure
+        
+        fig = Figure(figsize=(8, 5))
+        ax = fig.subplots()
         
         # Datos para el gráfico de barras
         categorias = ['Carga Máxima', 'Carga de Euler', 'Resistencia Plástica']
@@ -254,13 +282,15 @@ class ResultExporter:
         ax.grid(True, axis='y', linestyle='--', alpha=0.7)
         
         # Guardar gráfico
-        plt.tight_layout()
-        plt.savefig(file_path)
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(file_path)
     
     def _create_reduction_factor_chart(self, file_path, results):
         """Crear gráfico del factor de reducción."""
-        fig, ax = plt.subplots(figsize=(8, 5))
+        from matplotlib.figure import Figure
+        
+        fig = Figure(figsize=(8, 5))
+        ax = fig.subplots()
         
         # Generar datos para la curva de factor de reducción
         esbeltez_rel_range = np.linspace(0, 2.5, 100)
@@ -288,11 +318,10 @@ class ResultExporter:
         ax.grid(True, linestyle='--', alpha=0.7)
         
         # Guardar gráfico
-        plt.tight_layout()
-        plt.savefig(file_path)
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(file_path)
     
-    def export_to_image(self, file_path, results, input_data):
+    def export_to_image(self, file_path, results, input_data, progress=None):
         """
         Exportar resultados a una imagen.
         
@@ -300,24 +329,27 @@ class ResultExporter:
             file_path (str): Ruta de la imagen a generar.
             results (dict): Diccionario con los resultados de la predicción.
             input_data (dict): Diccionario con los datos de entrada.
+            progress (callable, opcional): Función llamada con (paso, pasos, mensaje).
         """
+        from matplotlib.figure import Figure
+        
         # Crear figura compuesta con múltiples subplots
-        fig = plt.figure(figsize=(12, 16))
+        fig = Figure(figsize=(12, 16))
         
         # Título general
         fig.suptitle("Resultados de Predicción de Pandeo", fontsize=16, y=0.98)
         
         # Añadir información de entrada y resultados como texto
-        plt.figtext(0.1, 0.92, f"Tipo de Perfil: {input_data.get('tipo_perfil', '')}", fontsize=10)
-        plt.figtext(0.1, 0.90, f"Tipo de Acero: {input_data.get('tipo_acero', '')}", fontsize=10)
-        plt.figtext(0.1, 0.88, f"Longitud: {input_data.get('longitud_mm', 0):.2f} mm", fontsize=10)
-        plt.figtext(0.1, 0.86, f"Condición de Apoyo: {input_data.get('condicion_apoyo', '')}", fontsize=10)
+        fig.text(0.1, 0.92, f"Tipo de Perfil: {input_data.get('tipo_perfil', '')}", fontsize=10)
+        fig.text(0.1, 0.90, f"Tipo de Acero: {input_data.get('tipo_acero', '')}", fontsize=10)
+        fig.text(0.1, 0.88, f"Longitud: {input_data.get('longitud_mm', 0):.2f} mm", fontsize=10)
+        fig.text(0.1, 0.86, f"Condición de Apoyo: {input_data.get('condicion_apoyo', '')}", fontsize=10)
         
         # Resultados principales
-        plt.figtext(0.5, 0.92, f"Carga Máxima: {results.get('carga_maxima_kN', 0):.2f} kN", fontsize=12, weight='bold')
-        plt.figtext(0.5, 0.90, f"({results.get('carga_maxima_kg', 0):.2f} kg / {results.get('carga_maxima_ton', 0):.4f} ton)", fontsize=10)
-        plt.figtext(0.5, 0.88, f"Factor de Reducción: {results.get('factor_reduccion', 0):.3f}", fontsize=10)
-        plt.figtext(0.5, 0.86, f"Esbeltez Relativa: {results.get('esbeltez_relativa', 0):.2f}", fontsize=10)
+        fig.text(0.5, 0.92, f"Carga Máxima: {results.get('carga_maxima_kN', 0):.2f} kN", fontsize=12, weight='bold')
+        fig.text(0.5, 0.90, f"({results.get('carga_maxima_kg', 0):.2f} kg / {results.get('carga_maxima_ton', 0):.4f} ton)", fontsize=10)
+        fig.text(0.5, 0.88, f"Factor de Reducción: {results.get('factor_reduccion', 0):.3f}", fontsize=10)
+        fig.text(0.5, 0.86, f"Esbeltez Relativa: {results.get('esbeltez_relativa', 0):.2f}", fontsize=10)
         
         # Gráfico 1: Relación carga-esbeltez
         ax1 = fig.add_subplot(3, 1, 1)
@@ -392,13 +424,14 @@ class ResultExporter:
         ax3.grid(True, linestyle='--', alpha=0.7)
         
         # Ajustar layout
-        plt.tight_layout(rect=[0, 0, 1, 0.85])
+        fig.tight_layout(rect=[0, 0, 1, 0.85])
         
         # Guardar figura
-        plt.savefig(file_path, dpi=300)
-        plt.close()
+        _report(progress, 1, 2, "Guardando la imagen")
+        fig.savefig(file_path, dpi=300)
+        _report(progress, 2, 2, "Imagen generada")
     
-    def export_to_excel(self, file_path, results, input_data):
+    def export_to_excel(self, file_path, results, input_data, progress=None):
         """
         Exportar resultados a un archivo Excel con formato profesional.
         
@@ -406,7 +439,13 @@ class ResultExporter:
             file_path (str): Ruta del archivo Excel a generar.
             results (dict): Diccionario con los resultados de la predicción.
             input_data (dict): Diccionario con los datos de entrada.
+            progress (callable, opcional): Función llamada con (paso, pasos, mensaje).
+                Si lanza TaskCancelled, la exportación se abandona sin
+                recurrir al formato simplificado.
         """
+        import pandas as pd
+        from app.utils.background_tasks import TaskCancelled
+        
         try:
             # Verificar que los datos principales existan y no sean cero
             carga_maxima = results.get('carga_maxima_kN', 0) 
@@ -552,6 +591,7 @@ class ResultExporter:
             
             # Crear DataFrame con todos los datos de simulación
             simulation_df = pd.DataFrame(simulation_data)
+            _report(progress, 1, EXCEL_STEPS, "Datos de entrada")
             
             # Exportar a Excel con formato profesional
             with pd.ExcelWriter(file_path, engine='xlsxwriter') as writer:
@@ -653,6 +693,7 @@ class ResultExporter:
                         worksheet.write(row_num, 1, input_df.iloc[row_num-2, 1], value_format)
                 
                 # Hoja para resultados principales
+                _report(progress, 2, EXCEL_STEPS, "Resultados principales")
                 main_results_df.to_excel(writer, sheet_name='Resultados Principales', index=False, startrow=1)
                 
                 # Ajustar hoja de resultados principales
@@ -674,6 +715,7 @@ class ResultExporter:
                         worksheet.write(row_num, 1, main_results_df.iloc[row_num-2, 1], value_format)
                 
                 # Hoja para resultados detallados
+                _report(progress, 3, EXCEL_STEPS, "Resultados detallados")
                 detailed_results_df.to_excel(writer, sheet_name='Resultados Detallados', index=False, startrow=1)
                 
                 # Ajustar hoja de resultados detallados
@@ -695,6 +737,7 @@ class ResultExporter:
                         worksheet.write(row_num, 1, detailed_results_df.iloc[row_num-2, 1], value_format)
                 
                 # Hoja para simulación (muestra)
+                _report(progress, 4, EXCEL_STEPS, "Simulación (muestra)")
                 # Tomar solo cada 20 filas para tener una tabla más manejable
                 tabla_muestra = simulation_data[::20]
                 tabla_df = pd.DataFrame(tabla_muestra)
@@ -719,6 +762,7 @@ class ResultExporter:
                             worksheet.write(row_num, col_num, value, value_format)
                 
                 # Hoja para datos de simulación completa (1000 puntos)
+                _report(progress, 5, EXCEL_STEPS, "Simulación completa")
                 simulation_df.to_excel(writer, sheet_name='Datos Simulación', index=False, startrow=1)
                 
                 # Ajustar hoja de simulación completa
@@ -850,6 +894,12 @@ class ResultExporter:
                 # Eliminamos la hoja de resumen ya que no es necesaria
                 # No necesitamos el código para la hoja de resumen
                 
+                # El archivo se escribe al cerrar el ExcelWriter
+                _report(progress, 6, EXCEL_STEPS, "Escribiendo el archivo")
+            _report(progress, EXCEL_STEPS, EXCEL_STEPS, "Archivo Excel generado")
+        
+        except TaskCancelled:
+            raise
         except Exception as e:
             # En caso de error, hacer una exportación más simple
             try:
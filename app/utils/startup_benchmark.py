@@ -0,0 +1,218 @@
+"""Medición del arranque de la interfaz gráfica con presupuesto de tiempo.
+
+Se mide en procesos nuevos, para no contar módulos ya importados:
+
+- el tiempo de importación de app.main, con el desglose de -X importtime;
+- el tiempo hasta el primer pintado de la ventana principal;
+- las bibliotecas pesadas cargadas antes de que aparezca la ventana, que
+  deben importarse al usarse por primera vez.
+
+Termina con código 1 si se supera algún presupuesto, de modo que puede
+ejecutarse como comprobación en las pruebas o en integración continua:
+
+    python -m app.utils.startup_benchmark --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Bibliotecas que no deben cargarse antes de que aparezca la ventana
+HEAVY_MODULES = (
+    "matplotlib", "mpl_toolkits.mplot3d", "pandas", "reportlab", "xlsxwriter", "openpyxl",
+    "joblib", "catboost", "sklearn", "scipy", "pyvista", "pyvistaqt", "vtk"
+)
+
+# Presupuestos por defecto (mediana de las ejecuciones, en ms)
+DEFAULT_IMPORT_BUDGET_MS = 400
+DEFAULT_FIRST_PAINT_BUDGET_MS = 1000
+
+# Proceso hijo: importa la aplicación, crea la ventana y espera al primer pintado
+_CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app.main as main_module
+t_import = time.perf_counter()
+
+from PyQt5.QtCore import QEvent, QObject, QTimer
+from PyQt5.QtWidgets import QApplication
+
+HEAVY = %(heavy)r
+
+def loaded():
+    return [m for m in HEAVY if m in sys.modules]
+
+app = QApplication(sys.argv)
+window = main_module.MainWindow()
+t_window = time.perf_counter()
+pesados = loaded()
+marcas = {}
+
+class PaintWatcher(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and "pintado" not in marcas:
+            marcas["pintado"] = time.perf_counter()
+            QTimer.singleShot(0, app.quit)
+        return False
+
+watcher = PaintWatcher()
+window.installEventFilter(watcher)
+window.show()
+QTimer.singleShot(30000, app.quit)
+app.exec_()
+
+print(json.dumps({
+    "importacion_ms": (t_import - t0) * 1000,
+    "ventana_ms": (t_window - t0) * 1000,
+    "primer_pintado_ms": (marcas.get("pintado", float("nan")) - t0) * 1000,
+    "pesados_al_arrancar": pesados
+}))
+"""
+
+
+def _child_env(offscreen):
+    """Entorno del proceso hijo, con la raíz del proyecto en el PYTHONPATH."""
+    env = dict(os.environ)
+    raiz = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env["PYTHONPATH"] = raiz + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    return env
+
+
+def parse_importtime(texto):
+    """
+    Interpretar la salida de -X importtime.
+
+    Args:
+        texto (str): Salida de error del intérprete.
+
+    Returns:
+        dict: Módulo -> (tiempo propio, tiempo acumulado) en microsegundos.
+    """
+    tiempos = {}
+    for linea in texto.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        partes = linea[len("import time:"):].split("|")
+        try:
+            propio, acumulado = int(partes[0]), int(partes[1])
+        except ValueError:
+            # Línea de cabecera
+            continue
+        tiempos[partes[2].strip()] = (propio, acumulado)
+    return tiempos
+
+
+def measure_import_time(top=10):
+    """
+    Medir la importación de app.main con -X importtime.
+
+    Args:
+        top (int): Número de módulos más costosos que se incluyen en el informe.
+
+    Returns:
+        dict: Tiempo acumulado de app.main (ms) y módulos más costosos por tiempo propio.
+    """
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, env=_child_env(True)
+    )
+    if proceso.returncode != 0:
+        raise RuntimeError(f"No se ha podido importar app.main:\n{proceso.stderr[-2000:]}")
+
+    tiempos = parse_importtime(proceso.stderr)
+    costosos = sorted(tiempos.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    return {
+        "app_main_ms": tiempos.get("app.main", (0, 0))[1] / 1000,
+        "modulos_mas_costosos_ms": {nombre: propio / 1000 for nombre, (propio, _) in costosos}
+    }
+
+
+def measure_first_paint(offscreen=True):
+    """
+    Arrancar la interfaz en un proceso nuevo y medir hasta el primer pintado.
+
+    Args:
+        offscreen (bool): Usar la plataforma 'offscreen' de Qt (sin pantalla).
+
+    Returns:
+        dict: Tiempos de importación, creación de ventana y primer pintado (ms)
+            y bibliotecas pesadas cargadas al crear la ventana.
+    """
+    codigo = _CHILD % {"heavy": HEAVY_MODULES}
+    proceso = subprocess.run(
+        [sys.executable, "-c", codigo], capture_output=True, text=True, env=_child_env(offscreen)
+    )
+    if proceso.returncode != 0:
+        raise RuntimeError(f"No se ha podido arrancar la interfaz:\n{proceso.stderr[-2000:]}")
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(runs=5, import_budget_ms=DEFAULT_IMPORT_BUDGET_MS,
+                  first_paint_budget_ms=DEFAULT_FIRST_PAINT_BUDGET_MS, offscreen=True):
+    """
+    Medir el arranque varias veces y compararlo con los presupuestos.
+
+    Args:
+        runs (int): Número de arranques medidos.
+        import_budget_ms (float): Presupuesto de importación de app.main.
+        first_paint_budget_ms (float): Presupuesto hasta el primer pintado.
+        offscreen (bool): Usar la plataforma 'offscreen' de Qt.
+
+    Returns:
+        dict: Informe con medianas, desglose, bibliotecas pesadas y fallos.
+    """
+    importtime = measure_import_time()
+    arranques = [measure_first_paint(offscreen) for _ in range(runs)]
+
+    informe = {
+        "ejecuciones": runs,
+        "importacion_ms": statistics.median(a["importacion_ms"] for a in arranques),
+        "ventana_ms": statistics.median(a["ventana_ms"] for a in arranques),
+        "primer_pintado_ms": statistics.median(a["primer_pintado_ms"] for a in arranques),
+        "importtime": importtime,
+        "pesados_al_arrancar": sorted({m for a in arranques for m in a["pesados_al_arrancar"]}),
+        "presupuestos_ms": {"importacion": import_budget_ms, "primer_pintado": first_paint_budget_ms},
+    }
+
+    fallos = []
+    if informe["importacion_ms"] > import_budget_ms:
+        fallos.append(f"Importación de app.main: {informe['importacion_ms']:.0f} ms > {import_budget_ms:.0f} ms")
+    if not informe["primer_pintado_ms"] <= first_paint_budget_ms:
+        fallos.append(
+            f"Primer pintado: {informe['primer_pintado_ms']:.0f} ms > {first_paint_budget_ms:.0f} ms"
+        )
+    if informe["pesados_al_arrancar"]:
+        fallos.append(
+            "Bibliotecas pesadas cargadas antes de mostrar la ventana: " + ", ".join(informe["pesados_al_arrancar"])
+        )
+    informe["fallos"] = fallos
+    return informe
+
+
+def main(argv=None):
+    """Punto de entrada: imprime el informe y devuelve 1 si se supera algún presupuesto."""
+    parser = argparse.ArgumentParser(description="Medición del arranque de PANDEO ML con presupuesto de tiempo")
+    parser.add_argument("--runs", type=int, default=5, help="Arranques medidos (se usa la mediana)")
+    parser.add_argument("--import-budget-ms", type=float, default=DEFAULT_IMPORT_BUDGET_MS,
+                        help="Presupuesto de importación de app.main")
+    parser.add_argument("--first-paint-budget-ms", type=float, default=DEFAULT_FIRST_PAINT_BUDGET_MS,
+                        help="Presupuesto hasta el primer pintado de la ventana")
+    parser.add_argument("--display", action="store_true",
+                        help="Usar la pantalla real en lugar de la plataforma 'offscreen'")
+    args = parser.parse_args(argv)
+
+    informe = run_benchmark(args.runs, args.import_budget_ms, args.first_paint_budget_ms, not args.display)
+    json.dump(informe, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+
+    for fallo in informe["fallos"]:
+        print(f"FALLO: {fallo}", file=sys.stderr)
+    return 1 if informe["fallos"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())